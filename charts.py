@@ -3,6 +3,27 @@ import plotly.express as px
 import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
+from task_data import get_typed_view
+from task_events import (
+    CYCLE_TIME_DAYS,
+    THROUGHPUT_DAYS,
+    VELOCITY_DAYS,
+    cycle_times,
+    daily_completions,
+    get_event_log,
+    throughput,
+)
+from task_metrics import AGE_BUCKET_EDGES, task_age_breakdown
+from task_schema import (
+    STATUS_ARCHIVED,
+    STATUS_DONE,
+    STATUS_OPEN,
+    STATUS_OTHER,
+    STATUS_WORKING,
+    has_column,
+    get_assignee_column,
+    get_column,
+)
 
 # Soft Minimalist Color Palette
 SBS_COLORS = {
@@ -24,30 +45,6 @@ FONTS = {
     'body': 'Questrial, sans-serif'  # Paragraphs and body text
 }
 
-def get_column(df, col_name):
-    """
-    Helper function to get a column by its original name, even if it has a unique suffix.
-    Returns the column name with the suffix that exists in the DataFrame.
-    """
-    # First try exact match
-    if col_name in df.columns:
-        return col_name
-
-    # Try to find column with ___ suffix
-    matching_cols = [col for col in df.columns if col.startswith(f"{col_name}___")]
-    if matching_cols:
-        return matching_cols[0]  # Return the first match
-
-    # Fallback: return the original name (will cause KeyError if doesn't exist)
-    return col_name
-
-def has_column(df, col_name):
-    """Check if a column exists by original name"""
-    if col_name in df.columns:
-        return True
-    return any(col.startswith(f"{col_name}___") for col in df.columns)
-
-
 def create_project_tasks_overview_chart(exec_metrics):
     """
     Combined Project Tasks Overview with premium light theme
@@ -147,54 +144,67 @@ def create_project_tasks_overview_chart(exec_metrics):
     return fig
 
 
-def create_task_age_analysis(df):
+def create_task_age_analysis(df, age_edges=AGE_BUCKET_EDGES):
     """
     Task Age Analysis with dark theme
-    Shows how long tasks have been open
+    Shows how long tasks have been open (days since Date Assigned), split by status
+
+    Args:
+        df: Task frame (or a filtered view of it)
+        age_edges: Age bucket boundaries in days (see task_metrics.AGE_BUCKET_EDGES)
     """
-    if df.empty:
+    if df.empty or not has_column(df, "Date Assigned"):
         st.info("No task age data available.")
         return None
 
-    # Calculate task ages (mock data for now - would need Created Date column)
-    age_ranges = {
-        '0-7 days': 0,
-        '8-14 days': 0,
-        '15-30 days': 0,
-        '30+ days': 0
-    }
-
-    # Mock calculation - in real implementation would parse Created Date
-    import random
-    total_tasks = len(df)
-    age_ranges['0-7 days'] = int(total_tasks * 0.4)
-    age_ranges['8-14 days'] = int(total_tasks * 0.3)
-    age_ranges['15-30 days'] = int(total_tasks * 0.2)
-    age_ranges['30+ days'] = total_tasks - sum([age_ranges['0-7 days'], age_ranges['8-14 days'], age_ranges['15-30 days']])
-
-    labels = list(age_ranges.keys())
-    values = list(age_ranges.values())
+    # Real ages from the parsed Date Assigned, bucketed per status (cached per data version)
+    age_table = task_age_breakdown(df, age_edges)
+    if not age_table.to_numpy().any():
+        st.info("No task age data available.")
+        return None
 
-    # Calculate max value for y-axis range
-    max_value = max(values) if values else 10
+    labels = age_table.index.tolist()
+    bucket_totals = age_table.sum(axis=1).tolist()
 
-    # Soft minimalist gradient: Black to Tan grey brown
-    colors = ['#2B2B2B', '#474747', '#918C86', '#E5E4E2']
+    # Calculate max value for y-axis range
+    max_value = max(bucket_totals) if bucket_totals else 10
+
+    # Soft minimalist gradient: Black to Tan grey brown, one shade per status
+    status_styles = [
+        (STATUS_OPEN, 'Open', '#2B2B2B'),
+        (STATUS_WORKING, 'In Progress', '#474747'),
+        (STATUS_DONE, 'Done', '#918C86'),
+        (STATUS_ARCHIVED, 'Archived', '#E5E4E2'),
+        (STATUS_OTHER, 'Other', '#C9C5C0'),
+    ]
 
-    fig = go.Figure(data=[go.Bar(
+    fig = go.Figure()
+    for status, name, color in status_styles:
+        values = age_table[status].tolist()
+        if not any(values):
+            continue
+        fig.add_trace(go.Bar(
+            x=labels,
+            y=values,
+            name=name,
+            marker=dict(
+                color=color,
+                line=dict(color=SBS_COLORS['bg_white'], width=2)
+            ),
+            hovertemplate=f'<b>%{{x}}</b><br>{name}: %{{y}}<extra></extra>',
+        ))
+
+    # Bucket totals above each stack
+    fig.add_trace(go.Scatter(
         x=labels,
-        y=values,
-        marker=dict(
-            color=colors,
-            line=dict(color=SBS_COLORS['bg_white'], width=2)
-        ),
-        text=values,
-        textposition='outside',
+        y=bucket_totals,
+        mode='text',
+        text=bucket_totals,
+        textposition='top center',
         textfont=dict(size=14, color=SBS_COLORS['text_dark'], family=FONTS['body'], weight='bold'),
-        hovertemplate='<b>%{x}</b><br>Tasks: %{y}<extra></extra>',
+        hoverinfo='skip',
         showlegend=False,
-        name=None
-    )])
+    ))
 
     fig.update_layout(
         title='',
@@ -202,7 +212,16 @@ def create_task_age_analysis(df):
         margin=dict(t=50, b=40, l=50, r=40),
         paper_bgcolor=SBS_COLORS['bg_white'],
         plot_bgcolor=SBS_COLORS['bg_light'],
-        showlegend=False,
+        barmode='stack',
+        showlegend=True,
+        legend=dict(
+            orientation='h',
+            yanchor='bottom',
+            y=1.02,
+            xanchor='center',
+            x=0.5,
+            font=dict(size=12, color=SBS_COLORS['text_dark'], family=FONTS['body'])
+        ),
         hovermode='x unified',
         xaxis=dict(
             title='',
@@ -221,17 +240,17 @@ def create_task_age_analysis(df):
     return fig
 
 
-def create_task_completion_velocity(exec_metrics):
+def create_task_completion_velocity(exec_metrics, days=VELOCITY_DAYS):
     """
     Task Completion Velocity with dark theme
-    Shows tasks completed over time (last 7 days)
+    Shows tasks completed per day over the last `days` days, from the status event log
     """
-    # Mock data - in real implementation would use actual completion dates
-    days = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
-    completed_counts = [3, 5, 2, 7, 4, 1, 6]  # Mock data
+    counts = daily_completions(get_event_log(st.secrets), days=days)
+    day_labels = [day.strftime('%a %b %d') for day in counts.index]
+    completed_counts = counts.tolist()
 
     fig = go.Figure(data=[go.Scatter(
-        x=days,
+        x=day_labels,
         y=completed_counts,
         mode='lines+markers',
         line=dict(color=SBS_COLORS['accent_primary'], width=3),
@@ -272,6 +291,92 @@ def create_task_completion_velocity(exec_metrics):
     return fig
 
 
+def _event_bar_chart(labels, values, title, axis_title, hovertemplate, customdata=None):
+    """Horizontal bar chart in the velocity chart's theme (event log charts)"""
+    fig = go.Figure(data=[go.Bar(
+        y=labels,
+        x=values,
+        orientation='h',
+        marker=dict(
+            color=SBS_COLORS['accent_medium'],
+            line=dict(color=SBS_COLORS['border'], width=2)
+        ),
+        text=[f"{value:g}" for value in values],
+        textposition='outside',
+        textfont=dict(size=14, color=SBS_COLORS['text_light'], family='-apple-system, sans-serif'),
+        hovertemplate=hovertemplate,
+        customdata=customdata
+    )])
+
+    fig.update_layout(
+        title=dict(
+            text=f'<b>{title}</b>',
+            x=0.5,
+            xanchor='center',
+            font=dict(size=18, color=SBS_COLORS['text_light'], family='-apple-system, sans-serif')
+        ),
+        height=400,
+        margin=dict(t=60, b=40, l=140, r=60),
+        paper_bgcolor=SBS_COLORS['bg_white'],
+        plot_bgcolor=SBS_COLORS['bg_light'],
+        xaxis=dict(
+            showgrid=True,
+            gridcolor='rgba(229, 231, 235, 0.6)',
+            title=dict(text=axis_title, font=dict(size=12, color=SBS_COLORS['text_light'])),
+            tickfont=dict(size=11, color=SBS_COLORS['text_light']),
+            range=[0, max(values) * 1.25 if len(values) else 1]
+        ),
+        yaxis=dict(
+            title='',
+            tickfont=dict(size=12, color=SBS_COLORS['text_light']),
+            autorange='reversed'
+        )
+    )
+
+    return fig
+
+
+def create_throughput_chart(days=THROUGHPUT_DAYS, by="project"):
+    """
+    Completions per project (or person) over the last `days` days, from the status event log
+    """
+    counts = throughput(get_event_log(st.secrets), days=days, by=by)
+    if counts.empty:
+        st.info("No completed tasks recorded yet.")
+        return None
+
+    return _event_bar_chart(
+        [str(group).title() for group in counts.index],
+        counts.tolist(),
+        f'Throughput (last {days} days)',
+        'Tasks Completed',
+        '<b>%{y}</b><br>Completed: %{x}<extra></extra>',
+    )
+
+
+def create_cycle_time_chart(days=CYCLE_TIME_DAYS):
+    """
+    Median days from starting work to done per project, for tasks completed in
+    the last `days` days, from the status event log
+    """
+    cycles = cycle_times(get_event_log(st.secrets), days=days)
+    if cycles.empty:
+        st.info("No completed cycles recorded yet.")
+        return None
+
+    cycles["project"] = cycles["project"].str.strip().str.title().replace("", "Unassigned")
+    by_project = cycles.groupby("project")["days"].agg(["median", "count"]).sort_values("median", ascending=False)
+
+    return _event_bar_chart(
+        by_project.index.tolist(),
+        by_project["median"].round(1).tolist(),
+        f'Cycle Time (last {days} days)',
+        'Median Days to Done',
+        '<b>%{y}</b><br>Median: %{x} days<br>Tasks: %{customdata}<extra></extra>',
+        customdata=by_project["count"],
+    )
+
+
 def create_project_health_dashboard(exec_metrics):
     """
     Project Health Dashboard with dark theme
@@ -422,11 +527,16 @@ def create_project_breakdown_chart(df):
         st.info("No project data available.")
         return None
 
-    # Get the actual column name (with suffix if it exists)
-    project_col = get_column(df, "Project")
+    # Count tasks by project (trimmed, case-insensitive keys from the typed view)
+    project_key = get_typed_view(df)["project_key"]
+    project_counts = project_key.value_counts()
+    project_counts = project_counts[project_counts > 0]
 
-    # Count tasks by project
-    project_counts = df[project_col].str.lower().str.strip().value_counts()
+    # Tasks with a blank project still get their own (unnamed) bar
+    blank = int((project_key.isna().to_numpy() & df[get_column(df, "Project")].notna().to_numpy()).sum())
+    if blank:
+        project_counts = pd.concat([project_counts.rename(index=str), pd.Series({"": blank})])
+        project_counts = project_counts.sort_values(ascending=False, kind="stable")
 
     if project_counts.empty:
         st.info("No project data to display.")
@@ -503,13 +613,7 @@ def create_tasks_by_user_chart(df):
         return None
 
     # Find the assignee column
-    assignee_col = None
-    if has_column(df, "Assigned To"):
-        assignee_col = get_column(df, "Assigned To")
-    elif has_column(df, "Person"):
-        assignee_col = get_column(df, "Person")
-    elif has_column(df, "assignee"):
-        assignee_col = get_column(df, "assignee")
+    assignee_col = get_assignee_column(df)
 
     if not assignee_col:
         st.info("No assignee data available.")
@@ -199,8 +199,7 @@ def write_demo_data_to_sheet_permanently(secrets):
     Args:
         secrets: Streamlit secrets dictionary
     """
-    import gspread
-    from google.oauth2.service_account import Credentials
+    from task_storage import open_worksheet
 
     print("⚠️  WARNING: This will PERMANENTLY replace all data in your Google Sheet!")
     print("Starting in 3 seconds...")
@@ -208,27 +207,12 @@ def write_demo_data_to_sheet_permanently(secrets):
     time.sleep(3)
 
     try:
-        # Define the scope
-        scope = [
-            "https://spreadsheets.google.com/feeds",
-            "https://www.googleapis.com/auth/drive"
-        ]
-
-        # Load credentials
-        creds_dict = secrets["gcp_service_account"]
-        creds = Credentials.from_service_account_info(creds_dict, scopes=scope)
-
-        # Authorize and open the sheet
-        client = gspread.authorize(creds)
         sheet_id = secrets.get("google_sheet_id", "1xENgMtZL5DSEHKFvYr34UZsJIDCxlTw-BbS3giYrHvw")
 
         print(f"📊 Opening Google Sheet: {sheet_id}")
 
-        # Open the Otter_Tasks worksheet
-        try:
-            sheet = client.open_by_key(sheet_id).worksheet("Otter_Tasks")
-        except:
-            sheet = client.open_by_key(sheet_id).sheet1
+        # Open the Otter_Tasks worksheet on the configured storage backend
+        sheet = open_worksheet(secrets, sheet_id, "Otter_Tasks")
 
         print("📥 Loading current data...")
         # Get all values
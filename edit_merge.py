@@ -0,0 +1,101 @@
+"""
+Edit Merge Engine for SBS Dashboard
+Aligns editor output (st.data_editor, AgGrid) with the task rows it was built
+from and applies only the cells the user actually changed, in one assignment
+"""
+
+import numpy as np
+import pandas as pd
+
+from sheet_sync import cell_text
+
+_to_text = np.frompyfunc(cell_text, 1, 1)
+
+
+def changed_cell_mask(before, edited):
+    """
+    Boolean frame, True where the editor output differs from what was shown.
+
+    Cells are compared as sheet text, so None, NaN and "" are all equal. Rows
+    and columns are matched by label; ones missing from edited count as unchanged.
+
+    Args:
+        before: Frame shown in the editor
+        edited: Editor output, indexed by the same row keys
+
+    Returns:
+        DataFrame of bools with before's index and columns
+    """
+    rows = before.index.intersection(edited.index)
+    cols = before.columns.intersection(edited.columns)
+    old = _to_text(before.loc[rows, cols].to_numpy(dtype=object))
+    new = _to_text(edited.loc[rows, cols].to_numpy(dtype=object))
+    mask = pd.DataFrame(old != new, index=rows, columns=cols)
+    return mask.reindex(index=before.index, columns=before.columns, fill_value=False)
+
+
+def row_fingerprints(frame):
+    """
+    Content hash per row, with cells compared as text (None, NaN and "" hash alike).
+
+    Hash the frame an editor was built from once, then compare the editor output
+    against it with dirty_rows() on every rerun.
+    """
+    return pd.util.hash_pandas_object(frame.fillna("").astype(str), index=False)
+
+
+def dirty_rows(before_hashes, edited):
+    """
+    Row keys whose content differs from the fingerprints taken when the editor was built.
+
+    Args:
+        before_hashes: row_fingerprints() of the frame shown in the editor
+        edited: Editor output with the same columns (in the same order), indexed by row key
+
+    Returns:
+        Index of changed row keys, including rows added to or removed from the editor
+    """
+    after = row_fingerprints(edited)
+    changed = after.index[(before_hashes.reindex(after.index) != after).to_numpy()]
+    return changed.union(before_hashes.index.difference(after.index))
+
+
+def merge_edits(source_df, before, edited, column_mapping=None, transforms=None):
+    """
+    Apply the cells changed in an editor back onto the rows it was built from.
+
+    Args:
+        source_df: Frame the editor rows came from (indexed by row key, e.g. sheet row)
+        before: Frame shown in the editor (display column names), indexed like source_df
+        edited: Editor output, indexed by the same row keys as before
+        column_mapping: {display column: source_df column} (same name if omitted)
+        transforms: {display column: fn} applied to changed values before they're
+            written back (e.g. stripping display-only decorations)
+
+    Returns:
+        The changed rows of source_df with the edits applied (empty if nothing
+        changed); pass it straight to the save path as the minimal diff
+    """
+    mapping = column_mapping or {}
+    transforms = transforms or {}
+
+    mask = changed_cell_mask(before, edited)
+    display_cols = [
+        col for col in mask.columns[mask.any(axis=0).to_numpy()]
+        if mapping.get(col, col) in source_df.columns
+    ]
+    mask = mask[display_cols]
+    rows = mask.index[mask.any(axis=1).to_numpy()].intersection(source_df.index)
+    if len(rows) == 0:
+        return source_df.iloc[0:0]
+
+    source_cols = [mapping.get(col, col) for col in display_cols]
+    values = edited.loc[rows, display_cols].copy()
+    for col, fn in transforms.items():
+        if col in values.columns:
+            values[col] = values[col].map(lambda value: fn(value) if pd.notna(value) else value)
+
+    delta = source_df.loc[rows].copy()
+    current = delta[source_cols].to_numpy(dtype=object)
+    delta[source_cols] = np.where(mask.loc[rows].to_numpy(), values.to_numpy(dtype=object), current)
+    return delta
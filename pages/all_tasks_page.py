@@ -3,11 +3,12 @@ import pandas as pd
 import re
 from .dashboard_page import (
     load_google_sheet,
-    get_column,
-    has_column,
     render_editable_task_grid,
-    render_page_header
+    render_page_header,
+    render_data_freshness
 )
+from task_schema import get_column, has_column, get_assignee_column
+from task_scope import SCOPE_OWN, SCOPE_TEAM, apply_scope, is_admin_user, is_team_lead
 
 def show_analytics():
     """
@@ -21,44 +22,19 @@ def show_analytics():
         st.warning("No data available. Please check your Google Sheet connection.")
         return
 
+    render_data_freshness()
+
     # Get current user
     user_name = st.session_state.get("name", "User")
-    user_lower = user_name.lower()
-    is_admin = ("anna" in user_lower and "ciboro" in user_lower) or "tea" in user_lower or "téa" in user_lower or "tēa" in user_lower
-    is_jess = "jess" in user_name.lower()
+    is_admin = is_admin_user(user_name)
+    is_jess = is_team_lead(user_name)
 
     # Filter data based on user - ONLY admin sees all tasks
-    if is_admin:
-        # Admin sees everyone's tasks - no filtering needed
+    # (Jess sees her team's tasks, everyone else their own; rows are compiled once per data version)
+    if is_admin or not get_assignee_column(df):
         filtered_df = df.copy()
-    elif is_jess:
-        # Jess sees her team's tasks (Jess, Megan, Justin)
-        assignee_col = None
-        if has_column(df, "Assigned To"):
-            assignee_col = get_column(df, "Assigned To")
-        elif has_column(df, "Person"):
-            assignee_col = get_column(df, "Person")
-        elif has_column(df, "assignee"):
-            assignee_col = get_column(df, "assignee")
-
-        if assignee_col:
-            filtered_df = df[df[assignee_col].str.lower().str.contains('jess|megan|justin', na=False, regex=True)].copy()
-        else:
-            filtered_df = df.copy()
     else:
-        # Other users (Megan, Justin, etc.) should only see their own tasks
-        assignee_col = None
-        if has_column(df, "Assigned To"):
-            assignee_col = get_column(df, "Assigned To")
-        elif has_column(df, "Person"):
-            assignee_col = get_column(df, "Person")
-        elif has_column(df, "assignee"):
-            assignee_col = get_column(df, "assignee")
-
-        if assignee_col:
-            filtered_df = df[df[assignee_col].str.lower().str.contains(user_name.lower(), na=False, regex=False)].copy()
-        else:
-            filtered_df = df.copy()
+        filtered_df = apply_scope(df, user_name, SCOPE_TEAM if is_jess else SCOPE_OWN).copy()
 
     # Use filtered_df for the rest of the page
     df = filtered_df
@@ -122,7 +98,13 @@ def show_analytics():
         df = df[~df[status_col].str.lower().isin(['done', 'complete', 'completed', 'closed'])].copy()
 
     # Add analytics charts for All Tasks
-    from charts import create_task_completion_velocity, create_project_health_dashboard, create_tasks_by_user_chart
+    from charts import (
+        create_cycle_time_chart,
+        create_project_health_dashboard,
+        create_task_completion_velocity,
+        create_tasks_by_user_chart,
+        create_throughput_chart,
+    )
     from .dashboard_page import calculate_executive_metrics
 
     # Calculate metrics for charts
@@ -143,6 +125,21 @@ def show_analytics():
 
     st.markdown("<div style='margin-bottom: 32px;'></div>", unsafe_allow_html=True)
 
+    # Completions and time-to-done per project, from the status event log
+    event_col1, event_spacer, event_col2 = st.columns([1, 0.1, 1])
+
+    with event_col1:
+        throughput_fig = create_throughput_chart()
+        if throughput_fig:
+            st.plotly_chart(throughput_fig, use_container_width=True)
+
+    with event_col2:
+        cycle_fig = create_cycle_time_chart()
+        if cycle_fig:
+            st.plotly_chart(cycle_fig, use_container_width=True)
+
+    st.markdown("<div style='margin-bottom: 32px;'></div>", unsafe_allow_html=True)
+
     # Add Tasks by User chart for Tea only
     if is_admin:
         st.markdown("<h3 style='text-align: left; margin: 0 0 20px 0; color: #2B2B2B; font-weight: 600; font-size: 1.1rem; font-family: -apple-system, BlinkMacSystemFont, \"Segoe UI\", sans-serif;'>Tasks by User</h3>", unsafe_allow_html=True)
@@ -3,11 +3,13 @@ import pandas as pd
 import re
 from .dashboard_page import (
     load_google_sheet,
-    get_column,
-    has_column,
     render_tasks_table,
-    render_page_header
+    render_page_header,
+    render_data_freshness
 )
+from task_schema import has_column, get_assignee_column
+from task_data import get_typed_view
+from task_scope import SCOPE_OWN, apply_scope, is_admin_user
 
 def show_archive():
     """
@@ -16,8 +18,7 @@ def show_archive():
     # Get current user from session state
     user_name = st.session_state.get("name", "User")
     first_name = user_name.split()[0] if user_name else "User"
-    user_lower = user_name.lower()
-    is_admin = ("anna" in user_lower and "ciboro" in user_lower) or "tea" in user_lower or "téa" in user_lower or "tēa" in user_lower
+    is_admin = is_admin_user(user_name)
     is_jess = "jess" in user_name.lower()
 
     # Page header matching MY TASKS / ALL TASKS style
@@ -40,28 +41,21 @@ def show_archive():
         st.warning("No data available. Please check your Google Sheet connection.")
         return
 
+    render_data_freshness()
+
     # Filter by user if not Tea (Tea sees ALL archived tasks)
     if not is_admin:
         # Everyone else sees only their own archived tasks
-        assignee_col = None
-        if has_column(df, "Assigned To"):
-            assignee_col = get_column(df, "Assigned To")
-        elif has_column(df, "assignee"):
-            assignee_col = get_column(df, "assignee")
-        elif has_column(df, "Person"):
-            assignee_col = get_column(df, "Person")
-
-        if assignee_col:
-            df = df[df[assignee_col].str.lower().str.contains(user_name.lower(), na=False)].copy()
+        if get_assignee_column(df):
+            df = apply_scope(df, user_name, SCOPE_OWN).copy()
         else:
             st.error(f"Cannot filter tasks: No assignee column found. Available columns: {', '.join(df.columns.tolist())}")
             return
 
     # Filter for done tasks only
     if has_column(df, "Status"):
-        status_col = get_column(df, "Status")
         # Filter for done/complete status (case-insensitive)
-        archived_df = df[df[status_col].str.strip().str.lower().isin(['done', 'complete', 'completed'])]
+        archived_df = df[get_typed_view(df)["status_text"].isin(['done', 'complete', 'completed'])]
     else:
         st.warning("Status column not found in data.")
         return
@@ -95,8 +89,8 @@ def show_archive():
 
     # Display archived tasks grouped by project
     if has_column(archived_df, "Project"):
-        project_col = get_column(archived_df, "Project")
-        unique_projects = archived_df[project_col].str.strip().str.title().dropna().unique()
+        archived_typed = get_typed_view(archived_df)
+        unique_projects = archived_typed["project"].map(str.title, na_action="ignore").dropna().unique()
         unique_projects = sorted([p for p in unique_projects if p])
 
         if len(unique_projects) > 0:
@@ -104,7 +98,7 @@ def show_archive():
             st.markdown("<br>", unsafe_allow_html=True)
 
             for project_name in unique_projects:
-                project_df = archived_df[archived_df[project_col].str.strip().str.lower() == project_name.lower()]
+                project_df = archived_df[archived_typed["project_key"] == project_name.lower()]
                 task_count = len(project_df)
 
                 st.markdown(f"#### {project_name} ({task_count} archived tasks)")
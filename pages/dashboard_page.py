@@ -1,36 +1,16 @@
 import streamlit as st
 import pandas as pd
-import gspread
 import re
-from google.oauth2 import service_account
-from google.oauth2.service_account import Credentials
 from st_aggrid import AgGrid, GridOptionsBuilder, GridUpdateMode
 from charts import create_team_completion_donut, create_project_breakdown_chart
-from demo_data_transformer import transform_to_demo_data
-from ui_helpers import get_status_badge, format_relative_date, create_fab_button, create_global_search, create_skeleton_loader, get_priority_badge
-
-def get_column(df, col_name):
-    """
-    Helper function to get a column by its original name, even if it has a unique suffix.
-    Returns the column name with the suffix that exists in the DataFrame.
-    """
-    # First try exact match
-    if col_name in df.columns:
-        return col_name
-
-    # Try to find column with ___ suffix
-    matching_cols = [col for col in df.columns if col.startswith(f"{col_name}___")]
-    if matching_cols:
-        return matching_cols[0]  # Return the first match
-
-    # Fallback: return the original name (will cause KeyError if doesn't exist)
-    return col_name
-
-def has_column(df, col_name):
-    """Check if a column exists by original name"""
-    if col_name in df.columns:
-        return True
-    return any(col.startswith(f"{col_name}___") for col in df.columns)
+from task_data import load_task_data, get_snapshot_status, get_typed_view, get_task_snapshot, queue_task_edits, find_row_conflicts
+from sheet_sync import cell_text, frame_cell_changes
+from edit_merge import changed_cell_mask, dirty_rows, merge_edits, row_fingerprints
+from task_metrics import get_kpis, memoized_metric, status_breakdown, task_timing
+from task_events import status_change
+from task_scope import SCOPE_OWN, SCOPE_TEAM, apply_scope, is_admin_user, is_team_lead
+from task_schema import STATUS_OPEN, STATUS_WORKING, STATUS_DONE, STATUS_ARCHIVED, get_column, has_column, get_assignee_column, get_transcript_column
+from ui_helpers import get_status_badge, format_relative_date, create_fab_button, create_global_search, create_skeleton_loader, get_priority_badge, create_freshness_indicator
 
 def render_page_header(title, subtitle=None):
     """
@@ -61,263 +41,155 @@ def render_page_header(title, subtitle=None):
             '>{subtitle}</p>
         """, unsafe_allow_html=True)
 
-# Access scope mapping
-ACCESS_SCOPE = {
-    "Téa Phillips": "all",
-    "Jess Lewis": {"exclude": ["Finance"]},
-    "Megan Cole": ["Marketing"],
-    "Justin Stehr": ["Marketing", "Products"],
-}
-
-def get_scope_description(user_name, scope):
-    """
-    Generate a friendly description of the user's access scope
-    """
-    if scope == "all":
-        return "All Strategic Business Solutions projects"
-    elif isinstance(scope, dict) and "exclude" in scope:
-        excluded = ", ".join(scope["exclude"])
-        return f"All projects except {excluded}"
-    elif isinstance(scope, list):
-        if len(scope) == 1:
-            return f"{scope[0]} projects"
-        else:
-            return f"{' and '.join(scope)} projects"
-    else:
-        return "Your assigned tasks"
-
-def filter_by_access(df, user_name):
+def load_google_sheet():
     """
-    Filter dataframe based on user's access scope.
-    Reusable helper function for dashboard, analytics, and team pages.
-
-    Args:
-        df: DataFrame with at least 'Assigned To' or 'Person' and 'Project' columns
-        user_name: Full name of the user (e.g., "Téa Phillips")
-
-    Returns:
-        Filtered DataFrame based on user's access scope
+    Load data from Google Sheets (Otter_Tasks worksheet)
+    Served from the shared task snapshot so every page reuses one download and parse
     """
-    if df.empty:
-        return df
+    snapshot = get_task_snapshot()
+    df = snapshot.frame
 
-    # Get user's access scope
-    scope = ACCESS_SCOPE.get(user_name, None)
+    # Remember the snapshot this run renders, so saves only send what the user changed
+    st.session_state.task_snapshot = snapshot
 
-    # Filter based on scope type
-    if scope == "all":
-        # Show all rows
-        return df
-
-    elif isinstance(scope, dict) and "exclude" in scope:
-        # Filter out excluded projects
-        excluded_projects = scope["exclude"]
-        if has_column(df, "Project"):
-            project_col = get_column(df, "Project")
-            # Case-insensitive filtering
-            filtered_df = df[~df[project_col].str.strip().str.lower().isin([p.lower() for p in excluded_projects])]
-            return filtered_df
-        return df
+    # Store the mapping of clean column names to unique column names for reference
+    if 'column_mapping' not in st.session_state:
+        st.session_state.column_mapping = {}
 
-    elif isinstance(scope, list):
-        # Include only specified projects
-        if has_column(df, "Project"):
-            project_col = get_column(df, "Project")
-            # Case-insensitive filtering
-            filtered_df = df[df[project_col].str.strip().str.lower().isin([p.lower() for p in scope])]
-            return filtered_df
-        return df
+    for col in df.columns:
+        orig_name = re.sub(r'__+.*$', '', str(col))
+        if orig_name not in st.session_state.column_mapping:
+            st.session_state.column_mapping[orig_name] = col
 
-    else:
-        # Default: show only user's own assigned tasks
-        if has_column(df, "Person"):
-            person_col = get_column(df, "Person")
-        elif has_column(df, "Assigned To"):
-            person_col = get_column(df, "Assigned To")
-        else:
-            return df
+    return df
 
-        filtered_df = df[df[person_col].str.contains(user_name, case=False, na=False)]
-        return filtered_df
+def render_data_freshness():
+    """
+    Show when the task data was last refreshed from Google Sheets
+    Pages render from the last good snapshot while a newer one loads in the background
+    """
+    indicator_html = create_freshness_indicator(get_snapshot_status())
+    if indicator_html:
+        st.markdown(indicator_html, unsafe_allow_html=True)
 
-@st.cache_data(ttl=45)  # Cache for 45 seconds to reduce API calls
-def load_google_sheet():
+def editor_base_snapshot(editor_key, has_edits):
     """
-    Load data from Google Sheets (Otter_Tasks worksheet)
-    Cached for 45 seconds to avoid hitting API quota limits
+    Snapshot an editor's unsaved edits were made against
+    Follows the snapshot each run renders while the editor has no edits, then stays on
+    the one the user was shown until the edits are saved (forget_editor_snapshot), so a
+    refresh landing between render and Save can't hide a conflicting change
+
+    Args:
+        editor_key: Widget key (or key prefix) of the editor
+        has_edits: True if the editor currently holds unsaved edits
     """
-    try:
-        # Define the scope
-        scope = [
-            "https://spreadsheets.google.com/feeds",
-            "https://www.googleapis.com/auth/drive"
-        ]
-
-        # Load credentials from Streamlit secrets
-        creds_dict = st.secrets["gcp_service_account"]
-        creds = Credentials.from_service_account_info(creds_dict, scopes=scope)
-
-        # Authorize and open the sheet
-        client = gspread.authorize(creds)
-        
-        # Use Google Sheet ID: 1xENgMtZL5DSEHKFvYr34UZsJIDCxlTw-BbS3giYrHvw
-        sheet_id = "1xENgMtZL5DSEHKFvYr34UZsJIDCxlTw-BbS3giYrHvw"
-
-        # Try to open Otter_Tasks worksheet, fallback to first sheet
-        try:
-            sheet = client.open_by_key(sheet_id).worksheet("Otter_Tasks")
-        except:
-            sheet = client.open_by_key(sheet_id).sheet1
-
-        # Get all values as list of lists
-        all_values = sheet.get_all_values()
-
-        if not all_values or len(all_values) < 2:
-            st.warning("Sheet is empty or has no data rows.")
-            return pd.DataFrame()
-
-        # First row is headers, rest is data
-        headers = all_values[0]
-        data_rows = all_values[1:]
-
-        # Create DataFrame
-        df = pd.DataFrame(data_rows, columns=headers)
-
-        # Remove empty rows
-        df = df.dropna(how='all')
-
-        # Remove columns with empty headers AND no data
-        # Use column indices to avoid duplicate column name issues
-        cols_to_keep = []
-        for idx, col in enumerate(df.columns):
-            # Keep column if it has a non-empty header OR has any non-empty data
-            if str(col).strip() != '':
-                cols_to_keep.append(idx)
-            else:
-                # Check if column has any data (using iloc to avoid duplicate column issues)
-                col_data = df.iloc[:, idx].astype(str).str.strip()
-                if col_data.ne('').any():
-                    cols_to_keep.append(idx)
-
-        # Select only the columns we want to keep
-        df = df.iloc[:, cols_to_keep]
-
-        # Store mapping of clean column names to unique column names
-        # This allows the rest of the code to reference "Person", "Task", etc.
-        original_cols = [str(col).strip() for col in df.columns]
-
-        # Define columns to hide by name
-        columns_to_hide = ["Progress Bar", "Confidence", "Emails", "Duplicate Check", "0%"]
-
-        # Filter columns: keep the first 10 columns PLUS column 14 (Priority) and exclude unwanted ones
-        filtered_indices = []
-        for i, col_name in enumerate(original_cols):
-            # Keep first 10 columns (0-9) which are the main task fields, PLUS column 13 (index 13 = column 14 in sheets)
-            # Column 14 is the Priority column
-            if i >= 10 and i != 13:
-                continue
-            # Skip columns in the hide list
-            if col_name in columns_to_hide or "confidence" in col_name.lower():
-                continue
-            filtered_indices.append(i)
-
-        # Keep only the filtered columns
-        df = df.iloc[:, filtered_indices]
-        original_cols = [original_cols[i] for i in filtered_indices]
-
-        # Ensure Priority column has a name (it's column 14, index 13 in original sheet)
-        # If column 13 was included and has empty name, name it "Priority"
-        if 13 in filtered_indices:
-            priority_position = filtered_indices.index(13)
-            if not original_cols[priority_position] or original_cols[priority_position].strip() == '':
-                original_cols[priority_position] = "Priority"
-
-        # Make ALL column names absolutely unique by appending index
-        unique_cols = [f"{original_cols[i]}___{i}" for i in range(len(original_cols))]
-        df.columns = unique_cols
-
-        # Store the mapping in session state for reference
-        if 'column_mapping' not in st.session_state:
-            st.session_state.column_mapping = {}
-
-        # Map original name to unique name (for first occurrence only)
-        for i, orig_name in enumerate(original_cols):
-            if orig_name not in st.session_state.column_mapping:
-                st.session_state.column_mapping[orig_name] = unique_cols[i]
-
-        # Apply demo data transformation PERMANENTLY
-        # Transform sensitive data before returning
-        df_demo = transform_to_demo_data(df)
-
-        return df_demo
+    state_key = f"{editor_key}_base_snapshot"
+    if not has_edits or state_key not in st.session_state:
+        st.session_state[state_key] = st.session_state.get("task_snapshot") or get_task_snapshot()
+    return st.session_state[state_key]
 
-    except Exception as e:
-        st.error(f"Error loading Google Sheet: {str(e)}")
-        return pd.DataFrame()
+def forget_editor_snapshot(editor_key):
+    """Drop an editor's pinned snapshot after its edits were saved"""
+    st.session_state.pop(f"{editor_key}_base_snapshot", None)
 
-def update_google_sheet(updated_df):
+def update_google_sheet(updated_df, base=None):
     """
     Push edited data back to Google Sheets (Otter_Tasks worksheet)
-    SMART MODE: Updates existing rows in place, appends new rows to first blank line
+    DIFF MODE: Sends only the cells that differ from the snapshot the edit started from,
+    grouped into as few ranges as possible in one batch_update call.
+    Rows are addressed by their sheet row number (the frame index), and rows that
+    changed in the sheet since they were loaded are skipped instead of overwritten.
+    Rows that aren't in the snapshot yet are appended to the first blank line
+    WRITE-BEHIND: The edits show up in the shared snapshot immediately and are written
+    to the sheet by a background thread (see task_data.queue_task_edits)
+
+    Args:
+        updated_df: Edited rows, indexed by sheet row
+        base: Snapshot the user was shown when editing (editor_base_snapshot);
+            defaults to the snapshot this run rendered
     """
     try:
-        SCOPES = [
-            "https://www.googleapis.com/auth/spreadsheets",
-            "https://www.googleapis.com/auth/drive",
-        ]
-        creds = service_account.Credentials.from_service_account_info(
-            st.secrets["gcp_service_account"], scopes=SCOPES
-        )
-        gc = gspread.authorize(creds)
-
-        # Use Google Sheet ID: 1xENgMtZL5DSEHKFvYr34UZsJIDCxlTw-BbS3giYrHvw
-        SHEET_ID = "1xENgMtZL5DSEHKFvYr34UZsJIDCxlTw-BbS3giYrHvw"
-
-        # Try to open Otter_Tasks worksheet, fallback to first sheet
-        try:
-            ws = gc.open_by_key(SHEET_ID).worksheet("Otter_Tasks")
-        except:
-            ws = gc.open_by_key(SHEET_ID).sheet1
-
-        # Get current sheet data to compare
-        current_data = ws.get_all_values()
-        current_row_count = len(current_data)  # Includes header
-
-        # Strip the suffix from column names before writing back
-        df_to_write = updated_df.copy()
-        clean_columns = []
-        for col in df_to_write.columns:
-            # Remove everything from __ onwards (two or more underscores)
-            clean_col = re.sub(r'__+.*$', '', str(col))
-            clean_columns.append(clean_col)
-        df_to_write.columns = clean_columns
-
-        # Remove completely empty rows (all columns are empty/whitespace)
-        df_to_write = df_to_write.replace('', pd.NA).dropna(how='all').fillna('')
-
-        # Determine how many rows are in the updated dataframe
-        new_row_count = len(df_to_write) + 1  # +1 for header
-
-        if new_row_count > current_row_count:
-            # NEW ROWS ADDED - only append the new rows to the end
-            num_new_rows = new_row_count - current_row_count
-            new_rows = df_to_write.iloc[-num_new_rows:].values.tolist()
-
-            # Append new rows starting at the first blank row
-            for row_data in new_rows:
-                ws.append_row(row_data)
-        else:
-            # EXISTING ROWS UPDATED - update only the changed rows
-            # Update header + all data rows (overwrite existing range only)
-            data_to_write = [df_to_write.columns.values.tolist()] + df_to_write.values.tolist()
-            range_to_update = f'A1:{chr(65 + len(df_to_write.columns) - 1)}{len(data_to_write)}'
-            ws.update(range_to_update, data_to_write)
+        base = base or st.session_state.get("task_snapshot") or get_task_snapshot()
+        if not base.sheet_columns:
+            # Snapshot restored from an older disk copy - learn the sheet layout first
+            load_task_data(force_refresh=True)
+            base = get_task_snapshot()
+
+        # EXISTING ROWS - update only the changed cells (rows are matched by sheet row)
+        changes = frame_cell_changes(base.frame, updated_df, base.sheet_columns)
+        conflicts = find_row_conflicts(base, {row for row, _ in changes})
+        if conflicts:
+            changes = {cell: value for cell, value in changes.items() if cell[0] not in conflicts}
+            st.warning(
+                f"⚠️ {len(conflicts)} row(s) changed in Google Sheets since you opened them and were not saved. "
+                "Refresh to see the latest data, then re-apply your edits."
+            )
 
+        # NEW ROWS - place each value in its sheet column, then append
+        new_rows = []
+        new_rows_df = updated_df[~updated_df.index.isin(base.frame.index)]
+        if not new_rows_df.empty:
+            sheet_columns = base.sheet_columns or {col: i for i, col in enumerate(new_rows_df.columns)}
+            columns = [col for col in new_rows_df.columns if col in sheet_columns]
+            width = max(sheet_columns[col] for col in columns) + 1 if columns else 0
+
+            for values in new_rows_df[columns].itertuples(index=False):
+                row_data = [""] * width
+                for col, value in zip(columns, values):
+                    row_data[sheet_columns[col]] = cell_text(value)
+                # Skip completely empty rows
+                if any(cell.strip() for cell in row_data):
+                    new_rows.append(row_data)
+
+        # Changed cells go out in one batch_update and new rows in one append_rows call,
+        # after edits made in quick succession have been coalesced
+        # Status changes ride along and are logged once their cells reach the sheet
+        events = status_change_events(base.frame, base.sheet_columns, changes)
+        st.session_state.task_snapshot = queue_task_edits(changes, new_rows, events)
         return True
     except Exception as e:
         st.error(f"Error updating Google Sheet: {str(e)}")
         return False
 
+def status_change_events(base_df, sheet_columns, changes):
+    """
+    Status event log entries for the Status edits in a save
+
+    Args:
+        base_df: Snapshot frame the edit started from
+        sheet_columns: {frame column: 0-based sheet column}
+        changes: {(row, col): value} cell edits being saved (1-based sheet coordinates)
+
+    Returns:
+        {(row, col): task_events.status_change() event} for cells whose status really changed
+    """
+    if not has_column(base_df, "Status"):
+        return {}
+    status_col = get_column(base_df, "Status")
+    if status_col not in sheet_columns:
+        return {}
+    sheet_col = sheet_columns[status_col] + 1
+    project_col = get_column(base_df, "Project") if has_column(base_df, "Project") else None
+    assignee_col = get_assignee_column(base_df)
+    transcript_col = get_transcript_column(base_df)
+
+    events = {}
+    for (row, col), value in changes.items():
+        if col != sheet_col or row not in base_df.index:
+            continue
+        event = status_change(
+            row,
+            cell_text(base_df.at[row, status_col]),
+            value,
+            project=cell_text(base_df.at[row, project_col]) if project_col else "",
+            person=cell_text(base_df.at[row, assignee_col]) if assignee_col else "",
+            user=st.session_state.get("name") or "",
+            task=cell_text(base_df.at[row, transcript_col]) if transcript_col else "",
+        )
+        if event:
+            events[(row, col)] = event
+    return events
+
 def calculate_kpis(df, user_name, is_personal=False):
     """
     Calculate KPI metrics from filtered data
@@ -348,68 +220,8 @@ def calculate_kpis(df, user_name, is_personal=False):
             "done_tasks": 0
         }
 
-    # Normalize status values (case-insensitive)
-    df_copy = df.copy()
-    status_col = get_column(df_copy, "Status")
-    df_copy[status_col] = df_copy[status_col].str.strip().str.lower()
-
-    # Determine person column name
-    if has_column(df_copy, "Person"):
-        person_col = get_column(df_copy, "Person")
-    elif has_column(df_copy, "Assigned To"):
-        person_col = get_column(df_copy, "Assigned To")
-    else:
-        person_col = None
-
-    # My open tasks (assigned to user, status is "open")
-    my_open_tasks = 0
-    if person_col:
-        if is_personal:
-            # For personal view, only count user's tasks
-            my_open_tasks = len(df_copy[
-                (df_copy[person_col].str.contains(user_name, case=False, na=False)) &
-                (df_copy[status_col] == "open")
-            ])
-        else:
-            # For team view or filtered view
-            my_open_tasks = len(df_copy[
-                (df_copy[person_col].str.contains(user_name, case=False, na=False)) &
-                (df_copy[status_col] == "open")
-            ])
-
-    # Team open tasks (all open tasks in filtered scope)
-    team_open_tasks = len(df_copy[df_copy[status_col] == "open"])
-
-    # Active projects (unique projects in filtered scope)
-    active_projects = 0
-    if has_column(df_copy, "Project"):
-        project_col = get_column(df_copy, "Project")
-        active_projects = df_copy[project_col].nunique()
-
-    # Task breakdown by status - handle both emoji and text formats
-    status_lower = df_copy[status_col].str.lower().str.strip()
-
-    # Open tasks: contains "not started" or "open" or red circle emoji
-    open_tasks = len(df_copy[status_lower.str.contains("not started|open|🔴", case=False, na=False)])
-
-    # Working tasks: contains "in progress" or "working" or yellow circle emoji
-    working_tasks = len(df_copy[status_lower.str.contains("in progress|working|🟡", case=False, na=False)])
-
-    # Done tasks: contains "done" or "complete" or green circle emoji
-    done_tasks = len(df_copy[status_lower.str.contains("done|complete|🟢", case=False, na=False)])
-
-    # Archived tasks: contains "archived" or "archive"
-    archived_tasks = len(df_copy[status_lower.str.contains("archived|archive", case=False, na=False)])
-
-    return {
-        "my_open_tasks": my_open_tasks,
-        "team_open_tasks": team_open_tasks,
-        "active_projects": active_projects,
-        "open_tasks": open_tasks,
-        "working_tasks": working_tasks,
-        "done_tasks": done_tasks,
-        "archived_tasks": archived_tasks
-    }
+    # One pass over the pre-parsed status/project/person codes, memoized per data version and scope
+    return get_kpis(df, user_name)
 
 def render_kpi_section(kpis, section_label=""):
     """
@@ -764,8 +576,8 @@ def render_tasks_table(filtered_df, limit=10, hide_project_column=False, show_tr
                 clean_data[clean_col] = table_df[col].values
                 column_mapping[clean_col] = col
 
-            # Create new DataFrame with clean column names
-            clean_table_df = pd.DataFrame(clean_data)
+            # Create new DataFrame with clean column names (keyed by sheet row, hidden in the table)
+            clean_table_df = pd.DataFrame(clean_data, index=table_df.index)
 
             # Configure column settings for wrapping and progress bars
             column_config = {
@@ -998,15 +810,20 @@ def render_tasks_table(filtered_df, limit=10, hide_project_column=False, show_tr
             """, unsafe_allow_html=True)
 
             # Editable data table
+            editor_key = f"project_table_{hash(str(filtered_df.iloc[0].to_dict()) if len(filtered_df) > 0 else 'empty')}"
             edited_df = st.data_editor(
                 clean_table_df,
                 use_container_width=True,
                 hide_index=True,
                 column_config=column_config,
                 num_rows="fixed",
-                key=f"project_table_{hash(str(filtered_df.iloc[0].to_dict()) if len(filtered_df) > 0 else 'empty')}"
+                key=editor_key
             )
 
+            # Snapshot the user was shown before editing, for the save's conflict check
+            editor_state = st.session_state.get(editor_key) or {}
+            base_snapshot = editor_base_snapshot(editor_key, any(editor_state.get(part) for part in ("edited_rows", "added_rows", "deleted_rows")))
+
             # Custom button styling - soft grey with dark teal text, rounded corners, translucent
             st.markdown("""
                 <style>
@@ -1041,29 +858,23 @@ def render_tasks_table(filtered_df, limit=10, hide_project_column=False, show_tr
             with save_col:
                 if st.button("Save to Sheets", key=f"save_btn_{hash(str(filtered_df.iloc[0].to_dict()) if len(filtered_df) > 0 else 'empty')}", type="primary", use_container_width=True):
                     # Map edited data back to original DataFrame structure
-                    # We need to reverse the cleaning process and update the original df
-                    with st.spinner("Syncing to Google Sheets..."):
+                    # Rows are matched by sheet row; only the cells the user changed are merged back
+                    with st.spinner("Saving changes..."):
                         try:
-                            # Update the original dataframe with edited values
-                            for clean_col, orig_col in column_mapping.items():
-                                if clean_col in edited_df.columns:
-                                    # Find matching rows in filtered_df and update
-                                    for idx in filtered_df.head(limit).index:
-                                        row_num = list(filtered_df.head(limit).index).index(idx)
-                                        if row_num < len(edited_df):
-                                            value = edited_df.iloc[row_num][clean_col]
-
-                                            # Special handling for Status column: strip emoji prefix
-                                            if clean_col == "Status" and isinstance(value, str):
-                                                # Remove emoji prefix (e.g., "🟥 Open" → "Open")
-                                                value = value.replace("🟥 ", "").replace("🟨 ", "").replace("🟩 ", "").strip()
-
-                                            filtered_df.loc[idx, orig_col] = value
-
-                            # Call update function (you'll need to pass the full df and update it)
-                            success = update_google_sheet(filtered_df)
+                            edited_rows = merge_edits(
+                                filtered_df,
+                                clean_table_df,
+                                edited_df,
+                                column_mapping,
+                                # Strip emoji prefix from Status (e.g., "🟥 Open" → "Open")
+                                transforms={"Status": lambda value: str(value).replace("🟥 ", "").replace("🟨 ", "").replace("🟩 ", "").strip()},
+                            )
+
+                            # Only the changed rows go to the write path
+                            success = update_google_sheet(edited_rows, base=base_snapshot)
                             if success:
-                                st.success("✅ Changes saved to Google Sheets successfully!")
+                                forget_editor_snapshot(editor_key)
+                                st.success("✅ Changes saved! Syncing to Google Sheets in the background.")
                                 st.rerun()
                             else:
                                 st.error("❌ Failed to save changes. Please try again.")
@@ -1276,7 +1087,8 @@ def render_editable_task_grid(df, current_user, is_admin=False, key_prefix="", s
         clean_data[clean_col] = filtered_df[col].values
         clean_column_mapping[clean_col] = col
 
-    display_df = pd.DataFrame(clean_data)
+    # Keep the sheet row numbers as the index so edits map back to their sheet rows
+    display_df = pd.DataFrame(clean_data, index=filtered_df.index)
 
     # Transform Progress % to simple status icons for easy editing
     if "Progress %" in display_df.columns:
@@ -1331,9 +1143,8 @@ def render_editable_task_grid(df, current_user, is_admin=False, key_prefix="", s
         # Apply normalization to Status column
         display_df["Status"] = display_df["Status"].apply(normalize_status)
 
-    # Add unique row IDs for proper AG-Grid tracking
-    display_df = display_df.reset_index(drop=False)
-    display_df = display_df.rename(columns={'index': '_row_id'})
+    # Add unique row IDs (the sheet row numbers) for proper AG-Grid tracking
+    display_df = display_df.rename_axis('_row_id').reset_index(drop=False)
 
     # Configure AgGrid - DISABLE pagination to show all on one page
     gb = GridOptionsBuilder.from_dataframe(display_df)
@@ -1440,35 +1251,59 @@ def render_editable_task_grid(df, current_user, is_admin=False, key_prefix="", s
         reload_data=False,  # Prevent grid from reloading unnecessarily
     )
 
-    edited_df = pd.DataFrame(response["data"])
+    edited_df = response["data"]
+    # Until the grid sends its state back, AgGrid hands back the frame it was given
+    grid_returned = edited_df is not display_df
+    if not isinstance(edited_df, pd.DataFrame):
+        edited_df = pd.DataFrame(edited_df)
 
-    # Remove internal row ID column if present
+    # Re-key the edited rows by their sheet row (internal row ID column)
     if "_row_id" in edited_df.columns:
-        edited_df = edited_df.drop(columns=["_row_id"])
+        edited_df = edited_df.set_index("_row_id")
 
     # Add manual "Send to Google Sheets" button
     st.markdown("<br>", unsafe_allow_html=True)
 
-    # Check if any changes were made (compare without _row_id column)
-    # Also check if number of rows changed (new tasks added or deleted)
-    display_df_compare = display_df.drop(columns=["_row_id"]) if "_row_id" in display_df.columns else display_df
-    has_changes = (len(edited_df) != len(display_df_compare)) or not edited_df.equals(display_df_compare)
+    display_df_compare = display_df.set_index("_row_id") if "_row_id" in display_df.columns else display_df
+
+    # Row hashes of the grid as built - computed once per built grid, keyed by the
+    # snapshot this run rendered (not the latest one, which may have moved on)
+    rendered = st.session_state.get("task_snapshot")
+    grid_signature = (
+        rendered.version if rendered is not None else None,
+        tuple(display_df_compare.columns),
+        hash(display_df_compare.index.to_numpy().tobytes()),
+    )
+    grid_hashes = st.session_state.get(f"{key_prefix}_grid_row_hashes")
+    if grid_hashes is None or grid_hashes[0] != grid_signature:
+        grid_hashes = (grid_signature, row_fingerprints(display_df_compare))
+        st.session_state[f"{key_prefix}_grid_row_hashes"] = grid_hashes
+
+    # Rows whose hash differs, plus added/deleted rows (nothing to compare until the grid returns)
+    dirty = pd.Index([])
+    if grid_returned:
+        dirty = dirty_rows(grid_hashes[1], edited_df.reindex(columns=display_df_compare.columns))
+    has_changes = len(dirty) > 0
 
     if has_changes:
-        st.info("You have unsaved changes in the grid above.")
+        st.info(f"You have unsaved changes in the grid above ({len(dirty)} row(s) modified).")
+
+    # Snapshot the user was shown before editing, for the save's conflict check
+    base_snapshot = editor_base_snapshot(f"{key_prefix}_grid", has_changes)
 
     # No custom CSS needed - all styling handled by sbs_premium.css
 
     # Create single "Send to Google Sheets" button
     if st.button("Send to Google Sheets", type="primary", disabled=not has_changes, width='stretch', key=f"{key_prefix}_save_button"):
-        # Check for completed tasks that will be auto-archived
-        completed_tasks_count = 0
-        if "Progress Status" in edited_df.columns:
-            completed_mask = edited_df["Progress Status"].str.contains("🟩|Complete", case=False, na=False)
-            completed_tasks_count = completed_mask.sum()
-        with st.spinner("Saving changes to Google Sheets..."):
-            # Convert Progress Status back to Progress %
-            edited_df_to_save = edited_df.copy()
+        with st.spinner("Saving changes..."):
+            # Work out which cells actually changed against the grid as it was shown (dirty rows only)
+            rows = dirty.intersection(display_df_compare.index).intersection(edited_df.index)
+            display_df_compare = display_df_compare.loc[rows]
+            changed = changed_cell_mask(display_df_compare, edited_df.loc[rows])
+            edited_df_to_save = edited_df.loc[rows, edited_df.columns.intersection(display_df_compare.columns)].copy()
+
+            # Convert a changed Progress Status back to Progress %
+            completed_tasks_count = 0
             if "Progress Status" in edited_df_to_save.columns:
                 def status_to_percentage(status):
                     if "🟥" in str(status) or "Not Started" in str(status):
@@ -1479,54 +1314,37 @@ def render_editable_task_grid(df, current_user, is_admin=False, key_prefix="", s
                         return "100%"
                     return "0%"
 
+                progress_changed = changed["Progress Status"].reindex(edited_df_to_save.index, fill_value=False)
+                progress_status = edited_df_to_save.loc[progress_changed, "Progress Status"]
+
                 # Update Progress % based on Progress Status
                 if "Progress %" in edited_df_to_save.columns:
-                    edited_df_to_save["Progress %"] = edited_df_to_save["Progress Status"].apply(status_to_percentage)
+                    edited_df_to_save.loc[progress_changed, "Progress %"] = progress_status.map(status_to_percentage)
 
-                # AUTO-ARCHIVE: Set Status to "Done" for all completed tasks
+                # AUTO-ARCHIVE: Set Status to "Done" for tasks just marked complete
+                completed = progress_status.str.contains("🟩|Complete", case=False, na=False)
+                completed_tasks_count = int(completed.sum())
                 if "Status" in edited_df_to_save.columns:
-                    completed_mask = edited_df_to_save["Progress Status"].str.contains("🟩|Complete", case=False, na=False)
-                    edited_df_to_save.loc[completed_mask, "Status"] = "Done"
-
-                # Remove Progress Status column (it's not in the original sheet)
-                edited_df_to_save = edited_df_to_save.drop(columns=["Progress Status"])
-
-            # Strip emoji squares from Status column before saving to Google Sheets
-            if "Status" in edited_df_to_save.columns:
-                edited_df_to_save["Status"] = edited_df_to_save["Status"].apply(
-                    lambda x: str(x).replace("🟥 ", "").replace("🟨 ", "").replace("🟩 ", "").strip() if pd.notna(x) else x
-                )
-
-            # Restore the ___N suffix to column names for proper mapping
-            edited_df_with_suffix = edited_df_to_save.copy()
-            suffix_cols = []
-            for col in edited_df_to_save.columns:
-                # Find the original column name with suffix from clean_column_mapping
-                if col in clean_column_mapping:
-                    suffix_cols.append(clean_column_mapping[col])
-                else:
-                    suffix_cols.append(col)
-            edited_df_with_suffix.columns = suffix_cols
-
-            # ALWAYS use the FULL dataframe to prevent data loss
-            # Merge edited rows back into the full dataset (df contains ALL rows, edited_df_with_suffix has filtered/edited rows)
-            full_df_to_save = df.copy()
-
-            # Update only the rows that were edited in the filtered view
-            # Match by index to update the correct rows
-            for idx in edited_df_with_suffix.index:
-                if idx in full_df_to_save.index:
-                    full_df_to_save.loc[idx] = edited_df_with_suffix.loc[idx]
+                    edited_df_to_save.loc[completed[completed].index, "Status"] = "Done"
+
+            # Apply only the changed cells to their sheet rows (Status loses its emoji square)
+            edited_rows = merge_edits(
+                filtered_df,
+                display_df_compare,
+                edited_df_to_save,
+                clean_column_mapping,
+                transforms={"Status": lambda value: str(value).replace("🟥 ", "").replace("🟨 ", "").replace("🟩 ", "").strip()},
+            )
 
-            # Save the FULL dataset (including all archived/hidden rows)
-            success = update_google_sheet(full_df_to_save)
+            # Save just the delta - unchanged and hidden rows are never sent
+            success = update_google_sheet(edited_rows, base=base_snapshot)
 
             if success:
+                forget_editor_snapshot(f"{key_prefix}_grid")
                 if completed_tasks_count > 0:
                     st.success(f"✅ Changes saved! {completed_tasks_count} completed task(s) automatically archived.")
                 else:
-                    st.success("✅ Changes saved successfully to Google Sheets!")
-                st.cache_data.clear()  # Clear cache to show fresh data
+                    st.success("✅ Changes saved! Syncing to Google Sheets in the background.")
                 st.balloons()
                 st.rerun()
             else:
@@ -1538,6 +1356,19 @@ def calculate_executive_metrics(df):
     """
     Calculate executive-level metrics for Tea's admin view
     Returns detailed project breakdown and team metrics
+    Memoized per data version, scoped rows and day (overdue counts only move at midnight)
+    """
+    return memoized_metric(
+        "executive_metrics",
+        df,
+        lambda: compute_executive_metrics(df),
+        columns=["Status", "Project", "Assigned To", "Person", "assignee", "Due Date"],
+        filters=(pd.Timestamp.now().date(),),
+    )
+
+def compute_executive_metrics(df):
+    """
+    Compute the executive metrics from scratch (see calculate_executive_metrics)
     """
     if df.empty:
         return {
@@ -1551,79 +1382,43 @@ def calculate_executive_metrics(df):
             "overdue_tasks": 0
         }
 
-    df_copy = df.copy()
-
-    # Normalize status
-    if has_column(df_copy, "Status"):
-        status_col = get_column(df_copy, "Status")
-        df_copy[status_col] = df_copy[status_col].str.strip().str.lower()
-    else:
+    if not has_column(df, "Status"):
         return {}
 
+    # Status, project, person and dates come pre-parsed from the snapshot's typed view
+    typed = get_typed_view(df)
+    status = typed["status"]
+
     # Count status
-    status_lower = df_copy[status_col]
-    total_open = len(df_copy[status_lower.str.contains("not started|open|🔴", case=False, na=False)])
-    total_in_progress = len(df_copy[status_lower.str.contains("in progress|working|🟡", case=False, na=False)])
-    total_complete = len(df_copy[status_lower.str.contains("done|complete|🟢", case=False, na=False)])
-    total_tasks = len(df_copy)
+    total_open = int((status == STATUS_OPEN).sum())
+    total_in_progress = int((status == STATUS_WORKING).sum())
+    total_complete = int((status == STATUS_DONE).sum())
+    total_tasks = len(df)
 
     # Completion rate
     completion_rate = round((total_complete / total_tasks * 100) if total_tasks > 0 else 0, 1)
 
-    # Tasks by project
+    # Tasks by project - one (project x status) crosstab, projects in order of appearance
     tasks_by_project = {}
-    if has_column(df_copy, "Project"):
-        project_col = get_column(df_copy, "Project")
-        for project in df_copy[project_col].dropna().unique():
-            project_df = df_copy[df_copy[project_col] == project]
-            project_status = project_df[status_col]
-            tasks_by_project[project] = {
-                "total": len(project_df),
-                "open": len(project_df[project_status.str.contains("not started|open|🔴", case=False, na=False)]),
-                "in_progress": len(project_df[project_status.str.contains("in progress|working|🟡", case=False, na=False)]),
-                "complete": len(project_df[project_status.str.contains("done|complete|🟢", case=False, na=False)])
-            }
+    if has_column(df, "Project"):
+        project_codes, projects = pd.factorize(df[get_column(df, "Project")])
+        tasks_by_project = status_breakdown(project_codes, list(projects), status)
 
-    # Tasks by person
+    # Tasks by person - one (person x status) crosstab, names grouped
+    # case-insensitively and shown in title case
     tasks_by_person = {}
-    person_col = None
-    if has_column(df_copy, "Person"):
-        person_col = get_column(df_copy, "Person")
-    elif has_column(df_copy, "Assigned To"):
-        person_col = get_column(df_copy, "Assigned To")
-
-    if person_col:
-        # Normalize person names to title case for consistent grouping
-        # Also filter out empty/null values
-        df_copy['_normalized_person'] = df_copy[person_col].fillna('').str.strip().str.title()
-        df_copy = df_copy[df_copy['_normalized_person'] != '']  # Remove empty names
-
-        for person in sorted(df_copy['_normalized_person'].unique()):
-            if person:  # Skip empty strings
-                person_df = df_copy[df_copy['_normalized_person'] == person]
-                person_status = person_df[status_col]
-                tasks_by_person[person] = {
-                    "total": len(person_df),
-                    "open": len(person_df[person_status.str.contains("not started|open|🔴", case=False, na=False)]),
-                    "in_progress": len(person_df[person_status.str.contains("in progress|working|🟡", case=False, na=False)]),
-                    "complete": len(person_df[person_status.str.contains("done|complete|🟢", case=False, na=False)])
-                }
+    if get_assignee_column(df):
+        person_codes, people = pd.factorize(typed["person"].map(str.title, na_action="ignore").astype(object), sort=True)
+        tasks_by_person = status_breakdown(person_codes, list(people), status)
 
-    # Overdue tasks
+    # Overdue tasks (due date in the past and not finished) - like the per-person
+    # breakdown, only tasks with an assignee are counted when the sheet has one
     overdue_tasks = 0
-    if has_column(df_copy, "Due Date"):
-        from datetime import datetime
-        due_date_col = get_column(df_copy, "Due Date")
-        today = datetime.now()
-
-        for idx, row in df_copy.iterrows():
-            try:
-                if pd.notna(row[due_date_col]):
-                    due_date = pd.to_datetime(row[due_date_col])
-                    if due_date < today and row[status_col] not in ["done", "complete", "completed"]:
-                        overdue_tasks += 1
-            except:
-                pass
+    if has_column(df, "Due Date"):
+        is_overdue = task_timing(typed)["is_overdue"].to_numpy()
+        if get_assignee_column(df):
+            is_overdue = is_overdue & typed["person"].notna().to_numpy()
+        overdue_tasks = int(is_overdue.sum())
 
     return {
         "total_tasks": total_tasks,
@@ -1773,19 +1568,18 @@ def show_dashboard():
         st.warning("No data available. Please check your Google Sheet connection.")
         return
 
+    render_data_freshness()
+
     # Always filter out archived tasks
     if has_column(df, "Status"):
-        status_col = get_column(df, "Status")
-        status_lower = df[status_col].str.lower().str.strip()
-        df = df[~status_lower.str.contains("archived|archive", case=False, na=False)].copy()
+        df = df[get_typed_view(df)["status"] != STATUS_ARCHIVED].copy()
 
     # Determine if user is admin (Anna or Tea), Jess (view_all_tasks), or regular user
-    user_lower = user_name.lower()
-    is_admin = ("anna" in user_lower and "ciboro" in user_lower) or "tea" in user_lower or "téa" in user_lower or "tēa" in user_lower
-    is_jess = "jess" in user_lower
+    is_admin = is_admin_user(user_name)
+    is_jess = is_team_lead(user_name)
 
 
-    # Filter data based on user type
+    # Filter data based on user type (visible rows are compiled once per data version)
     if is_admin:
         # Admin sees all data with team KPIs
         filtered_df = df
@@ -1793,35 +1587,15 @@ def show_dashboard():
         exec_metrics = calculate_executive_metrics(df)
     elif is_jess:
         # Jess sees only her, Megan's, and Justin's tasks
-        assignee_col = None
-        if has_column(df, "Assigned To"):
-            assignee_col = get_column(df, "Assigned To")
-        elif has_column(df, "assignee"):
-            assignee_col = get_column(df, "assignee")
-        elif has_column(df, "Person"):
-            assignee_col = get_column(df, "Person")
-
-        if assignee_col:
-            # Filter for Jess, Megan, and Justin
-            filtered_df = df[
-                df[assignee_col].str.lower().str.contains('jess|megan|justin', na=False, regex=True)
-            ].copy()
+        if get_assignee_column(df):
+            filtered_df = apply_scope(df, user_name, SCOPE_TEAM).copy()
         else:
             filtered_df = df
         kpis = calculate_kpis(filtered_df, user_name, is_personal=False)
     else:
         # Other users only see their own tasks
-        # Try different possible column names for assignee
-        assignee_col = None
-        if has_column(df, "Assigned To"):
-            assignee_col = get_column(df, "Assigned To")
-        elif has_column(df, "assignee"):
-            assignee_col = get_column(df, "assignee")
-        elif has_column(df, "Person"):
-            assignee_col = get_column(df, "Person")
-
-        if assignee_col:
-            filtered_df = df[df[assignee_col].str.lower().str.contains(user_name.lower(), na=False)].copy()
+        if get_assignee_column(df):
+            filtered_df = apply_scope(df, user_name, SCOPE_OWN).copy()
         else:
             st.error(f"Cannot filter tasks: No assignee column found. Available columns: {', '.join(df.columns.tolist())}")
             return
@@ -1989,8 +1763,8 @@ def show_dashboard():
         total_before_filters = len(projects_df)
 
         if has_column(projects_df, "Status"):
-            status_col = get_column(projects_df, "Status")
-            projects_df = projects_df[~projects_df[status_col].str.strip().str.lower().isin(['done', 'complete', 'completed'])]
+            projects_status = get_typed_view(projects_df)["status_text"]
+            projects_df = projects_df[~projects_status.isin(['done', 'complete', 'completed'])]
 
         # Apply quick filters
         if status_filter != "All Statuses" and has_column(projects_df, "Status"):
@@ -2096,17 +1870,19 @@ def show_dashboard():
 
         # Dynamically show all projects from Google Sheets with editable grids
         if has_column(projects_df, "Project"):
-            project_col = get_column(projects_df, "Project")
+            projects_typed = get_typed_view(projects_df)
 
             # Get unique projects (case-insensitive, trimmed)
-            unique_projects = projects_df[project_col].str.strip().str.title().dropna().unique()
+            unique_projects = projects_typed["project"].map(str.title, na_action="ignore").dropna().unique()
             unique_projects = sorted([p for p in unique_projects if p])  # Sort alphabetically
 
             if len(unique_projects) > 0:
                 # Display each project's tasks with editable grids
                 for idx, project_name in enumerate(unique_projects):
                     # Filter tasks for this project (case-insensitive)
-                    project_df = projects_df[projects_df[project_col].str.strip().str.lower() == project_name.lower()].copy()
+                    in_project = projects_typed["project_key"] == project_name.lower()
+                    project_df = projects_df[in_project].copy()
+                    project_status = projects_typed["status"][in_project]
 
                     # Calculate project KPIs
                     task_count = len(project_df)
@@ -2115,10 +1891,9 @@ def show_dashboard():
                     complete_count = 0
 
                     if has_column(project_df, "Status"):
-                        status_col = get_column(project_df, "Status")
-                        open_count = len(project_df[project_df[status_col].str.lower().str.contains("open|not started", case=False, na=False)])
-                        in_progress_count = len(project_df[project_df[status_col].str.lower().str.contains("in progress|working", case=False, na=False)])
-                        complete_count = len(project_df[project_df[status_col].str.lower().str.contains("done|complete", case=False, na=False)])
+                        open_count = int((project_status == STATUS_OPEN).sum())
+                        in_progress_count = int((project_status == STATUS_WORKING).sum())
+                        complete_count = int((project_status == STATUS_DONE).sum())
 
                     completion_rate = int((complete_count / task_count * 100)) if task_count > 0 else 0
 
@@ -1,68 +1,23 @@
 import streamlit as st
-import pandas as pd
-import gspread
-from google.oauth2.service_account import Credentials
 from datetime import datetime, timedelta
 from charts import create_team_completion_donut
-
-def get_column(df, col_name):
-    """
-    Helper function to get a column by its original name, even if it has a unique suffix.
-    Returns the column name with the suffix that exists in the DataFrame.
-    """
-    if col_name in df.columns:
-        return col_name
-
-    matching_cols = [col for col in df.columns if col.startswith(f"{col_name}___")]
-    if matching_cols:
-        return matching_cols[0]
-
-    return col_name
-
-def has_column(df, col_name):
-    """Check if a column exists by original name"""
-    if col_name in df.columns:
-        return True
-    return any(col.startswith(f"{col_name}___") for col in df.columns)
-
-@st.cache_data(ttl=300)
-def load_google_sheet():
-    """Load data from Google Sheet with caching"""
-    try:
-        scope = [
-            "https://spreadsheets.google.com/feeds",
-            "https://www.googleapis.com/auth/drive"
-        ]
-
-        creds_dict = st.secrets["gcp_service_account"]
-        creds = Credentials.from_service_account_info(creds_dict, scopes=scope)
-        client = gspread.authorize(creds)
-
-        sheet_id = st.secrets.get("google_sheet_id", "1xENgMtZL5DSEHKFvYr34UZsJIDCxlTw-BbS3giYrHvw")
-
-        try:
-            sheet = client.open_by_key(sheet_id).worksheet("Otter_Tasks")
-        except:
-            sheet = client.open_by_key(sheet_id).sheet1
-
-        data = sheet.get_all_values()
-
-        if not data or len(data) < 2:
-            return pd.DataFrame()
-
-        headers = data[0]
-        rows = data[1:]
-
-        df = pd.DataFrame(rows, columns=headers)
-
-        return df
-
-    except Exception as e:
-        st.error(f"Error loading data: {str(e)}")
-        return pd.DataFrame()
+from task_data import load_task_data, get_typed_view
+from task_schema import STATUS_OPEN, STATUS_WORKING, STATUS_DONE, STATUS_ARCHIVED, has_column
+from task_metrics import memoized_metric, task_timing
+from .dashboard_page import render_data_freshness
 
 def calculate_executive_metrics(df):
-    """Calculate executive-level metrics"""
+    """Calculate executive-level metrics (memoized per data version, scoped rows and day)"""
+    return memoized_metric(
+        "executive_summary",
+        df,
+        lambda: compute_executive_metrics(df),
+        columns=["Status", "Date Assigned"],
+        filters=(datetime.now().date(),),
+    )
+
+def compute_executive_metrics(df):
+    """Compute the executive summary metrics from scratch"""
     if df.empty or not has_column(df, "Status"):
         return {
             "active_tasks": 0,
@@ -76,39 +31,25 @@ def calculate_executive_metrics(df):
             "archived_tasks": 0
         }
 
-    df_copy = df.copy()
-    status_col = get_column(df_copy, "Status")
-    df_copy[status_col] = df_copy[status_col].str.strip().str.lower()
+    # Status and dates come pre-parsed from the snapshot's typed view
+    typed = get_typed_view(df)
+    status = typed["status"]
 
     # Active tasks = Open + Working
-    open_tasks = len(df_copy[df_copy[status_col].str.contains("open|not started|🔴", case=False, na=False)])
-    working_tasks = len(df_copy[df_copy[status_col].str.contains("working|in progress|🟡", case=False, na=False)])
-    done_tasks = len(df_copy[df_copy[status_col].str.contains("done|complete|🟢", case=False, na=False)])
-    archived_tasks = len(df_copy[df_copy[status_col].str.contains("archived|archive", case=False, na=False)])
+    open_tasks = int((status == STATUS_OPEN).sum())
+    working_tasks = int((status == STATUS_WORKING).sum())
+    done_tasks = int((status == STATUS_DONE).sum())
+    archived_tasks = int((status == STATUS_ARCHIVED).sum())
 
     active_tasks = open_tasks
     in_progress_tasks = working_tasks
 
     # Overdue tasks - tasks with Date Assigned > 30 days ago and still open/working
     overdue_tasks = 0
-    if has_column(df_copy, "Date Assigned"):
-        date_col = get_column(df_copy, "Date Assigned")
-        today = datetime.now()
-
-        for idx, row in df_copy.iterrows():
-            status = row[status_col].lower()
-            date_str = str(row[date_col]).strip()
+    if has_column(df, "Date Assigned"):
+        overdue_tasks = int(task_timing(typed)["is_stale"].sum())
 
-            if status in ['open', 'working', 'in progress', 'not started'] and date_str:
-                try:
-                    assigned_date = datetime.strptime(date_str, "%Y-%m-%d")
-                    days_old = (today - assigned_date).days
-                    if days_old > 30:
-                        overdue_tasks += 1
-                except:
-                    pass
-
-    total_tasks = len(df_copy)
+    total_tasks = len(df)
     completed_tasks = done_tasks + archived_tasks
     completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
 
@@ -164,13 +105,15 @@ def render_executive_summary_page():
         '>High-level overview of task performance and completion metrics</p>
     """, unsafe_allow_html=True)
 
-    # Load data
-    df = load_google_sheet()
+    # Load data from the shared task snapshot (same frame as the other pages)
+    df = load_task_data()
 
     if df.empty:
         st.warning("No data available to display.")
         return
 
+    render_data_freshness()
+
     # Calculate metrics
     metrics = calculate_executive_metrics(df)
 
@@ -3,15 +3,16 @@ import pandas as pd
 import re
 from .dashboard_page import (
     load_google_sheet,
-    get_column,
-    has_column,
     calculate_kpis,
     render_kpi_section,
     render_charts_section,
     render_tasks_table,
     render_page_header,
-    render_editable_task_grid
+    render_editable_task_grid,
+    render_data_freshness
 )
+from task_schema import get_column, has_column, get_assignee_column
+from task_scope import SCOPE_OWN, apply_scope, is_admin_user
 
 def show_tasks():
     """
@@ -22,8 +23,7 @@ def show_tasks():
     first_name = user_name.split()[0] if user_name else "User"
 
     # Determine if user is admin (admin sees everything)
-    user_lower = user_name.lower()
-    is_admin = ("anna" in user_lower and "ciboro" in user_lower) or "tea" in user_lower or "téa" in user_lower or "tēa" in user_lower
+    is_admin = is_admin_user(user_name)
     is_jess = "jess" in user_name.lower()
 
     # Page header matching Executive Overview style
@@ -46,6 +46,8 @@ def show_tasks():
         st.warning("No data available. Please check your Google Sheet connection.")
         return
 
+    render_data_freshness()
+
     # Style checkboxes to match header styling
     st.markdown("""
         <style>
@@ -77,13 +79,7 @@ def show_tasks():
     """, unsafe_allow_html=True)
 
     # Filter for user's tasks based on assignee column
-    assignee_col = None
-    if has_column(df, "Assigned To"):
-        assignee_col = get_column(df, "Assigned To")
-    elif has_column(df, "Person"):
-        assignee_col = get_column(df, "Person")
-    elif has_column(df, "assignee"):
-        assignee_col = get_column(df, "assignee")
+    assignee_col = get_assignee_column(df)
 
     if assignee_col:
         # For Tea, show all tasks; for everyone else (including Jess), filter by user name
@@ -91,7 +87,7 @@ def show_tasks():
             personal_df = df.copy()
         else:
             # All users (Jess, Megan, Justin) see only their own personal tasks on "My Tasks"
-            personal_df = df[df[assignee_col].str.lower().str.contains(user_name.lower(), na=False)].copy()
+            personal_df = apply_scope(df, user_name, SCOPE_OWN).copy()
     else:
         personal_df = pd.DataFrame()
 
@@ -365,21 +361,11 @@ def show_tasks():
             if submit and new_task:
                 # Add new task to Google Sheet
                 try:
-                    scope = [
-                        "https://spreadsheets.google.com/feeds",
-                        "https://www.googleapis.com/auth/drive"
-                    ]
-                    creds_dict = st.secrets["gcp_service_account"]
-                    from google.oauth2.service_account import Credentials
-                    creds = Credentials.from_service_account_info(creds_dict, scopes=scope)
-                    import gspread
-                    client = gspread.authorize(creds)
-                    sheet_id = "1xENgMtZL5DSEHKFvYr34UZsJIDCxlTw-BbS3giYrHvw"
-                    sheet = client.open_by_key(sheet_id).worksheet("Otter_Tasks")
+                    from task_data import queue_task_edits
 
                     # Append new row with all fields including Transcript ID, Date Added, and Priority
                     # Column order: Transcript, Date Assigned, Person, Task, Project, Status, Due Date, Notes, Progress %, (empty cols), Priority (col 14)
-                    # For append_row, we need to specify values up to column 14
+                    # We need to specify values up to column 14
                     new_row = [
                         new_transcript_id,      # Col 1: Transcript
                         new_date_added,         # Col 2: Date Assigned
@@ -393,7 +379,7 @@ def show_tasks():
                         "", "", "", "",         # Cols 10-13: Empty
                         new_priority            # Col 14: Priority
                     ]
-                    sheet.append_row(new_row)
+                    queue_task_edits(rows=[new_row])
 
                     st.success("Task added successfully!")
                     st.session_state.show_add_task_form = False
@@ -0,0 +1,227 @@
+"""
+Incremental Sheet Sync for SBS Dashboard
+Block-level change detection for the task sheet so refreshes only re-parse changed rows
+"""
+
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+# Number of data rows covered by one content hash / one batched range
+BLOCK_SIZE = 500
+
+# Sheet row of the first data row (row 1 is the header)
+FIRST_DATA_ROW = 2
+
+# Task frames are indexed by the physical sheet row each task lives in
+ROW_INDEX_NAME = "sheet_row"
+
+
+def column_letter(index):
+    """Convert a 1-based column index to its A1 letter (1 -> A, 27 -> AA)"""
+    letters = ""
+    while index > 0:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def hash_block(rows):
+    """Content hash of a list of rows (list of cell strings)"""
+    digest = hashlib.blake2b(digest_size=16)
+    for row in rows:
+        digest.update("\x1f".join(str(cell) for cell in row).encode("utf-8"))
+        digest.update(b"\x1e")
+    return digest.hexdigest()
+
+
+def hash_rows(df):
+    """Content hash of every row of a frame (uint64 Series on the same index)"""
+    if df.empty:
+        return pd.Series(dtype="uint64", index=df.index)
+    return pd.util.hash_pandas_object(df, index=False)
+
+
+def changed_blocks(old_hashes, new_hashes):
+    """Indices of blocks that differ, including blocks that were added or removed"""
+    changed = [i for i, (old, new) in enumerate(zip(old_hashes, new_hashes)) if old != new]
+    longest = max(len(old_hashes), len(new_hashes))
+    changed.extend(range(min(len(old_hashes), len(new_hashes)), longest))
+    return changed
+
+
+def get_modified_time(ws):
+    """
+    Drive modifiedTime of the spreadsheet, or None if it can't be read.
+    A cheap metadata call that lets a refresh skip reading values when nothing changed.
+    """
+    try:
+        return ws.spreadsheet.get_lastUpdateTime()
+    except Exception:
+        return None
+
+
+def column_runs(columns):
+    """Group 0-based column positions into contiguous (first, last) runs"""
+    runs = []
+    for col in sorted(set(columns)):
+        if runs and col == runs[-1][1] + 1:
+            runs[-1][1] = col
+        else:
+            runs.append([col, col])
+    return [tuple(run) for run in runs]
+
+
+def _rectangular(rows):
+    """Drop trailing empty rows and pad every row to the same width (like get_all_values)"""
+    end = len(rows)
+    while end > 1 and not any(str(cell) != "" for cell in rows[end - 1]):
+        end -= 1
+    rows = rows[:end]
+    width = max((len(row) for row in rows), default=0)
+    return [row + [""] * (width - len(row)) for row in rows]
+
+
+def read_sheet_blocks(ws, data_row_count, columns, block_size=BLOCK_SIZE):
+    """
+    Read the projected columns of the sheet with ONE batched request.
+
+    There is one range per (row block, contiguous run of columns), so columns the
+    app never uses are not downloaded or decoded. Block boundaries follow the
+    previous snapshot (data_row_count rows); the last block is open-ended so rows
+    appended since then are picked up too.
+
+    Args:
+        ws: gspread Worksheet
+        data_row_count: Number of data rows in the previous snapshot
+        columns: 0-based sheet column positions to fetch
+        block_size: Rows per block
+
+    Returns:
+        (header, values): the full header row, and the values (header first) with
+        width max(columns) + 1 - cells outside the projection are left empty
+    """
+    runs = column_runs(columns)
+    width = runs[-1][1] + 1
+
+    starts = list(range(2, data_row_count + 2, block_size)) or [2]
+    bounds = [(start, start + block_size - 1) for start in starts[:-1]] + [(starts[-1], "")]
+
+    ranges = ["1:1"]
+    for first, last in runs:
+        for start, end in bounds:
+            ranges.append(f"{column_letter(first + 1)}{start}:{column_letter(last + 1)}{end}")
+
+    value_ranges = ws.batch_get(ranges)
+
+    header = list(value_ranges[0][0]) if value_ranges[0] else []
+    run_blocks = [value_ranges[1 + r * len(bounds):1 + (r + 1) * len(bounds)] for r in range(len(runs))]
+
+    rows = []
+    for b in range(len(bounds)):
+        blocks = [run_block[b] for run_block in run_blocks]
+        # The API omits trailing empty rows; keep closed blocks full-size so later blocks stay aligned
+        height = block_size if b < len(bounds) - 1 else max((len(block) for block in blocks), default=0)
+        for i in range(height):
+            row = [""] * width
+            for (first, _), block in zip(runs, blocks):
+                if i < len(block):
+                    cells = block[i]
+                    row[first:first + len(cells)] = cells
+            rows.append(row)
+
+    padded_header = (header + [""] * width)[:width]
+    return header, _rectangular([padded_header] + rows)
+
+
+def cell_text(value):
+    """The string a cell holds for a frame value (None/NaN -> empty)"""
+    if value is None:
+        return ""
+    try:
+        if pd.isna(value):
+            return ""
+    except (TypeError, ValueError):
+        pass
+    return str(value)
+
+
+def frame_cell_changes(base_df, edited_df, sheet_columns):
+    """
+    Cells of edited_df that differ from base_df, in sheet coordinates.
+
+    Rows are matched by index label (the sheet row number), so edited_df may be
+    any row subset of base_df. Rows and columns that aren't in base_df /
+    sheet_columns are ignored.
+
+    Args:
+        base_df: Frame the edit started from (the loaded snapshot)
+        edited_df: Edited copy (or subset) of base_df
+        sheet_columns: {frame column: 0-based sheet column}
+
+    Returns:
+        {(row, col): value} with 1-based sheet row/column numbers
+    """
+    rows = edited_df.index.intersection(base_df.index)
+    cols = [c for c in edited_df.columns if c in sheet_columns and c in base_df.columns]
+    if len(rows) == 0 or not cols:
+        return {}
+
+    old = base_df.loc[rows, cols].to_numpy(dtype=object)
+    new = edited_df.loc[rows, cols].to_numpy(dtype=object)
+    to_text = np.frompyfunc(cell_text, 1, 1)
+    old, new = to_text(old), to_text(new)
+
+    changes = {}
+    for i, j in zip(*np.nonzero(old != new)):
+        row = int(rows[i])
+        col = sheet_columns[cols[j]] + 1
+        changes[(row, col)] = new[i, j]
+    return changes
+
+
+def cell_ranges(changes):
+    """
+    Group changed cells into few rectangular ranges for one batch_update call.
+
+    Contiguous cells in a row become one run; identical column runs on
+    consecutive rows are stacked into one rectangle.
+
+    Args:
+        changes: {(row, col): value} with 1-based sheet row/column numbers
+
+    Returns:
+        [{"range": "B7:D9", "values": [[...], ...]}, ...]
+    """
+    by_row = {}
+    for (row, col), value in changes.items():
+        by_row.setdefault(row, {})[col] = value
+
+    rects = []
+    open_rects = {}  # (first_col, last_col) -> rectangle still growing downwards
+    for row in sorted(by_row):
+        cells = by_row[row]
+        cols = sorted(cells)
+        start = 0
+        for k in range(1, len(cols) + 1):
+            if k < len(cols) and cols[k] == cols[k - 1] + 1:
+                continue
+            span = (cols[start], cols[k - 1])
+            values = [cells[c] for c in range(span[0], span[1] + 1)]
+            rect = open_rects.get(span)
+            if rect is not None and rect["last_row"] == row - 1:
+                rect["values"].append(values)
+                rect["last_row"] = row
+            else:
+                rect = {"first_row": row, "last_row": row, "span": span, "values": [values]}
+                open_rects[span] = rect
+                rects.append(rect)
+            start = k
+
+    ranges = []
+    for rect in rects:
+        first = f"{column_letter(rect['span'][0])}{rect['first_row']}"
+        last = f"{column_letter(rect['span'][1])}{rect['last_row']}"
+        ranges.append({"range": first if first == last else f"{first}:{last}", "values": rect["values"]})
+    return ranges
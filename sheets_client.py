@@ -0,0 +1,303 @@
+"""
+Google Sheets Client Pool for SBS Dashboard
+Long-lived, thread-safe gspread client and worksheet handles shared across sessions,
+with request coalescing and quota-aware rate limiting in front of every API call
+"""
+
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+
+import gspread
+from google.auth.transport.requests import AuthorizedSession, Request
+from google.oauth2.service_account import Credentials
+from requests.adapters import HTTPAdapter
+
+# Scopes needed for both reading and writing the task sheet
+SCOPES = [
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/drive",
+]
+
+# Refresh the OAuth token this long before it actually expires
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+
+# Keep-alive connections kept open to the Sheets API per pool
+HTTP_POOL_SIZE = 10
+
+# Sheets API quota is per minute, separately for reads and writes
+READ_REQUESTS_PER_MINUTE = 60
+WRITE_REQUESTS_PER_MINUTE = 60
+REQUEST_BURST = 10
+
+# Exponential backoff when Google answers 429 (quota exceeded)
+MAX_RETRIES = 5
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 32.0
+
+# Worksheet/Spreadsheet methods that read; identical concurrent reads share one request
+READ_METHODS = {
+    "get_all_values", "get_all_records", "get_values", "get", "batch_get",
+    "row_values", "col_values", "acell", "cell", "get_lastUpdateTime",
+}
+
+# Methods that write; rate limited and retried on 429 but never coalesced
+WRITE_METHODS = {
+    "update", "batch_update", "update_cell", "update_cells", "update_acell",
+    "append_row", "append_rows", "insert_row", "insert_rows", "delete_rows", "clear",
+}
+
+
+class TokenBucket:
+    """Blocking token bucket: at most rate_per_minute calls with bursts up to burst"""
+
+    def __init__(self, rate_per_minute, burst=REQUEST_BURST):
+        self._rate = rate_per_minute / 60.0
+        self._capacity = float(burst)
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, sleeping until one is available. Returns seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self._rate
+            time.sleep(delay)
+            waited += delay
+
+    def drain(self):
+        """Empty the bucket after a 429 so other callers slow down too"""
+        with self._lock:
+            self._tokens = 0.0
+            self._updated = time.monotonic()
+
+
+class SingleFlight:
+    """Concurrent calls with the same key wait for, and share, one in-flight result"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn):
+        """
+        Run fn() unless an identical call is already running.
+
+        Returns:
+            (result, coalesced): coalesced is True when another caller's result was reused
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = {"done": threading.Event(), "result": None, "error": None}
+                self._calls[key] = call
+
+        if not is_leader:
+            call["done"].wait()
+            if call["error"] is not None:
+                raise call["error"]
+            return call["result"], True
+
+        try:
+            call["result"] = fn()
+            return call["result"], False
+        except Exception as e:
+            call["error"] = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call["done"].set()
+
+
+def _is_rate_limited(error):
+    """True if a gspread APIError is a 429 quota error"""
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None) == 429
+
+
+class _ThrottledProxy:
+    """
+    Wraps a gspread Worksheet or Spreadsheet so its API calls go through the pool's
+    coalescing, rate limiting and retry layer. Other attributes pass straight through.
+    """
+
+    def __init__(self, target, pool):
+        self._target = target
+        self._pool = pool
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if name == "spreadsheet":
+            return _ThrottledProxy(attr, self._pool)
+        if name in READ_METHODS:
+            def read(*args, **kwargs):
+                key = (id(self._target), name, repr(args), repr(sorted(kwargs.items())))
+                return self._pool.call(lambda: attr(*args, **kwargs), is_write=False, coalesce_key=key)
+            return read
+        if name in WRITE_METHODS:
+            def write(*args, **kwargs):
+                return self._pool.call(lambda: attr(*args, **kwargs), is_write=True)
+            return write
+        return attr
+
+
+class SheetsClientPool:
+    """
+    One authorized gspread client per service account.
+
+    The OAuth token is refreshed proactively (before it expires) and the
+    underlying HTTP session keeps connections alive, so repeated reads and
+    saves skip both the token exchange and the TLS handshake. Opened
+    worksheet handles are cached to avoid the spreadsheet metadata round trip.
+
+    Every API call made through the returned handles is rate limited to the
+    Sheets per-minute quota, retried with exponential backoff on 429, and
+    identical concurrent reads are coalesced into a single request.
+    """
+
+    def __init__(self, creds_info, scopes=SCOPES):
+        self._creds = Credentials.from_service_account_info(dict(creds_info), scopes=scopes)
+        self._lock = threading.RLock()
+        self._worksheets = {}
+
+        self._read_bucket = TokenBucket(READ_REQUESTS_PER_MINUTE)
+        self._write_bucket = TokenBucket(WRITE_REQUESTS_PER_MINUTE)
+        self._single_flight = SingleFlight()
+        self._metrics_lock = threading.Lock()
+        self._metrics = {
+            "calls_made": 0,
+            "calls_coalesced": 0,
+            "rate_limited_retries": 0,
+            "throttled_seconds": 0.0,
+        }
+
+        session = AuthorizedSession(self._creds)
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+        session.mount("https://", adapter)
+        self._client = gspread.Client(auth=self._creds, session=session)
+
+    def _ensure_token(self):
+        """Refresh the access token if it is missing or about to expire"""
+        expiry = self._creds.expiry
+        expiring = expiry is None or expiry - datetime.utcnow() < TOKEN_REFRESH_MARGIN
+        if not self._creds.valid or expiring:
+            self._creds.refresh(Request())
+
+    def _record(self, **deltas):
+        with self._metrics_lock:
+            for name, value in deltas.items():
+                self._metrics[name] += value
+
+    def _call_with_backoff(self, fn, is_write):
+        """Run one API call under the rate limiter, retrying 429s with backoff"""
+        bucket = self._write_bucket if is_write else self._read_bucket
+        for attempt in range(MAX_RETRIES + 1):
+            waited = bucket.acquire()
+            with self._lock:
+                self._ensure_token()
+            self._record(calls_made=1, throttled_seconds=waited)
+            try:
+                return fn()
+            except gspread.exceptions.APIError as e:
+                if not _is_rate_limited(e) or attempt == MAX_RETRIES:
+                    raise
+                bucket.drain()
+                delay = min(BACKOFF_BASE_SECONDS * (2 ** attempt), BACKOFF_MAX_SECONDS)
+                delay += random.uniform(0, delay / 2)
+                self._record(rate_limited_retries=1, throttled_seconds=delay)
+                time.sleep(delay)
+
+    def call(self, fn, is_write=False, coalesce_key=None):
+        """
+        Run a Sheets API call through the coalescing and rate limiting layer.
+
+        Args:
+            fn: Zero-argument callable making exactly one API request
+            is_write: Use the write quota bucket (writes are never coalesced)
+            coalesce_key: Identical keys running concurrently share one request
+        """
+        if is_write or coalesce_key is None:
+            return self._call_with_backoff(fn, is_write)
+
+        result, coalesced = self._single_flight.do(
+            coalesce_key, lambda: self._call_with_backoff(fn, is_write=False)
+        )
+        if coalesced:
+            self._record(calls_coalesced=1)
+        return result
+
+    def metrics(self):
+        """Snapshot of API call counters for this pool"""
+        with self._metrics_lock:
+            return dict(self._metrics)
+
+    def client(self):
+        """Return the shared gspread client with a fresh token"""
+        with self._lock:
+            self._ensure_token()
+            return self._client
+
+    def worksheet(self, sheet_id, worksheet_name):
+        """
+        Return a cached, throttled worksheet handle, opening it on first use.
+        Falls back to the first sheet if the named worksheet doesn't exist.
+        """
+        key = (sheet_id, worksheet_name)
+        with self._lock:
+            ws = self._worksheets.get(key)
+            if ws is None:
+                spreadsheet = self.call(lambda: self._client.open_by_key(sheet_id))
+                try:
+                    raw_ws = self.call(lambda: spreadsheet.worksheet(worksheet_name))
+                except gspread.exceptions.WorksheetNotFound:
+                    raw_ws = self.call(lambda: spreadsheet.sheet1)
+                ws = _ThrottledProxy(raw_ws, self)
+                self._worksheets[key] = ws
+            return ws
+
+    def forget_worksheet(self, sheet_id, worksheet_name):
+        """Drop a cached handle (e.g. after the sheet was renamed or deleted)"""
+        with self._lock:
+            self._worksheets.pop((sheet_id, worksheet_name), None)
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_sheets_pool(creds_info):
+    """
+    Return the process-wide pool for a service account, creating it once.
+
+    Args:
+        creds_info: Service account info (e.g. st.secrets["gcp_service_account"])
+    """
+    key = creds_info["client_email"]
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = SheetsClientPool(creds_info)
+            _pools[key] = pool
+        return pool
+
+
+def get_sheets_metrics():
+    """Combined API call counters across every pool in this process"""
+    totals = {"calls_made": 0, "calls_coalesced": 0, "rate_limited_retries": 0, "throttled_seconds": 0.0}
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        for name, value in pool.metrics().items():
+            totals[name] += value
+    return totals
@@ -0,0 +1,852 @@
+"""
+Task Data Service for SBS Dashboard
+Single shared access point for the Otter_Tasks worksheet used by every page
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+
+import pandas as pd
+import streamlit as st
+
+from demo_data_transformer import transform_to_demo_data
+from sheet_sync import (
+    BLOCK_SIZE,
+    FIRST_DATA_ROW,
+    ROW_INDEX_NAME,
+    cell_ranges,
+    changed_blocks,
+    get_modified_time,
+    hash_block,
+    hash_rows,
+    read_sheet_blocks,
+)
+from task_events import get_event_log, net_status_change
+from task_storage import open_worksheet
+from task_schema import (
+    PRIORITY_POSITION,
+    build_typed_frame,
+    get_schema,
+    is_frame_slot,
+    is_hidden_column,
+    typed_column_sources,
+)
+from task_writes import WriteBatch, WriteBehindQueue
+
+# Default Google Sheet ID (can be overridden with the "google_sheet_id" secret)
+DEFAULT_SHEET_ID = "1xENgMtZL5DSEHKFvYr34UZsJIDCxlTw-BbS3giYrHvw"
+WORKSHEET_NAME = "Otter_Tasks"
+
+# How often the background worker refreshes the snapshot (overridable with the
+# "task_refresh_interval_seconds" secret)
+REFRESH_TTL_SECONDS = 45
+
+# Rows sent per append_rows request when adding tasks (overridable with the
+# "task_append_chunk_size" secret); one request covers a typical transcript import
+APPEND_CHUNK_SIZE = 500
+
+# How long a stopping server waits for queued edits to reach the sheet
+SHUTDOWN_FLUSH_SECONDS = 10
+
+# Where the last good snapshot is persisted so restarts render instantly
+SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".snapshot_cache")
+
+
+# One published version of the task data; replaced as a whole, never mutated.
+# frame is indexed by sheet row number; typed is its parsed companion (see
+# task_schema.build_typed_frame); sheet_columns maps each frame column to its
+# 0-based sheet column; row_hashes holds a content hash per sheet row;
+# column_versions maps each frame column to the version it last changed in
+TaskSnapshot = namedtuple(
+    "TaskSnapshot",
+    ["frame", "version", "loaded_at", "typed", "sheet_columns", "row_hashes", "column_versions"],
+)
+
+
+def get_sheet_id():
+    """Return the configured Google Sheet ID"""
+    try:
+        return st.secrets.get("google_sheet_id", DEFAULT_SHEET_ID)
+    except Exception:
+        return DEFAULT_SHEET_ID
+
+
+def get_refresh_interval():
+    """Return the configured background refresh interval in seconds"""
+    try:
+        return float(st.secrets.get("task_refresh_interval_seconds", REFRESH_TTL_SECONDS))
+    except Exception:
+        return float(REFRESH_TTL_SECONDS)
+
+
+def get_append_chunk_size():
+    """Return the configured number of rows per append request"""
+    try:
+        return max(int(st.secrets.get("task_append_chunk_size", APPEND_CHUNK_SIZE)), 1)
+    except Exception:
+        return APPEND_CHUNK_SIZE
+
+
+def open_task_worksheet():
+    """
+    Return the Otter_Tasks worksheet on the configured storage backend
+    (the shared Google Sheets client pool, or the local SQLite stand-in).
+    On Google Sheets, falls back to the first sheet if Otter_Tasks doesn't exist
+    """
+    return open_worksheet(st.secrets, get_sheet_id(), WORKSHEET_NAME)
+
+
+def append_task_rows(rows, ws=None, chunk_size=None):
+    """
+    Append new task rows to the sheet with one append_rows request per chunk.
+
+    Args:
+        rows: Rows to append (lists of cell values in sheet column order)
+        ws: Worksheet to write to (defaults to open_task_worksheet())
+        chunk_size: Rows per request (defaults to get_append_chunk_size())
+
+    Returns:
+        Number of rows appended
+    """
+    rows = [list(row) for row in rows]
+    if not rows:
+        return 0
+
+    ws = ws or open_task_worksheet()
+    chunk_size = chunk_size or get_append_chunk_size()
+    for start in range(0, len(rows), chunk_size):
+        ws.append_rows(rows[start:start + chunk_size])
+    return len(rows)
+
+
+def _apply_task_edits(frame, sheet_columns, batch):
+    """
+    Frame with a WriteBatch's edits applied (a copy; frame itself is untouched).
+
+    Cell edits land on their sheet row and column; new rows are added after the
+    last row, where append_rows will put them in the sheet.
+    """
+    frame_columns = {position + 1: col for col, position in sheet_columns.items()}
+    patched = frame.copy()
+    for (row, col), value in batch.cells.items():
+        name = frame_columns.get(col)
+        if name is not None and row in patched.index:
+            patched.at[row, name] = value
+
+    if batch.rows and sheet_columns:
+        first_row = int(patched.index.max()) + 1 if len(patched) else FIRST_DATA_ROW
+        positions = [sheet_columns.get(col) for col in patched.columns]
+        data = [
+            [row[p] if p is not None and p < len(row) else "" for p in positions]
+            for row in batch.rows
+        ]
+        index = pd.RangeIndex(first_row, first_row + len(data), name=ROW_INDEX_NAME)
+        patched = pd.concat([patched, pd.DataFrame(data, columns=patched.columns, index=index)])
+    return patched
+
+
+def _record_status_changes(events):
+    """Log the status changes of cells that were just written (never fails the flush)"""
+    try:
+        get_event_log(st.secrets).append(net_status_change(changes) for changes in events.values())
+    except Exception as e:
+        print(f"⚠️ Could not record status changes: {e}")
+
+
+def _flush_task_edits(batch):
+    """Write-behind flush: all cell edits in one batch_update, then the new rows"""
+    ws = open_task_worksheet()
+    if batch.cells:
+        ws.batch_update(cell_ranges(batch.cells))
+        batch.mark_cells_written()
+        # Status changes are history only once they are in the sheet
+        _record_status_changes(batch.take_events())
+
+    chunk_size = get_append_chunk_size()
+    while batch.rows:
+        # Mark each chunk as it lands so a retry never appends a row twice
+        batch.mark_rows_written(append_task_rows(batch.rows[:chunk_size], ws, chunk_size))
+
+
+def _discard_task_edits(store, batch, error):
+    """
+    A flush failed for good: drop the edits' optimistic values by re-reading
+    the sheet in full (later edits still queued are re-applied on top)
+    """
+    print(f"⚠️ Gave up writing {len(batch)} task edit(s) to Google Sheets: {error}")
+    with store["publish_lock"]:
+        store["reread_generation"] += 1
+    threading.Thread(target=_reread_task_sheet, args=(store,), daemon=True).start()
+
+
+def _reread_task_sheet(store):
+    """
+    Thread target: full re-read after a discard. Unlike _run_background_refresh
+    it waits for a refresh already running instead of skipping, since that
+    one may publish before it notices the discard
+    """
+    try:
+        _refresh_snapshot(store, force_refresh=True)
+    except Exception as e:
+        store["last_error"] = str(e)
+
+
+def _blank_columns_with_data(headers, rows):
+    """Indices of columns with an empty header that still hold data in rows"""
+    blank = [i for i, header in enumerate(headers) if str(header).strip() == '']
+    return {i for i in blank if any(str(row[i]).strip() != '' for row in rows)}
+
+
+def _plan_task_columns(headers, blank_cols_with_data):
+    """
+    Decide which sheet columns make up the task frame and what they're called.
+
+    Args:
+        headers: Header row of the sheet
+        blank_cols_with_data: Columns with an empty header that hold data (kept)
+
+    Returns:
+        (positions, names): sheet column positions and their unique "<name>___<i>" names
+    """
+    # Remove columns with empty headers AND no data
+    cols_to_keep = [
+        idx for idx, header in enumerate(headers)
+        if str(header).strip() != '' or idx in blank_cols_with_data
+    ]
+    original_cols = [str(headers[idx]).strip() for idx in cols_to_keep]
+
+    # Keep the first 10 columns (main task fields) PLUS column 14 (index 13, Priority)
+    filtered_indices = []
+    for i, col_name in enumerate(original_cols):
+        if not is_frame_slot(i):
+            continue
+        # Skip columns in the hide list
+        if is_hidden_column(col_name):
+            continue
+        filtered_indices.append(i)
+
+    original_cols = [original_cols[i] for i in filtered_indices]
+
+    # Column 14 (index 13) is Priority even when its header is blank
+    if PRIORITY_POSITION in filtered_indices:
+        priority_position = filtered_indices.index(PRIORITY_POSITION)
+        if not original_cols[priority_position] or original_cols[priority_position].strip() == '':
+            original_cols[priority_position] = "Priority"
+
+    # Make ALL column names absolutely unique by appending index
+    positions = [cols_to_keep[i] for i in filtered_indices]
+    names = [f"{original_cols[i]}___{i}" for i in range(len(original_cols))]
+    return positions, names
+
+
+def _projected_columns(headers, grid_width=0):
+    """
+    Sheet columns (0-based) the loader has to download for this header row.
+
+    A superset of the task frame's columns: every non-hidden column up to the
+    one that fills the Priority slot when no blank-header column holds data.
+    Blank-header columns in that window are included because they only take a
+    slot if they hold data. With fewer named headers than frame slots, the
+    remaining slots (Priority included) can only be filled by blank-header
+    columns holding data, wherever they are - so the whole grid width is read.
+
+    Args:
+        headers: Header row of the sheet
+        grid_width: Number of columns in the worksheet grid (ws.col_count)
+    """
+    named = [i for i, header in enumerate(headers) if str(header).strip() != '']
+    if len(named) > PRIORITY_POSITION:
+        end = named[PRIORITY_POSITION] + 1
+    else:
+        end = max(len(headers), PRIORITY_POSITION + 1, grid_width)
+    padded = list(headers) + [''] * (end - len(headers))
+    return [i for i in range(end) if not is_hidden_column(str(padded[i]).strip())]
+
+
+def _rows_to_frame(rows, positions, names, start=0):
+    """Build the frame slice for data rows starting at data row start (0 = first data row)"""
+    data = [[row[p] for p in positions] for row in rows]
+    first_row = FIRST_DATA_ROW + start
+    index = pd.RangeIndex(first_row, first_row + len(rows), name=ROW_INDEX_NAME)
+    df = pd.DataFrame(data, columns=names, index=index)
+
+    # Apply demo data transformation PERMANENTLY
+    return transform_to_demo_data(df)
+
+
+def build_task_frame(all_values):
+    """
+    Turn raw sheet values (list of lists, header first) into the normalized task frame.
+
+    Every column gets a unique "<name>___<i>" suffix so duplicate headers never collide;
+    use get_column/has_column to look columns up by their original name. The index is
+    the sheet row number of each task, so filtered views still address their sheet rows.
+
+    Args:
+        all_values: Output of worksheet.get_all_values() (or the projected read)
+
+    Returns:
+        Normalized DataFrame (empty if the sheet has no data rows)
+    """
+    if not all_values or len(all_values) < 2:
+        return pd.DataFrame()
+
+    headers = all_values[0]
+    data_rows = all_values[1:]
+    positions, names = _plan_task_columns(headers, _blank_columns_with_data(headers, data_rows))
+    return _rows_to_frame(data_rows, positions, names)
+
+
+def _index_sheet(all_values, modified_time, columns):
+    """Raw-values bookkeeping kept next to the frame for delta syncs"""
+    headers = all_values[0] if all_values else []
+    rows = all_values[1:]
+    blocks = [rows[i:i + BLOCK_SIZE] for i in range(0, len(rows), BLOCK_SIZE)]
+    return {
+        "values": all_values,
+        "columns": columns,
+        "modified_time": modified_time,
+        "block_hashes": [hash_block(block) for block in blocks],
+        "block_blank_data": [_blank_columns_with_data(headers, block) for block in blocks],
+    }
+
+
+def _frame_sheet_columns(sheet):
+    """{frame column: 0-based sheet column} for the frame built from this sheet index"""
+    values = sheet["values"]
+    if not values:
+        return {}
+    blank_data = set().union(*sheet["block_blank_data"]) if sheet["block_blank_data"] else set()
+    positions, names = _plan_task_columns(values[0], blank_data)
+    return dict(zip(names, positions))
+
+
+def _full_sync(ws):
+    """Download the projected columns of the whole sheet and build the frame from scratch"""
+    modified_time = get_modified_time(ws)
+    grid_width = ws.col_count
+    columns = _projected_columns(ws.row_values(1), grid_width)
+    header, all_values = read_sheet_blocks(ws, 0, columns, BLOCK_SIZE)
+    if _projected_columns(header, grid_width) != columns:
+        # Header changed between the two reads - read again with the new projection
+        columns = _projected_columns(header, grid_width)
+        header, all_values = read_sheet_blocks(ws, 0, columns, BLOCK_SIZE)
+    return build_task_frame(all_values), _index_sheet(all_values, modified_time, columns)
+
+
+def _delta_sync(ws, frame, sheet):
+    """
+    Refresh the frame by re-parsing only the row blocks whose content hash changed.
+
+    Returns:
+        (frame, sheet, changed): changed is False when the sheet was not modified
+    """
+    modified_time = get_modified_time(ws)
+    if modified_time is not None and modified_time == sheet["modified_time"]:
+        return frame, sheet, False
+
+    old_values = sheet["values"]
+    columns = sheet["columns"]
+    header, all_values = read_sheet_blocks(ws, max(len(old_values) - 1, 0), columns, BLOCK_SIZE)
+
+    # Headers now call for a different set of columns - download them from scratch
+    if _projected_columns(header, ws.col_count) != columns:
+        df, new_sheet = _full_sync(ws)
+        return df, new_sheet, True
+
+    # A different header row means a different column layout - rebuild everything
+    if not old_values or not all_values or all_values[0] != old_values[0]:
+        return build_task_frame(all_values), _index_sheet(all_values, modified_time, columns), True
+
+    headers = all_values[0]
+    rows = all_values[1:]
+    new_blocks = [rows[i:i + BLOCK_SIZE] for i in range(0, len(rows), BLOCK_SIZE)]
+    new_hashes = [hash_block(block) for block in new_blocks]
+    dirty = changed_blocks(sheet["block_hashes"], new_hashes)
+
+    new_sheet = {
+        "values": all_values,
+        "columns": columns,
+        "modified_time": modified_time,
+        "block_hashes": new_hashes,
+        "block_blank_data": sheet["block_blank_data"][:len(new_blocks)],
+    }
+    if not dirty:
+        return frame, new_sheet, False
+
+    blank_data = new_sheet["block_blank_data"]
+    blank_data.extend(set() for _ in range(len(new_blocks) - len(blank_data)))
+    for b in dirty:
+        if b < len(new_blocks):
+            blank_data[b] = _blank_columns_with_data(headers, new_blocks[b])
+
+    positions, names = _plan_task_columns(headers, set().union(*blank_data) if blank_data else set())
+    if frame.empty or list(frame.columns) != names or not rows:
+        # Column set changed (or nothing to patch into) - rebuild everything
+        return build_task_frame(all_values), new_sheet, True
+
+    # Patch changed blocks into a copy so readers of the old frame are unaffected
+    patched = frame.reindex(pd.RangeIndex(FIRST_DATA_ROW, FIRST_DATA_ROW + len(rows), name=ROW_INDEX_NAME))
+    for b in dirty:
+        if b >= len(new_blocks):
+            continue
+        start = b * BLOCK_SIZE
+        block_frame = _rows_to_frame(new_blocks[b], positions, names, start=start)
+        patched.iloc[start:start + len(block_frame)] = block_frame.values
+
+    return patched, new_sheet, True
+
+
+def _frame_changes(old, new):
+    """
+    (rows, columns) whose values differ between two versions of the task frame,
+    or (None, None) when the rows or columns themselves differ
+    """
+    if old is None or not old.index.equals(new.index) or not old.columns.equals(new.columns):
+        return None, None
+    differs = (old.ne(new) & ~(old.isna() & new.isna())).to_numpy()
+    return new.index[differs.any(axis=1)], new.columns[differs.any(axis=0)]
+
+
+def _derive_snapshot(current, frame, version, loaded_at, sheet_columns):
+    """
+    Snapshot for a new frame, reusing what it can from the current snapshot.
+
+    When only some cells changed (an edit, or a refresh that re-parsed a few
+    blocks) only the typed columns parsed from the changed columns are rebuilt
+    and only the changed rows are re-hashed; columns that didn't change keep
+    their column version, so views derived from them stay valid.
+    """
+    rows, columns = _frame_changes(current.frame if current is not None else None, frame)
+    if rows is None:
+        return TaskSnapshot(
+            frame, version, loaded_at, build_typed_frame(frame), sheet_columns,
+            hash_rows(frame), dict.fromkeys(frame.columns, version),
+        )
+
+    typed = build_typed_frame(frame, base=current.typed, changed_columns=columns)
+    row_hashes = current.row_hashes
+    if len(rows):
+        row_hashes = row_hashes.copy()
+        row_hashes.loc[rows] = hash_rows(frame.loc[rows]).to_numpy()
+    column_versions = dict(current.column_versions)
+    column_versions.update(dict.fromkeys(columns, version))
+    return TaskSnapshot(frame, version, loaded_at, typed, sheet_columns, row_hashes, column_versions)
+
+
+def _snapshot_paths():
+    """Parquet file and metadata sidecar of the on-disk snapshot"""
+    return (
+        os.path.join(SNAPSHOT_DIR, "otter_tasks.parquet"),
+        os.path.join(SNAPSHOT_DIR, "otter_tasks.json"),
+    )
+
+
+def _save_snapshot_to_disk(df, loaded_at, sheet_columns):
+    """Persist the normalized frame atomically (write temp files, then rename)"""
+    frame_path, meta_path = _snapshot_paths()
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+
+    df.to_parquet(frame_path + ".tmp", index=True)
+    with open(meta_path + ".tmp", "w") as f:
+        json.dump({
+            "loaded_at": loaded_at,
+            "rows": len(df),
+            "sheet_columns": sheet_columns,
+            "row_index": ROW_INDEX_NAME,
+        }, f)
+
+    os.replace(frame_path + ".tmp", frame_path)
+    os.replace(meta_path + ".tmp", meta_path)
+
+
+def _load_snapshot_from_disk():
+    """Return (frame, loaded_at, sheet_columns) from the last saved snapshot, or (None, 0.0, {})"""
+    frame_path, meta_path = _snapshot_paths()
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if meta.get("row_index") != ROW_INDEX_NAME:
+            # Written before frames were indexed by sheet row - not safe to write back from
+            return None, 0.0, {}
+        return pd.read_parquet(frame_path), float(meta["loaded_at"]), meta.get("sheet_columns", {})
+    except Exception:
+        return None, 0.0, {}
+
+
+@st.cache_resource
+def _get_task_store():
+    """Process-wide snapshot holder shared by every session and page"""
+    frame, loaded_at, sheet_columns = _load_snapshot_from_disk()
+    snapshot = None
+    if frame is not None:
+        snapshot = _derive_snapshot(None, frame, 1, loaded_at, sheet_columns)
+    store = {
+        "refresh_lock": threading.Lock(),
+        "publish_lock": threading.Lock(),
+        "snapshot": snapshot,
+        "sheet": None,
+        # Bumped when queued edits are given up on; the next refresh re-reads the
+        # sheet in full unless it already did so since (read_generation)
+        "reread_generation": 0,
+        "read_generation": 0,
+        "refreshing": False,
+        "last_error": None,
+        "worker": None,
+    }
+    store["writes"] = WriteBehindQueue(
+        _flush_task_edits, on_failure=lambda batch, error: _discard_task_edits(store, batch, error)
+    )
+    atexit.register(store["writes"].wait_idle, SHUTDOWN_FLUSH_SECONDS)
+    return store
+
+
+def _refresh_snapshot(store, force_refresh=False):
+    """
+    Fetch the sheet (incrementally when possible) and publish the new snapshot.
+    Raises on Google Sheets errors; the previous snapshot stays in place.
+    """
+    with store["refresh_lock"]:
+        # Another thread may have refreshed while we waited for the lock
+        current = store["snapshot"]
+        is_fresh = (
+            current is not None
+            and time.time() - current.loaded_at < get_refresh_interval()
+            and store["reread_generation"] == store["read_generation"]
+        )
+        if is_fresh and not force_refresh:
+            return current.frame
+
+        while True:
+            # Edits discarded since the last full read may still show in the frame
+            # and the sheet index, so those can't be patched - read everything again
+            generation = store["reread_generation"]
+            ws = open_task_worksheet()
+            if store["sheet"] is None or current is None or generation != store["read_generation"]:
+                df, sheet = _full_sync(ws)
+                changed = True
+            else:
+                try:
+                    df, sheet, changed = _delta_sync(ws, current.frame, store["sheet"])
+                except Exception:
+                    # Batched range reads failed (e.g. grid limits) - fall back to a full read
+                    df, sheet = _full_sync(ws)
+                    changed = True
+
+            sheet_columns = _frame_sheet_columns(sheet)
+
+            with store["publish_lock"]:
+                current = store["snapshot"]
+                if store["reread_generation"] != generation:
+                    # Edits were discarded while we read; don't publish their values
+                    continue
+
+                # Edits still waiting to be written stay visible on top of the fresh data
+                if changed:
+                    pending = store["writes"].pending()
+                    if pending:
+                        df = _apply_task_edits(df, sheet_columns, pending)
+                else:
+                    df = current.frame if current is not None else df
+
+                loaded_at = time.time()
+                version = (current.version if current is not None else 0) + (1 if changed else 0)
+
+                # Parse types and hash rows once per data version, and only where the data changed
+                if changed or current is None:
+                    snapshot = _derive_snapshot(current, df, version, loaded_at, sheet_columns)
+                else:
+                    snapshot = current._replace(loaded_at=loaded_at, sheet_columns=sheet_columns)
+
+                # Publish frame, typed view, version and timestamp together in one assignment
+                store["sheet"] = sheet
+                store["read_generation"] = generation
+                store["snapshot"] = snapshot
+                store["last_error"] = None
+            break
+
+        if changed:
+            try:
+                _save_snapshot_to_disk(df, loaded_at, sheet_columns)
+            except Exception as e:
+                print(f"⚠️ Could not write task snapshot to disk: {e}")
+
+        return df
+
+
+_background_lock = threading.Lock()
+
+
+def _run_background_refresh(store, force_refresh=False):
+    """Refresh off the script thread, recording (not raising) errors"""
+    with _background_lock:
+        if store["refreshing"]:
+            return
+        store["refreshing"] = True
+    try:
+        _refresh_snapshot(store, force_refresh=force_refresh)
+    except Exception as e:
+        store["last_error"] = str(e)
+    finally:
+        store["refreshing"] = False
+
+
+def _start_background_refresh(store):
+    """Kick off one background refresh unless one is already running"""
+    if not store["refreshing"]:
+        threading.Thread(target=_run_background_refresh, args=(store,), daemon=True).start()
+
+
+def _refresh_worker(store, interval):
+    """Thread target: keep the snapshot hot by refreshing it every interval seconds"""
+    while True:
+        snapshot = store["snapshot"]
+        wait = interval - (time.time() - snapshot.loaded_at) if snapshot is not None else 0
+        if wait > 0:
+            time.sleep(wait)
+            continue
+
+        _run_background_refresh(store, force_refresh=True)
+        if store["last_error"]:
+            # Back off for a full interval instead of retrying in a tight loop
+            time.sleep(interval)
+
+
+def start_refresh_worker():
+    """
+    Start the process-wide background refresher (once per server process).
+
+    Safe to call on every script run; the worker refreshes the shared snapshot
+    every get_refresh_interval() seconds so interactive reruns never wait on
+    the Google Sheets API.
+    """
+    store = _get_task_store()
+    with _background_lock:
+        worker = store["worker"]
+        if worker is not None and worker.is_alive():
+            return
+        worker = threading.Thread(
+            target=_refresh_worker,
+            args=(store, get_refresh_interval()),
+            name="sbs-task-refresh",
+            daemon=True,
+        )
+        store["worker"] = worker
+    worker.start()
+
+
+def get_task_snapshot():
+    """
+    Return the current TaskSnapshot (frame, version, loaded_at), loading it if needed.
+    Use this when a consistent (frame, version) pair matters, e.g. for memoization.
+    """
+    store = _get_task_store()
+    start_refresh_worker()
+
+    snapshot = store["snapshot"]
+    if snapshot is not None:
+        # Fallback in case the worker fell behind: revalidate in the background
+        if time.time() - snapshot.loaded_at >= 2 * get_refresh_interval():
+            _start_background_refresh(store)
+        return snapshot
+
+    # No snapshot in memory or on disk yet - this first load has to wait
+    try:
+        _refresh_snapshot(store)
+    except Exception as e:
+        store["last_error"] = str(e)
+        st.error(f"Error loading Google Sheet: {str(e)}")
+    if store["snapshot"] is not None:
+        return store["snapshot"]
+    return _derive_snapshot(None, pd.DataFrame(), 0, 0.0, {})
+
+
+def load_task_data(force_refresh=False):
+    """
+    Return the shared normalized task frame.
+
+    The sheet is downloaded and parsed at most once per data version; every page
+    and every session receives the same frame object. Refreshes are incremental:
+    an unmodified sheet is not re-read, and only changed row blocks are re-parsed.
+
+    A background worker keeps the snapshot hot, and the last Parquet copy on disk
+    is served after a restart, so only the very first load (or a forced refresh)
+    waits on Google Sheets. Callers must copy before mutating.
+
+    Args:
+        force_refresh: Fetch from Google Sheets now and wait for the result
+
+    Returns:
+        Normalized DataFrame (empty on error)
+    """
+    if not force_refresh:
+        return get_task_snapshot().frame
+
+    store = _get_task_store()
+    try:
+        return _refresh_snapshot(store, force_refresh=True)
+    except Exception as e:
+        store["last_error"] = str(e)
+        st.error(f"Error loading Google Sheet: {str(e)}")
+        # Keep serving the last good snapshot if we have one
+        return store["snapshot"].frame if store["snapshot"] is not None else pd.DataFrame()
+
+
+def _taken_from(df, snapshot):
+    """True if df's rows are rows of snapshot's frame, with the typed columns' source cells unchanged"""
+    frame = snapshot.frame
+    if df is frame:
+        return True
+    index = df.index
+    if not (
+        len(index) > 0
+        and pd.api.types.is_integer_dtype(index)
+        and index.min() >= FIRST_DATA_ROW
+        and index.max() < FIRST_DATA_ROW + len(frame)
+    ):
+        return False
+    sources = list(dict.fromkeys(col for col in typed_column_sources(df).values() if col is not None))
+    if not set(sources) <= set(frame.columns):
+        return False
+    return frame.loc[index, sources].equals(df[sources])
+
+
+def get_typed_view(df, snapshot=None):
+    """
+    Typed columns (status enum, categorical project/person, dates, progress) for df.
+
+    df is the shared task frame or any row subset of it (filtering keeps the
+    sheet row labels), so the snapshot's typed view is reused instead of
+    re-parsing strings. Frames that don't come from the snapshot are parsed directly.
+
+    Args:
+        df: Task frame or a filtered view of it
+        snapshot: TaskSnapshot df was taken from. Without it the current snapshot
+            is used, but only if df's cells still match it (a background refresh
+            may have published a newer version since df was loaded)
+
+    Returns:
+        DataFrame of task_schema.TYPED_COLUMNS aligned with df.index
+    """
+    if snapshot is None:
+        snapshot = _get_task_store()["snapshot"]
+        if snapshot is not None and not _taken_from(df, snapshot):
+            snapshot = None
+    if snapshot is None or len(df.index) == 0:
+        return build_typed_frame(df)
+    index = df.index
+    return snapshot.typed.take(index - FIRST_DATA_ROW).set_axis(index)
+
+
+def find_row_conflicts(base, rows):
+    """
+    Sheet rows whose content changed since the base snapshot was loaded.
+
+    Compares the base snapshot's row hashes with the current snapshot's, so a
+    save can skip rows someone else edited (or that shifted because rows were
+    inserted/deleted above them) without re-reading the sheet.
+
+    Args:
+        base: TaskSnapshot the edit started from
+        rows: Sheet row numbers about to be written
+
+    Returns:
+        Set of conflicting sheet row numbers
+    """
+    current = _get_task_store()["snapshot"]
+    if current is None or current.version == base.version:
+        return set()
+    rows = pd.Index(list(rows))
+    before = base.row_hashes.reindex(rows)
+    after = current.row_hashes.reindex(rows)
+    return set(rows[(before != after).to_numpy()].tolist())
+
+
+def queue_task_edits(cells=None, rows=None, events=None):
+    """
+    Save edits without waiting on Google Sheets (write-behind).
+
+    The edits are applied to the shared snapshot right away (new version, so
+    every page sees them on its next run) and queued; a background thread
+    coalesces edits made close together and writes them in one batch, retrying
+    failures. See get_write_status() for progress.
+
+    Args:
+        cells: {(sheet_row, sheet_col): value} with 1-based row/column numbers
+        rows: New rows to append, in sheet column order
+        events: {(sheet_row, sheet_col): task_events.status_change() event} for
+            Status cells among the edits; logged once those cells are written
+
+    Returns:
+        The TaskSnapshot including the edits
+    """
+    store = _get_task_store()
+    batch = WriteBatch(cells, rows)
+    with store["publish_lock"]:
+        current = store["snapshot"]
+        store["writes"].submit(batch.cells, batch.rows, events)
+        if current is not None and batch:
+            # Patch the shared snapshot in place of a re-read: only the edited
+            # rows and columns are re-derived, and the version moves on
+            frame = _apply_task_edits(current.frame, current.sheet_columns, batch)
+            store["snapshot"] = _derive_snapshot(
+                current, frame, current.version + 1, current.loaded_at, current.sheet_columns
+            )
+    return get_task_snapshot()
+
+
+def get_write_status():
+    """State of the write-behind queue (pending edits, retries, last error)"""
+    return _get_task_store()["writes"].status()
+
+
+def get_data_version(columns=None, snapshot=None):
+    """
+    Version number of the current snapshot (bumped whenever the data changes)
+
+    Args:
+        columns: Optional task column names (original or ___N-suffixed); returns
+            the version any of them last changed in instead, so views derived
+            from those columns only are not invalidated by unrelated edits
+        snapshot: TaskSnapshot to read the version of (defaults to the current one)
+    """
+    if snapshot is None:
+        snapshot = _get_task_store()["snapshot"]
+    if snapshot is None:
+        return 0
+    if columns is None:
+        return snapshot.version
+    schema = get_schema(snapshot.frame)
+    physical = [schema.find(name) for name in columns]
+    return max(
+        (snapshot.column_versions.get(col, snapshot.version) for col in physical if col is not None),
+        default=0,
+    )
+
+
+def get_snapshot_status():
+    """
+    Freshness of the snapshot being served, for the UI staleness indicator
+
+    Returns:
+        dict with loaded_at, age_seconds, is_stale, refreshing, last_error,
+        pending_writes (edits not yet in the sheet) and write_error
+    """
+    store = _get_task_store()
+    snapshot = store["snapshot"]
+    writes = store["writes"].status()
+    loaded_at = snapshot.loaded_at if snapshot is not None else 0.0
+    age_seconds = max(time.time() - loaded_at, 0) if loaded_at else 0
+    return {
+        "loaded_at": loaded_at,
+        "age_seconds": age_seconds,
+        "is_stale": age_seconds >= 2 * get_refresh_interval(),
+        "refreshing": store["refreshing"],
+        "last_error": store["last_error"],
+        "pending_writes": writes["pending_cells"] + writes["pending_rows"],
+        "write_error": writes["last_error"],
+    }
@@ -0,0 +1,318 @@
+"""
+Task Status Event Log for SBS Dashboard
+Every status change saved from the dashboard is appended to a local log, one
+JSON line per event in monthly files, and read back with timestamp range scans
+(completion velocity, throughput, cycle time)
+
+Set the log directory with the optional "task_events_path" secret:
+    task_events_path = "/path/to/status_events"   # default: .local_events/
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+from dateutil.tz import tzlocal
+
+from task_schema import STATUS_DONE, STATUS_WORKING, classify_status
+
+# Default location of the event log
+DEFAULT_EVENTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".local_events")
+
+# One file per calendar month (UTC), e.g. status_events-2026-10.jsonl
+PARTITION_PREFIX = "status_events-"
+PARTITION_SUFFIX = ".jsonl"
+_PARTITION_NAME = re.compile(rf"^{PARTITION_PREFIX}(\d{{4}})-(\d{{2}}){re.escape(PARTITION_SUFFIX)}$")
+
+# Zone event times are shown (and days are counted) in - the server's, with its DST rules
+LOCAL_TZ = tzlocal()
+
+# Days shown on the completion velocity, throughput and cycle time charts
+VELOCITY_DAYS = 7
+THROUGHPUT_DAYS = 30
+CYCLE_TIME_DAYS = 90
+
+
+def _partition_name(ts):
+    """File name of the monthly partition holding Unix time ts"""
+    return time.strftime(f"{PARTITION_PREFIX}%Y-%m{PARTITION_SUFFIX}", time.gmtime(ts))
+
+
+def _partition_bounds(year, month):
+    """[start, end) of a monthly partition in Unix time"""
+    start = pd.Timestamp(year=year, month=month, day=1, tz="UTC")
+    return start.timestamp(), (start + pd.offsets.MonthBegin(1)).timestamp()
+
+
+def status_change(row, old_status, new_status, project="", person="", user="", ts=None, task=""):
+    """
+    Event for one task's status change, or None if the status didn't really change.
+
+    Args:
+        row: Sheet row of the task
+        old_status: Status text before the edit
+        new_status: Status text after the edit
+        project: Task project (kept so scans can group without the task sheet)
+        person: Task assignee
+        user: Who made the change
+        ts: When the change was saved (Unix time, defaults to now)
+        task: Stable task key (its Transcript ID); rows shift when rows above
+            are inserted or deleted, so scans follow a task by this key
+    """
+    old_text = (old_status or "").strip()
+    new_text = (new_status or "").strip()
+    if old_text.lower() == new_text.lower():
+        return None
+    return {
+        "ts": time.time() if ts is None else ts,
+        "row": int(row),
+        "task": (task or "").strip(),
+        "from": classify_status(old_text.lower()) if old_text else None,
+        "to": classify_status(new_text.lower()) if new_text else None,
+        "from_text": old_text,
+        "to_text": new_text,
+        "project": project or "",
+        "person": person or "",
+        "user": user or "",
+    }
+
+
+def net_status_change(changes):
+    """
+    One event for successive changes of the same task's status (first status to
+    last, e.g. open -> done -> working is open -> working), None if it ended where it began
+    """
+    first, last = changes[0], changes[-1]
+    return status_change(
+        last["row"], first["from_text"], last["to_text"],
+        project=last["project"], person=last["person"], user=last["user"], ts=last["ts"],
+        task=last.get("task", ""),
+    )
+
+
+class _PartitionIndex:
+    """Events of one partition file sorted by timestamp, valid for one (size, mtime)"""
+
+    def __init__(self, path):
+        stat = os.stat(path)
+        self.signature = (stat.st_size, stat.st_mtime_ns)
+        events = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    events.append(json.loads(line))
+                except ValueError:
+                    # A line cut short by a crash - skip it
+                    continue
+        events.sort(key=lambda event: event.get("ts", 0))
+        self.events = events
+        self.timestamps = np.array([event.get("ts", 0) for event in events], dtype=float)
+
+    def scan(self, start, end):
+        """Events with start <= ts < end (two binary searches on the timestamp index)"""
+        lo, hi = np.searchsorted(self.timestamps, [start, end], side="left")
+        return self.events[lo:hi]
+
+
+class StatusEventLog:
+    """
+    Append-only status event log in monthly JSON-lines partitions.
+
+    append() writes each event to the file of the month it was saved in (events
+    may arrive slightly out of order; partitions are sorted when indexed).
+    scan() opens only the partitions overlapping the
+    requested range and binary-searches each one's in-memory timestamp index,
+    which is rebuilt only when the file changed.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._indexes = {}
+
+    def append(self, events):
+        """
+        Record events (dicts from status_change(); None entries are skipped).
+
+        Returns:
+            Number of events written
+        """
+        events = [event for event in events if event]
+        if not events:
+            return 0
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            by_partition = {}
+            for event in events:
+                by_partition.setdefault(_partition_name(event["ts"]), []).append(event)
+            for name, batch in by_partition.items():
+                lines = "".join(json.dumps(event, ensure_ascii=False) + "\n" for event in batch)
+                with open(os.path.join(self.directory, name), "a", encoding="utf-8") as f:
+                    f.write(lines)
+                    f.flush()
+                    os.fsync(f.fileno())
+        return len(events)
+
+    def partitions(self, start=None, end=None):
+        """Partition files overlapping [start, end), oldest first"""
+        try:
+            names = sorted(os.listdir(self.directory))
+        except FileNotFoundError:
+            return []
+        selected = []
+        for name in names:
+            match = _PARTITION_NAME.match(name)
+            if not match:
+                continue
+            part_start, part_end = _partition_bounds(int(match.group(1)), int(match.group(2)))
+            if (start is None or part_end > start) and (end is None or part_start < end):
+                selected.append(os.path.join(self.directory, name))
+        return selected
+
+    def _index(self, path):
+        """Timestamp index of a partition, rebuilt if the file changed since it was read"""
+        stat = os.stat(path)
+        with self._lock:
+            index = self._indexes.get(path)
+            if index is None or index.signature != (stat.st_size, stat.st_mtime_ns):
+                index = _PartitionIndex(path)
+                self._indexes[path] = index
+            return index
+
+    def scan(self, start=None, end=None):
+        """
+        Events with start <= ts < end, oldest first.
+
+        Args:
+            start: Range start (Unix time, datetime or Timestamp; None = from the beginning)
+            end: Range end, exclusive (None = up to now)
+        """
+        start = _unix_time(start)
+        end = _unix_time(end)
+        events = []
+        for path in self.partitions(start, end):
+            events.extend(self._index(path).scan(
+                -np.inf if start is None else start,
+                np.inf if end is None else end,
+            ))
+        return events
+
+    def frame(self, start=None, end=None):
+        """scan() as a DataFrame with a naive datetime "time" column in LOCAL_TZ"""
+        events = pd.DataFrame(self.scan(start, end), columns=[
+            "ts", "row", "task", "from", "to", "from_text", "to_text", "project", "person", "user",
+        ])
+        # Events logged before tasks were keyed have no task key
+        events["task"] = events["task"].fillna("")
+        events["time"] = pd.to_datetime(events["ts"], unit="s", utc=True).dt.tz_convert(LOCAL_TZ).dt.tz_localize(None)
+        return events
+
+
+def _unix_time(value):
+    """Unix time from a number, a naive local datetime/Timestamp, or None"""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    stamp = pd.Timestamp(value)
+    if stamp.tzinfo is None:
+        stamp = stamp.tz_localize(LOCAL_TZ, ambiguous=False, nonexistent="shift_forward")
+    return stamp.timestamp()
+
+
+_logs = {}
+_logs_lock = threading.Lock()
+
+
+def get_events_path(secrets=None):
+    """Return the configured event log directory"""
+    try:
+        return secrets.get("task_events_path", DEFAULT_EVENTS_PATH)
+    except Exception:
+        return DEFAULT_EVENTS_PATH
+
+
+def get_event_log(secrets=None):
+    """Shared StatusEventLog for the configured directory (one per path per process)"""
+    directory = os.path.abspath(get_events_path(secrets))
+    with _logs_lock:
+        if directory not in _logs:
+            _logs[directory] = StatusEventLog(directory)
+        return _logs[directory]
+
+
+def _day_window(days, today):
+    """(first day, end of the last day) of the days-long window ending today"""
+    last_day = pd.Timestamp(today or datetime.now()).normalize()
+    first_day = last_day - timedelta(days=days - 1)
+    return first_day, last_day + timedelta(days=1)
+
+
+def daily_completions(log, days=VELOCITY_DAYS, today=None):
+    """
+    Tasks moved to done on each of the last `days` days (completion velocity).
+
+    Returns:
+        Series of counts indexed by day (oldest first, days without completions are 0)
+    """
+    first_day, end = _day_window(days, today)
+    events = log.frame(first_day, end)
+    done = events.loc[(events["to"] == STATUS_DONE) & (events["from"] != STATUS_DONE), "time"]
+    counts = done.dt.normalize().value_counts()
+    return counts.reindex(pd.date_range(first_day, periods=days, freq="D"), fill_value=0)
+
+
+def throughput(log, days=THROUGHPUT_DAYS, today=None, by="project"):
+    """
+    Completions per project (or person) over the last `days` days.
+
+    Returns:
+        Series of counts indexed by group, largest first
+    """
+    first_day, end = _day_window(days, today)
+    events = log.frame(first_day, end)
+    done = events[(events["to"] == STATUS_DONE) & (events["from"] != STATUS_DONE)]
+    return done[by].replace("", "Unassigned").value_counts()
+
+
+def task_keys(events):
+    """
+    Key following each event's task: its Transcript ID, or its sheet row for
+    events without one (logged before tasks were keyed, or tasks without an ID)
+    """
+    return events["task"].where(events["task"] != "", "row " + events["row"].astype(str))
+
+
+def cycle_times(log, days=CYCLE_TIME_DAYS, today=None):
+    """
+    Days from the move to working that began each task's latest stint of work
+    until it was done, for tasks completed in the last `days` days (a reopened
+    task's earlier cycles don't count; tasks never marked working aren't included).
+
+    Returns:
+        DataFrame with task, row, project, person, started, finished and days
+    """
+    first_day, end = _day_window(days, today)
+    columns = ["task", "row", "project", "person", "started", "finished", "days"]
+
+    # Work may have started before the window - scan back to the first partition
+    history = log.frame(None, end).sort_values("ts", kind="stable")
+    window_start = _unix_time(first_day)
+
+    rows = []
+    started = {}
+    for key, ts, time_, row, from_status, to_status, project, person in zip(
+        task_keys(history), history["ts"], history["time"], history["row"], history["from"],
+        history["to"], history["project"], history["person"],
+    ):
+        if to_status == STATUS_WORKING:
+            # The last move to working since the previous completion starts the cycle
+            started[key] = time_
+        elif to_status == STATUS_DONE and from_status != STATUS_DONE:
+            begun = started.pop(key, None)
+            if begun is not None and ts >= window_start:
+                rows.append([key, row, project, person, begun, time_, (time_ - begun) / timedelta(days=1)])
+    return pd.DataFrame(rows, columns=columns)
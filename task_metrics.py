@@ -0,0 +1,320 @@
+"""
+Task Metrics Engine for SBS Dashboard
+Dashboard counters computed from the typed task view in single vectorized passes
+over its categorical codes, memoized per data version and row scope
+"""
+
+import re
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from task_data import get_data_version, get_typed_view
+from task_schema import (
+    STATUS_ARCHIVED,
+    STATUS_CATEGORIES,
+    STATUS_DONE,
+    STATUS_OPEN,
+    STATUS_OTHER,
+    STATUS_WORKING,
+    get_column,
+    has_column,
+)
+
+# Derived metrics kept in memory (least recently used entries are evicted first)
+METRICS_CACHE_SIZE = 512
+
+# Task columns the KPI counters are parsed from
+KPI_SOURCE_COLUMNS = ["Status", "Project", "Assigned To", "Person", "assignee"]
+
+# Task age buckets (whole days since Date Assigned): bucket i holds ages below
+# AGE_BUCKET_EDGES[i], the last one everything older (overridable per chart)
+AGE_BUCKET_EDGES = [8, 15, 31]
+
+# Status texts for the overdue rules: finished tasks are never overdue, active
+# tasks older than STALE_AFTER_DAYS count as overdue on the executive summary
+FINISHED_STATUS_TEXTS = ["done", "complete", "completed"]
+ACTIVE_STATUS_TEXTS = ["open", "working", "in progress", "not started"]
+STALE_AFTER_DAYS = 30
+
+
+class MetricsCache:
+    """
+    Thread-safe LRU of derived metrics, shared by every session in the process.
+
+    Keys name the metric, the data version it was computed from, the rows it
+    covers and any filters; values are small dicts, so max_entries bounds memory.
+    """
+
+    def __init__(self, max_entries=METRICS_CACHE_SIZE):
+        self._max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get_or_compute(self, key, compute):
+        """Cached value for key, calling compute() once if it isn't cached"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return self._entries[key]
+            self._stats["misses"] += 1
+
+        value = compute()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+        return value
+
+    def stats(self):
+        """Hit/miss/eviction counters and the current entry count"""
+        with self._lock:
+            return dict(self._stats, entries=len(self._entries))
+
+
+_metrics_cache = MetricsCache()
+
+
+def scope_key(df):
+    """Cheap identity of the rows in df (its sheet row labels), for memo keys"""
+    return len(df), hash(df.index.to_numpy().tobytes())
+
+
+def memoized_metric(name, df, compute, columns=None, filters=()):
+    """
+    compute(), reused while the data and rows it depends on are unchanged.
+
+    Reruns triggered by widgets that don't change the data, the scoped rows or
+    the filters skip the computation entirely. Callers must not mutate the result.
+
+    Args:
+        name: Metric name (part of the key)
+        df: Scoped task rows the metric is computed from
+        compute: Zero-argument callable producing the metric
+        columns: Task columns the metric reads (None = any column)
+        filters: Hashable extra key parts (user, active filters, reference date)
+    """
+    key = (name, get_data_version(columns), scope_key(df), tuple(filters))
+    return _metrics_cache.get_or_compute(key, compute)
+
+
+def get_metrics_cache_stats():
+    """Counters of the shared metrics cache"""
+    return _metrics_cache.stats()
+
+
+def _category_counts(values):
+    """Rows per category of a Categorical column (one bincount over its codes)"""
+    codes = values.cat.codes.to_numpy()
+    # Shift by one so missing values (code -1) land in their own slot
+    return np.bincount(codes + 1, minlength=len(values.cat.categories) + 1)[1:]
+
+
+def _category_matches(values, pattern):
+    """Per-row bool: category text matches pattern (evaluated once per category)"""
+    categories = values.cat.categories
+    lookup = np.array([bool(pattern.search(str(c))) for c in categories] + [False], dtype=bool)
+    # Missing values have code -1, which picks the trailing False
+    return lookup[values.cat.codes.to_numpy()]
+
+
+def age_bucket_labels(edges):
+    """Display labels for age buckets split at edges, e.g. [8, 15] -> 0-7, 8-14, 15+ days"""
+    bounds = [0] + list(edges)
+    labels = [f"{low}-{high - 1} days" for low, high in zip(bounds, bounds[1:])]
+    return labels + [f"{bounds[-1]}+ days"]
+
+
+AGE_BUCKET_LABELS = age_bucket_labels(AGE_BUCKET_EDGES)
+
+
+def _whole_days(delta):
+    """Whole days (floored) of a timedelta64 array, NaN where it is NaT"""
+    days = np.floor(delta / np.timedelta64(1, "D"))
+    days[np.isnat(delta)] = np.nan
+    return days
+
+
+def task_timing(typed, today=None, age_edges=AGE_BUCKET_EDGES):
+    """
+    Overdue and aging figures for every task, against one "today".
+
+    Dates are already parsed in the typed view, so this is a handful of array
+    operations regardless of sheet size.
+
+    Args:
+        typed: Typed view of the task rows (task_data.get_typed_view)
+        today: Reference time (defaults to now)
+        age_edges: Age bucket boundaries in days (see AGE_BUCKET_EDGES)
+
+    Returns:
+        DataFrame aligned with typed: age_days and days_overdue (whole days, NaN
+        without a date), age_bucket (index into age_bucket_labels(age_edges), -1
+        without a Date Assigned), is_overdue (due date passed, not finished) and is_stale
+        (active and older than STALE_AFTER_DAYS)
+    """
+    now = np.datetime64(pd.Timestamp.now() if today is None else pd.Timestamp(today), "ns")
+    assigned = typed["date_assigned"].to_numpy(dtype="datetime64[ns]")
+    due = typed["due_date"].to_numpy(dtype="datetime64[ns]")
+
+    age_days = _whole_days(now - assigned)
+    age_bucket = np.digitize(age_days, age_edges)
+    age_bucket[np.isnan(age_days)] = -1
+
+    status_text = typed["status_text"]
+    finished = _category_matches(status_text, re.compile(f"^(?:{'|'.join(FINISHED_STATUS_TEXTS)})$"))
+    active = _category_matches(status_text, re.compile(f"^(?:{'|'.join(ACTIVE_STATUS_TEXTS)})$"))
+
+    return pd.DataFrame({
+        "age_days": age_days,
+        "age_bucket": age_bucket,
+        "days_overdue": _whole_days(now - due),
+        "is_overdue": (due < now) & ~finished,
+        "is_stale": active & (age_days > STALE_AFTER_DAYS),
+    }, index=typed.index)
+
+
+def age_bucket_counts(age_bucket, labels=AGE_BUCKET_LABELS):
+    """Tasks per age bucket label (one bincount; undated tasks are left out)"""
+    age_bucket = np.asarray(age_bucket)
+    counts = np.bincount(age_bucket[age_bucket >= 0], minlength=len(labels))
+    return dict(zip(labels, counts.tolist()))
+
+
+def status_crosstab(group_codes, group_count, status):
+    """
+    Rows per (group, status) in one bincount - a crosstab without building frames.
+
+    Args:
+        group_codes: Group number per row (0..group_count-1, -1 = no group)
+        group_count: Number of groups
+        status: Typed "status" column of the same rows
+
+    Returns:
+        int array of shape (group_count, 1 + len(STATUS_CATEGORIES)); column 0
+        counts rows with no status, column 1 + i counts STATUS_CATEGORIES[i]
+    """
+    width = len(STATUS_CATEGORIES) + 1
+    status_codes = status.cat.codes.to_numpy() + 1
+    grouped = group_codes >= 0
+    cells = group_codes[grouped] * width + status_codes[grouped]
+    return np.bincount(cells, minlength=group_count * width).reshape(group_count, width)
+
+
+def status_breakdown(group_codes, groups, status):
+    """
+    {group: {"total", "open", "in_progress", "complete"}} from one status crosstab
+
+    Args:
+        group_codes: Index into groups per row (-1 = row belongs to no group)
+        groups: Group labels, in the order the dict should list them
+        status: Typed "status" column of the same rows
+    """
+    table = status_crosstab(group_codes, len(groups), status)
+    position = {status_name: 1 + i for i, status_name in enumerate(STATUS_CATEGORIES)}
+    totals = table.sum(axis=1)
+    return {
+        group: {
+            "total": int(totals[i]),
+            "open": int(table[i, position[STATUS_OPEN]]),
+            "in_progress": int(table[i, position[STATUS_WORKING]]),
+            "complete": int(table[i, position[STATUS_DONE]]),
+        }
+        for i, group in enumerate(groups)
+    }
+
+
+def task_age_breakdown(df, age_edges=AGE_BUCKET_EDGES):
+    """
+    Tasks per (age bucket, status), from the parsed Date Assigned.
+
+    One digitize and one crosstab over the typed view, memoized per version of
+    the Status/Date Assigned columns, scoped rows and day, so reruns are free.
+
+    Args:
+        df: Task frame or a filtered view of it
+        age_edges: Age bucket boundaries in days (see AGE_BUCKET_EDGES)
+
+    Returns:
+        DataFrame indexed by age bucket label with one count column per status
+        in STATUS_CATEGORIES (tasks without a Date Assigned are left out)
+    """
+    def compute():
+        typed = get_typed_view(df)
+        age_bucket = task_timing(typed, age_edges=age_edges)["age_bucket"].to_numpy()
+        labels = age_bucket_labels(age_edges)
+        table = status_crosstab(age_bucket, len(labels), typed["status"])
+        counts = table[:, 1:].copy()
+        # Tasks with a blank status count as "other"
+        counts[:, STATUS_CATEGORIES.index(STATUS_OTHER)] += table[:, 0]
+        return pd.DataFrame(counts, index=labels, columns=STATUS_CATEGORIES)
+
+    return memoized_metric(
+        "task_age",
+        df,
+        compute,
+        columns=["Status", "Date Assigned"],
+        filters=(pd.Timestamp.now().date(), tuple(age_edges)),
+    )
+
+
+def compute_kpis(typed, user_name, projects=None):
+    """
+    All KPI counters from one pass over each typed column's codes.
+
+    Args:
+        typed: Typed view of the scoped task rows (task_data.get_typed_view)
+        user_name: User's full name (matched case-insensitively against the assignee)
+        projects: Raw Project column of the same rows (None if there is none);
+            active_projects counts its distinct values as entered, blanks included
+
+    Returns:
+        dict with my_open_tasks, team_open_tasks, active_projects, open_tasks,
+        working_tasks, done_tasks and archived_tasks
+    """
+    by_status = dict(zip(STATUS_CATEGORIES, _category_counts(typed["status"]).tolist()))
+
+    # "Open" here means the literal status text, not the broader open enum
+    status_text = typed["status_text"]
+    open_code = status_text.cat.categories.get_indexer(["open"])[0]
+    is_open_text = status_text.cat.codes.to_numpy() == open_code if open_code >= 0 else np.zeros(len(typed), dtype=bool)
+
+    my_open_tasks = 0
+    if user_name and is_open_text.any():
+        is_mine = _category_matches(typed["person"], re.compile(re.escape(user_name), re.IGNORECASE))
+        my_open_tasks = int(np.count_nonzero(is_mine & is_open_text))
+
+    return {
+        "my_open_tasks": my_open_tasks,
+        "team_open_tasks": int(np.count_nonzero(is_open_text)),
+        "active_projects": int(projects.nunique()) if projects is not None else 0,
+        "open_tasks": by_status[STATUS_OPEN],
+        "working_tasks": by_status[STATUS_WORKING],
+        "done_tasks": by_status[STATUS_DONE],
+        "archived_tasks": by_status[STATUS_ARCHIVED],
+    }
+
+
+def get_kpis(df, user_name):
+    """
+    KPI counters for the scoped task rows in df, memoized per (data version, rows, user).
+
+    Args:
+        df: Task frame or a filtered view of it (rows keyed by sheet row)
+        user_name: User's full name
+
+    Returns:
+        dict as returned by compute_kpis()
+    """
+    projects = df[get_column(df, "Project")] if has_column(df, "Project") else None
+    kpis = memoized_metric(
+        "kpis", df, lambda: compute_kpis(get_typed_view(df), user_name, projects),
+        columns=KPI_SOURCE_COLUMNS, filters=(user_name,),
+    )
+    return dict(kpis)
@@ -0,0 +1,280 @@
+"""
+Typed Task Schema for SBS Dashboard
+Parses the raw string task frame once per data version into typed columns
+(status enum, categorical project/person, real dates, numeric progress)
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+# Canonical status enum - every raw status maps to exactly one of these
+STATUS_OPEN = "open"
+STATUS_WORKING = "working"
+STATUS_DONE = "done"
+STATUS_ARCHIVED = "archived"
+STATUS_OTHER = "other"
+STATUS_CATEGORIES = [STATUS_OPEN, STATUS_WORKING, STATUS_DONE, STATUS_ARCHIVED, STATUS_OTHER]
+
+# Raw status text patterns, checked in this order (first match wins)
+STATUS_PATTERNS = [
+    (STATUS_ARCHIVED, re.compile(r"archived|archive")),
+    (STATUS_DONE, re.compile(r"done|complete|🟢")),
+    (STATUS_WORKING, re.compile(r"in progress|working|🟡")),
+    (STATUS_OPEN, re.compile(r"not started|open|🔴")),
+]
+
+# Typed column names
+TYPED_COLUMNS = [
+    "status", "status_text", "project", "project_key", "person", "person_key",
+    "priority", "date_assigned", "due_date", "progress",
+]
+
+# Declared sheet layout: the task frame is the first MAIN_COLUMN_COUNT kept columns
+# plus the one at PRIORITY_POSITION (Priority, even when its header is blank).
+# Columns with an empty header and no data are not "kept" and don't take a slot.
+MAIN_COLUMN_COUNT = 10
+PRIORITY_POSITION = 13
+
+# Columns that are never shown in the app (also never downloaded)
+COLUMNS_TO_HIDE = ["Progress Bar", "Confidence", "Emails", "Duplicate Check", "0%"]
+
+# Sheet columns that may hold the assignee, in lookup order
+ASSIGNEE_COLUMN_NAMES = ["Assigned To", "Person", "assignee"]
+
+# Sheet columns that may hold the Transcript ID (a task's stable identifier), in lookup order
+TRANSCRIPT_COLUMN_NAMES = ["Transcript ID", "Transcript Number", "Transcript #", "Transcript"]
+
+# Column layouts seen recently -> their resolved ColumnSchema
+_SCHEMA_CACHE_SIZE = 64
+_schemas = {}
+
+
+def classify_status(status_text):
+    """Map one lowercased, stripped status string to the canonical status enum"""
+    for status, pattern in STATUS_PATTERNS:
+        if pattern.search(status_text):
+            return status
+    return STATUS_OTHER
+
+
+class ColumnSchema:
+    """
+    Logical -> physical column resolution for one task frame layout.
+
+    Task columns carry a unique "___N" suffix ("Status___5"); the schema maps
+    each logical name to its physical column once, so lookups are a dict hit
+    instead of a scan of df.columns. An exact column name wins over a suffixed
+    one, and the first suffixed column wins among duplicates.
+    """
+
+    def __init__(self, columns):
+        self.columns = tuple(columns)
+        self._physical = {}
+        for col in self.columns:
+            self._physical.setdefault(col, col)
+        for col in self.columns:
+            if isinstance(col, str) and "___" in col:
+                self._physical.setdefault(col.rsplit("___", 1)[0], col)
+
+        # "Assigned To" / "Person" / "assignee" all mean the assignee
+        self.assignee = next(
+            (self._physical[name] for name in ASSIGNEE_COLUMN_NAMES if name in self._physical),
+            None,
+        )
+        self.transcript = next(
+            (self._physical[name] for name in TRANSCRIPT_COLUMN_NAMES if name in self._physical),
+            None,
+        )
+
+    def get(self, col_name):
+        """Physical column for col_name (col_name itself if it doesn't exist)"""
+        return self._physical.get(col_name, col_name)
+
+    def has(self, col_name):
+        """Check if a column exists by original name"""
+        return col_name in self._physical
+
+    def find(self, col_name):
+        """Physical column for col_name, or None if it doesn't exist"""
+        return self._physical.get(col_name)
+
+
+def get_schema(df):
+    """
+    Return the ColumnSchema for df's column layout, resolving it once.
+
+    Filtered views and copies of the task frame share the same layout, so every
+    page and chart builder reuses the same schema object.
+    """
+    key = tuple(df.columns)
+    schema = _schemas.get(key)
+    if schema is None:
+        schema = ColumnSchema(key)
+        if len(_schemas) >= _SCHEMA_CACHE_SIZE:
+            _schemas.clear()
+        _schemas[key] = schema
+    return schema
+
+
+def get_column(df, col_name):
+    """
+    Get a column by its original name, even if it has a unique suffix.
+    Returns the column name with the suffix that exists in the DataFrame
+    (or col_name itself, which will cause a KeyError if it doesn't exist).
+    """
+    return get_schema(df).get(col_name)
+
+
+def has_column(df, col_name):
+    """Check if a column exists by original name"""
+    return get_schema(df).has(col_name)
+
+
+def get_assignee_column(df):
+    """Physical assignee column ("Assigned To", "Person" or "assignee"), or None"""
+    return get_schema(df).assignee
+
+
+def get_transcript_column(df):
+    """Physical Transcript ID column (see TRANSCRIPT_COLUMN_NAMES), or None"""
+    return get_schema(df).transcript
+
+
+def is_hidden_column(col_name):
+    """True for sheet columns the app never shows"""
+    return col_name in COLUMNS_TO_HIDE or "confidence" in col_name.lower()
+
+
+def is_frame_slot(slot):
+    """True if the slot-th kept sheet column belongs in the task frame"""
+    return slot < MAIN_COLUMN_COUNT or slot == PRIORITY_POSITION
+
+
+def _normalized_categorical(values, normalize, categories=None):
+    """
+    Categorical of normalize(value) computed on the distinct values only.
+
+    Sheet columns like Status, Project and Person have a handful of distinct
+    values, so the string work is O(unique) instead of O(rows).
+    """
+    codes, uniques = pd.factorize(values)
+    mapped = [normalize(str(value)) for value in uniques]
+    if categories is None:
+        categories = list(dict.fromkeys(m for m in mapped if m))
+    lookup = {category: i for i, category in enumerate(categories)}
+    # Extra trailing -1 so missing values (code -1) stay missing
+    remap = np.array([lookup.get(m, -1) for m in mapped] + [-1], dtype=np.int64)
+    return pd.Categorical.from_codes(remap[codes], categories=categories)
+
+
+def parse_task_dates(values):
+    """
+    Vectorized, format-tolerant date parsing (ISO, US MM/DD/YYYY, then anything else)
+
+    Returns:
+        datetime64 Series (NaT where the cell is empty or unparseable)
+    """
+    codes, uniques = pd.factorize(pd.Series(values).astype(str).str.strip())
+    text = pd.Series(uniques, dtype=object)
+
+    parsed = pd.to_datetime(text, format="%Y-%m-%d", errors="coerce")
+    for fmt in ("%m/%d/%Y", "mixed"):
+        missing = parsed.isna() & text.ne("")
+        if not missing.any():
+            break
+        parsed[missing] = pd.to_datetime(text[missing], format=fmt, errors="coerce")
+
+    result = parsed.to_numpy()[codes]
+    result[codes < 0] = np.datetime64("NaT")
+    return pd.Series(result, dtype="datetime64[ns]")
+
+
+def parse_progress(values):
+    """Numeric Progress % (0-100) from strings like "50%", blank -> NaN"""
+    text = pd.Series(values).astype(str).str.replace("%", "", regex=False).str.strip()
+    return pd.to_numeric(text, errors="coerce")
+
+
+# Normalizers for the categorical text columns of the typed frame
+_TEXT_NORMALIZERS = {
+    "status_text": lambda s: s.strip().lower(),
+    "project": lambda s: s.strip(),
+    "project_key": lambda s: s.strip().lower(),
+    "person": lambda s: s.strip(),
+    "person_key": lambda s: s.strip().lower(),
+    "priority": lambda s: s.strip().title(),
+}
+
+
+def typed_column_sources(df):
+    """{typed column: physical task column it is parsed from (None if missing)}"""
+    schema = get_schema(df)
+    status, project = schema.find("Status"), schema.find("Project")
+    return {
+        "status": status,
+        "status_text": status,
+        "project": project,
+        "project_key": project,
+        "person": schema.assignee,
+        "person_key": schema.assignee,
+        "priority": schema.find("Priority"),
+        "date_assigned": schema.find("Date Assigned"),
+        "due_date": schema.find("Due Date"),
+        "progress": schema.find("Progress %"),
+    }
+
+
+def _typed_column(name, values, n):
+    """One typed column parsed from its source column's values (None if the column is missing)"""
+    if name in ("date_assigned", "due_date"):
+        return parse_task_dates(values) if values is not None else pd.Series(pd.NaT, index=range(n))
+    if name == "progress":
+        return parse_progress(values) if values is not None else pd.Series(np.nan, index=range(n))
+    if name == "status":
+        if values is None:
+            return pd.Categorical([None] * n, categories=STATUS_CATEGORIES)
+        return _normalized_categorical(
+            values, lambda s: classify_status(s.strip().lower()), STATUS_CATEGORIES
+        )
+    if values is None:
+        return pd.Categorical([None] * n, categories=[])
+    return _normalized_categorical(values, _TEXT_NORMALIZERS[name])
+
+
+def build_typed_frame(df, base=None, changed_columns=None):
+    """
+    Build the typed companion of a normalized task frame.
+
+    Args:
+        df: Normalized task frame (string columns, ___N suffixes)
+        base: Typed frame of a previous version of df with the same rows; only
+            the typed columns parsed from changed_columns are rebuilt
+        changed_columns: Task columns that differ between that version and df
+
+    Returns:
+        DataFrame with TYPED_COLUMNS and the same index as df
+    """
+    n = len(df)
+    sources = typed_column_sources(df)
+    names = TYPED_COLUMNS
+    if base is not None:
+        changed = set(changed_columns) if changed_columns is not None else set()
+        names = [name for name in TYPED_COLUMNS if sources[name] is not None and sources[name] in changed]
+        if not names:
+            return base
+
+    columns = {
+        name: _typed_column(name, df[sources[name]].to_numpy() if sources[name] is not None else None, n)
+        for name in names
+    }
+    if base is None:
+        typed = pd.DataFrame(columns)
+        typed.index = df.index
+        return typed
+
+    typed = base.copy()
+    for name, values in columns.items():
+        typed[name] = values.to_numpy() if isinstance(values, pd.Series) else values
+    return typed
@@ -0,0 +1,110 @@
+"""
+Access Scope Engine for SBS Dashboard
+Each role's visibility rule is compiled into the set of visible sheet rows once
+per data version, and shared by every page and session for that user
+"""
+
+import re
+import threading
+
+import numpy as np
+
+from task_data import get_data_version, get_task_snapshot
+from task_schema import ASSIGNEE_COLUMN_NAMES
+
+# Visibility rules
+SCOPE_ALL = "all"    # Admins: every task
+SCOPE_TEAM = "team"  # Team lead: tasks of everyone on TEAM_MEMBERS
+SCOPE_OWN = "own"    # Everyone else: tasks assigned to them
+
+# Assignee name fragments the team lead can see (lowercase)
+TEAM_MEMBERS = ["jess", "megan", "justin"]
+
+# Compiled rows per (scope, assignee pattern) -> (assignee column version, rows).
+# Only the latest version is kept, so memory is one row set per active rule.
+_compiled_scopes = {}
+_compiled_scopes_lock = threading.Lock()
+
+
+def is_admin_user(user_name):
+    """True for admins (Anna Ciboro and Tea), who see every task"""
+    user_lower = (user_name or "").lower()
+    return ("anna" in user_lower and "ciboro" in user_lower) or "tea" in user_lower or "téa" in user_lower or "tēa" in user_lower
+
+
+def is_team_lead(user_name):
+    """True for Jess, who sees her team's tasks"""
+    return "jess" in (user_name or "").lower()
+
+
+def user_scope(user_name):
+    """Default visibility rule for a user: SCOPE_ALL, SCOPE_TEAM or SCOPE_OWN"""
+    if is_admin_user(user_name):
+        return SCOPE_ALL
+    if is_team_lead(user_name):
+        return SCOPE_TEAM
+    return SCOPE_OWN
+
+
+def _assignee_pattern(user_name, scope):
+    """Compiled assignee match for a scope (None when every row is visible)"""
+    if scope == SCOPE_ALL:
+        return None
+    if scope == SCOPE_TEAM:
+        return re.compile("|".join(TEAM_MEMBERS))
+    return re.compile(re.escape((user_name or "").lower()))
+
+
+def _compile_scope_rows(snapshot, pattern):
+    """Sheet rows of snapshot whose assignee matches pattern (matched once per distinct name)"""
+    person = snapshot.typed["person_key"]
+    lookup = np.array(
+        [bool(pattern.search(str(name))) for name in person.cat.categories] + [False], dtype=bool
+    )
+    # Missing assignees have code -1, which picks the trailing False
+    return snapshot.frame.index[lookup[person.cat.codes.to_numpy()]]
+
+
+def scope_rows(user_name, scope):
+    """
+    Sheet rows of the current snapshot visible to user_name under scope.
+
+    Compiled once per version of the assignee column and cached process-wide,
+    so every page (and every session of the same user) reuses the same rows.
+
+    Returns:
+        Index of sheet row numbers, or None when every row is visible
+    """
+    pattern = _assignee_pattern(user_name, scope)
+    if pattern is None:
+        return None
+    snapshot = get_task_snapshot()
+    version = get_data_version(ASSIGNEE_COLUMN_NAMES, snapshot=snapshot)
+    key = (scope, pattern.pattern)
+    with _compiled_scopes_lock:
+        cached = _compiled_scopes.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    rows = _compile_scope_rows(snapshot, pattern)
+    with _compiled_scopes_lock:
+        _compiled_scopes[key] = (version, rows)
+    return rows
+
+
+def apply_scope(df, user_name, scope=None):
+    """
+    Rows of df visible to user_name.
+
+    Args:
+        df: Task frame or a filtered view of it (rows keyed by sheet row)
+        user_name: User's full name
+        scope: Visibility rule (defaults to user_scope(user_name))
+
+    Returns:
+        df itself for SCOPE_ALL, otherwise the visible subset of df
+    """
+    rows = scope_rows(user_name, scope or user_scope(user_name))
+    if rows is None:
+        return df
+    return df[df.index.isin(rows)]
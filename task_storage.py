@@ -0,0 +1,353 @@
+"""
+Task Storage Backends for SBS Dashboard
+The task sheet lives in Google Sheets in production. A local SQLite file with the same
+worksheet semantics can stand in for it (offline development, load tests, benchmarks).
+
+Select the backend with the "task_storage" secret:
+    task_storage = "google_sheets"   # default
+    task_storage = "sqlite"
+    task_storage_path = "/path/to/otter_tasks.sqlite3"   # optional
+
+Seed the local backend from a CSV export of the sheet:
+    python task_storage.py import tasks.csv [path/to/otter_tasks.sqlite3]
+"""
+
+import csv
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+from datetime import datetime, timezone
+
+STORAGE_GOOGLE_SHEETS = "google_sheets"
+STORAGE_SQLITE = "sqlite"
+STORAGE_BACKENDS = [STORAGE_GOOGLE_SHEETS, STORAGE_SQLITE]
+
+# Default location of the local stand-in database
+DEFAULT_SQLITE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), ".local_tasks", "otter_tasks.sqlite3"
+)
+
+# Grid size reported by a local worksheet at minimum (a new Google Sheet is 26 x 1000)
+MIN_COL_COUNT = 26
+MIN_ROW_COUNT = 1000
+
+_A1_CELL = re.compile(r"^([A-Za-z]*)(\d*)$")
+
+
+def _config(secrets, key, default):
+    """Read one setting from a secrets mapping, falling back to default"""
+    try:
+        return secrets.get(key, default)
+    except Exception:
+        return default
+
+
+def get_storage_backend(secrets):
+    """Return the configured storage backend name"""
+    backend = str(_config(secrets, "task_storage", STORAGE_GOOGLE_SHEETS)).strip().lower()
+    if backend not in STORAGE_BACKENDS:
+        raise ValueError(f"Unknown task_storage '{backend}' (expected one of: {', '.join(STORAGE_BACKENDS)})")
+    return backend
+
+
+def open_worksheet(secrets, sheet_id, worksheet_name):
+    """
+    Open the task worksheet on the configured backend.
+
+    Both backends return an object with the gspread Worksheet methods the app uses
+    (get_all_values, row_values, batch_get, update, batch_update, append_row(s),
+    update_cell, clear) and a .spreadsheet with get_lastUpdateTime().
+
+    Args:
+        secrets: Streamlit secrets (or any mapping with the same keys)
+        sheet_id: Google Sheet ID (ignored by the local backend)
+        worksheet_name: Worksheet / tab name
+    """
+    if get_storage_backend(secrets) == STORAGE_SQLITE:
+        return get_sqlite_worksheet(_config(secrets, "task_storage_path", DEFAULT_SQLITE_PATH), worksheet_name)
+
+    from sheets_client import get_sheets_pool
+    return get_sheets_pool(secrets["gcp_service_account"]).worksheet(sheet_id, worksheet_name)
+
+
+def _column_index(letters):
+    """Convert A1 column letters to a 1-based index (A -> 1, AA -> 27)"""
+    index = 0
+    for ch in letters.upper():
+        index = index * 26 + ord(ch) - 64
+    return index
+
+
+def parse_a1_range(range_name):
+    """
+    Parse an A1 range into 1-based (first_row, first_col, last_row, last_col).
+    Open ends are None: "A2:J" -> (2, 1, None, 10), "1:1" -> (1, None, 1, None).
+    """
+    parts = range_name.split("!")[-1].split(":")
+    bounds = []
+    for part in parts:
+        match = _A1_CELL.match(part.strip())
+        if not match:
+            raise ValueError(f"Invalid A1 range: {range_name}")
+        letters, digits = match.groups()
+        bounds.append((int(digits) if digits else None, _column_index(letters) if letters else None))
+    (first_row, first_col), (last_row, last_col) = bounds[0], bounds[-1]
+    return first_row, first_col, last_row, last_col
+
+
+def _trim(rows):
+    """Drop trailing empty cells and trailing empty rows, like the Sheets API does"""
+    trimmed = []
+    for row in rows:
+        end = len(row)
+        while end > 0 and row[end - 1] == "":
+            end -= 1
+        trimmed.append(row[:end])
+    while trimmed and not trimmed[-1]:
+        trimmed.pop()
+    return trimmed
+
+
+def _cell_text(value):
+    """Store every cell as the string Sheets would return for it"""
+    if value is None:
+        return ""
+    try:
+        if value != value:  # NaN / NA
+            return ""
+    except (TypeError, ValueError):
+        return ""
+    return str(value)
+
+
+class LocalSpreadsheet:
+    """Spreadsheet-level metadata of a local worksheet"""
+
+    def __init__(self, worksheet):
+        self._worksheet = worksheet
+        self.title = worksheet.title
+        self.id = worksheet.path
+
+    def get_lastUpdateTime(self):
+        """Timestamp of the last write (changes on every write, like Drive's modifiedTime)"""
+        return self._worksheet.last_update_time()
+
+
+class SQLiteWorksheet:
+    """
+    A worksheet stored in SQLite, one table row per non-empty sheet row (cells as a JSON list).
+
+    Reads and writes follow Google Sheets semantics: values are strings, reads
+    drop trailing empty cells/rows, appends go after the last non-empty row, and
+    every write changes the spreadsheet's last update time.
+    """
+
+    def __init__(self, path, title):
+        self.path = path
+        self.title = title
+        self._lock = threading.RLock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sheet_rows ("
+            " worksheet TEXT NOT NULL, row INTEGER NOT NULL, cells TEXT NOT NULL,"
+            " PRIMARY KEY (worksheet, row))"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS worksheets (name TEXT PRIMARY KEY, updated_at TEXT NOT NULL)"
+        )
+        self.spreadsheet = LocalSpreadsheet(self)
+
+    # --- internals -----------------------------------------------------------------
+
+    def _rows(self, first_row=1, last_row=None):
+        """{row_number: cells} for stored rows in [first_row, last_row]"""
+        query = "SELECT row, cells FROM sheet_rows WHERE worksheet = ? AND row >= ?"
+        params = [self.title, first_row]
+        if last_row is not None:
+            query += " AND row <= ?"
+            params.append(last_row)
+        with self._lock:
+            return {row: json.loads(cells) for row, cells in self._conn.execute(query, params)}
+
+    def _last_row(self):
+        with self._lock:
+            (last,) = self._conn.execute(
+                "SELECT COALESCE(MAX(row), 0) FROM sheet_rows WHERE worksheet = ?", (self.title,)
+            ).fetchone()
+        return last
+
+    def _width(self):
+        with self._lock:
+            (width,) = self._conn.execute(
+                "SELECT COALESCE(MAX(json_array_length(cells)), 0) FROM sheet_rows WHERE worksheet = ?",
+                (self.title,),
+            ).fetchone()
+        return width
+
+    def _grid(self, first_row, first_col, last_row, last_col):
+        """Values of a range as Sheets returns them (trimmed lists of strings)"""
+        first_row = first_row or 1
+        first_col = first_col or 1
+        stored = self._rows(first_row, last_row)
+        last_row = last_row or max(stored, default=first_row - 1)
+        rows = []
+        for row in range(first_row, last_row + 1):
+            cells = stored.get(row, [])
+            end = last_col if last_col is not None else len(cells)
+            rows.append(cells[first_col - 1:end])
+        return _trim(rows)
+
+    def _write_cells(self, first_row, first_col, values):
+        """Write a 2D block of values with its top-left cell at (first_row, first_col)"""
+        values = [list(row) for row in values]
+        if not values:
+            return
+        stored = self._rows(first_row, first_row + len(values) - 1)
+        updates, emptied = [], []
+        for offset, row_values in enumerate(values):
+            row = first_row + offset
+            cells = stored.get(row, [])
+            end = first_col - 1 + len(row_values)
+            if len(cells) < end:
+                cells = cells + [""] * (end - len(cells))
+            cells[first_col - 1:end] = [_cell_text(value) for value in row_values]
+            while cells and cells[-1] == "":
+                cells.pop()
+            if cells:
+                updates.append((self.title, row, json.dumps(cells)))
+            else:
+                emptied.append((self.title, row))
+        self._conn.executemany(
+            "INSERT INTO sheet_rows (worksheet, row, cells) VALUES (?, ?, ?)"
+            " ON CONFLICT (worksheet, row) DO UPDATE SET cells = excluded.cells",
+            updates,
+        )
+        self._conn.executemany("DELETE FROM sheet_rows WHERE worksheet = ? AND row = ?", emptied)
+
+    def _touch(self):
+        """Record a write (the local equivalent of Drive's modifiedTime)"""
+        now = datetime.now(timezone.utc).isoformat(timespec="microseconds")
+        self._conn.execute(
+            "INSERT INTO worksheets (name, updated_at) VALUES (?, ?)"
+            " ON CONFLICT (name) DO UPDATE SET updated_at = excluded.updated_at",
+            (self.title, now),
+        )
+
+    def _transaction(self, write):
+        """Run write() atomically and bump the update time"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = write()
+                self._touch()
+                self._conn.execute("COMMIT")
+                return result
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    # --- gspread Worksheet API subset ---------------------------------------------
+
+    @property
+    def col_count(self):
+        return max(self._width(), MIN_COL_COUNT)
+
+    @property
+    def row_count(self):
+        return max(self._last_row(), MIN_ROW_COUNT)
+
+    def last_update_time(self):
+        with self._lock:
+            found = self._conn.execute(
+                "SELECT updated_at FROM worksheets WHERE name = ?", (self.title,)
+            ).fetchone()
+        return found[0] if found else None
+
+    def get_all_values(self):
+        """All values, padded to a rectangle like worksheet.get_all_values()"""
+        rows = self._grid(1, 1, None, None)
+        width = max((len(row) for row in rows), default=0)
+        return [row + [""] * (width - len(row)) for row in rows]
+
+    def row_values(self, row):
+        grid = self._grid(row, 1, row, None)
+        return grid[0] if grid else []
+
+    def get(self, range_name):
+        return self._grid(*parse_a1_range(range_name))
+
+    def get_values(self, range_name=None):
+        return self.get(range_name) if range_name else self.get_all_values()
+
+    def batch_get(self, ranges):
+        return [self.get(range_name) for range_name in ranges]
+
+    def update(self, values=None, range_name=None, **kwargs):
+        """Write values starting at the top-left cell of range_name (default A1)"""
+        # Accept the legacy (range_name, values) argument order, like gspread does
+        if isinstance(values, str):
+            values, range_name = range_name, values
+        first_row, first_col, _, _ = parse_a1_range(range_name or "A1")
+        self._transaction(lambda: self._write_cells(first_row or 1, first_col or 1, values))
+
+    def batch_update(self, data, **kwargs):
+        """Write several {"range": ..., "values": ...} blocks in one transaction"""
+        def write():
+            for item in data:
+                first_row, first_col, _, _ = parse_a1_range(item["range"])
+                self._write_cells(first_row or 1, first_col or 1, item["values"])
+        self._transaction(write)
+
+    def update_cell(self, row, col, value):
+        self._transaction(lambda: self._write_cells(row, col, [[value]]))
+
+    def append_rows(self, values, **kwargs):
+        """Append rows after the last non-empty row"""
+        self._transaction(lambda: self._write_cells(self._last_row() + 1, 1, values))
+
+    def append_row(self, values, **kwargs):
+        self.append_rows([values], **kwargs)
+
+    def clear(self):
+        self._transaction(lambda: self._conn.execute(
+            "DELETE FROM sheet_rows WHERE worksheet = ?", (self.title,)
+        ))
+
+
+_worksheets = {}
+_worksheets_lock = threading.Lock()
+
+
+def get_sqlite_worksheet(path, worksheet_name):
+    """Return the process-wide local worksheet for (path, worksheet_name), opening it once"""
+    key = (os.path.abspath(path), worksheet_name)
+    with _worksheets_lock:
+        ws = _worksheets.get(key)
+        if ws is None:
+            ws = SQLiteWorksheet(key[0], worksheet_name)
+            _worksheets[key] = ws
+        return ws
+
+
+def import_csv(ws, csv_path):
+    """Replace the worksheet's contents with a CSV file (header row first)"""
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        values = list(csv.reader(f))
+    ws.clear()
+    ws.update(values, "A1")
+    return len(values)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or sys.argv[1] != "import":
+        print("Usage: python task_storage.py import tasks.csv [path/to/otter_tasks.sqlite3]")
+        sys.exit(1)
+    target = sys.argv[3] if len(sys.argv) > 3 else DEFAULT_SQLITE_PATH
+    count = import_csv(get_sqlite_worksheet(target, "Otter_Tasks"), sys.argv[2])
+    print(f"✅ Imported {count} rows into {target}")
@@ -0,0 +1,269 @@
+"""
+Write-Behind Edit Queue for SBS Dashboard
+Saves return as soon as their edits are queued; a background thread coalesces
+queued edits and flushes them to the sheet, retrying failed writes
+"""
+
+import threading
+import time
+
+# Edits queued within this window of each other go out in the same flush
+COALESCE_SECONDS = 1.5
+
+# A steady stream of edits is still flushed at least this often
+MAX_COALESCE_SECONDS = 10.0
+
+# Failed flushes are retried with exponential backoff, then given up on
+MAX_FLUSH_ATTEMPTS = 5
+RETRY_BASE_SECONDS = 2.0
+RETRY_MAX_SECONDS = 60.0
+
+
+class WriteBatch:
+    """
+    Edits waiting to be written to the sheet.
+
+    cells maps (sheet_row, sheet_col) (both 1-based) to the new cell value, so a
+    cell edited twice holds only its latest value. rows holds new rows to append,
+    in sheet column order. events maps a cell to the records that describe its
+    edits (e.g. status changes), oldest first; they are handed over with
+    take_events() once the cells were written, and dropped with the batch otherwise.
+
+    Every cell and row counts the failed flushes it was part of; a newer edit of
+    a cell starts its count over.
+    """
+
+    def __init__(self, cells=None, rows=None, events=None):
+        self.cells = dict(cells or {})
+        self.rows = [list(row) for row in rows or []]
+        self.events = {cell: list(records) for cell, records in (events or {}).items()}
+        self.cell_attempts = dict.fromkeys(self.cells, 0)
+        self.row_attempts = [0] * len(self.rows)
+
+    def __len__(self):
+        return len(self.cells) + len(self.rows)
+
+    def merge(self, newer):
+        """Fold newer edits into this batch (the newer value wins for the same cell)"""
+        self.cells.update(newer.cells)
+        self.cell_attempts.update(newer.cell_attempts)
+        self.rows.extend(newer.rows)
+        self.row_attempts.extend(newer.row_attempts)
+        for cell, records in newer.events.items():
+            self.events.setdefault(cell, []).extend(records)
+
+    def copy(self):
+        batch = WriteBatch(self.cells, self.rows, self.events)
+        batch.cell_attempts = dict(self.cell_attempts)
+        batch.row_attempts = list(self.row_attempts)
+        return batch
+
+    def attempts(self):
+        """Most failed flushes any edit in the batch was part of"""
+        return max([*self.cell_attempts.values(), *self.row_attempts], default=0)
+
+    def record_failure(self):
+        """Count a failed flush against every edit in the batch"""
+        self.cell_attempts = {cell: n + 1 for cell, n in self.cell_attempts.items()}
+        self.row_attempts = [n + 1 for n in self.row_attempts]
+
+    def take_exhausted(self, max_attempts):
+        """Edits that failed max_attempts times, as their own batch (removed from this one)"""
+        exhausted = WriteBatch()
+        for cell, n in list(self.cell_attempts.items()):
+            if n >= max_attempts:
+                exhausted.cells[cell] = self.cells.pop(cell)
+                exhausted.cell_attempts[cell] = self.cell_attempts.pop(cell)
+                if cell in self.events:
+                    exhausted.events[cell] = self.events.pop(cell)
+        rows = list(zip(self.rows, self.row_attempts))
+        exhausted.rows = [row for row, n in rows if n >= max_attempts]
+        exhausted.row_attempts = [n for _, n in rows if n >= max_attempts]
+        self.rows = [row for row, n in rows if n < max_attempts]
+        self.row_attempts = [n for _, n in rows if n < max_attempts]
+        return exhausted
+
+    def mark_cells_written(self):
+        """Record that every cell in the batch reached the sheet"""
+        self.cells = {}
+        self.cell_attempts = {}
+
+    def take_events(self):
+        """Event records of the batch ({cell: [record, ...]}), removed from it"""
+        events, self.events = self.events, {}
+        return events
+
+    def mark_rows_written(self, count):
+        """Record that the first count rows were appended to the sheet"""
+        self.rows = self.rows[count:]
+        self.row_attempts = self.row_attempts[count:]
+
+
+class WriteBehindQueue:
+    """
+    Coalescing write-behind queue with a single flush thread.
+
+    submit() only records the edits. The flush thread waits until no new edits
+    arrived for coalesce_seconds (or max_coalesce_seconds passed since the first
+    one), then hands everything queued to flush_fn as one WriteBatch. flush_fn
+    marks what it wrote on the batch, so a failed flush is retried with only the
+    remainder, merged under any newer edits. Edits that were part of
+    max_attempts failed flushes are dropped and on_failure(batch, error) is
+    called with them; edits queued later keep their own count.
+    """
+
+    def __init__(self, flush_fn, on_failure=None, coalesce_seconds=COALESCE_SECONDS,
+                 max_coalesce_seconds=MAX_COALESCE_SECONDS, max_attempts=MAX_FLUSH_ATTEMPTS):
+        self._flush_fn = flush_fn
+        self._on_failure = on_failure
+        self._coalesce_seconds = coalesce_seconds
+        self._max_coalesce_seconds = max_coalesce_seconds
+        self._max_attempts = max_attempts
+
+        self._cond = threading.Condition()
+        self._pending = WriteBatch()
+        self._in_flight = None
+        self._first_queued_at = None
+        self._last_queued_at = None
+        self._retry_at = None
+        self._last_error = None
+        self._last_flush_at = 0.0
+        self._worker = None
+        self._stats = {"edits_queued": 0, "edits_coalesced": 0, "flushes": 0, "failed_flushes": 0}
+
+    def submit(self, cells=None, rows=None, events=None):
+        """
+        Queue cell edits and new rows for the next flush (returns immediately)
+
+        Args:
+            cells: {(sheet_row, sheet_col): value}
+            rows: New rows to append
+            events: {(sheet_row, sheet_col): record} describing some of the cell edits
+        """
+        batch = WriteBatch(cells, rows, {cell: [record] for cell, record in (events or {}).items()})
+        if not batch:
+            return
+        with self._cond:
+            coalesced = sum(1 for cell in batch.cells if cell in self._pending.cells)
+            self._pending.merge(batch)
+            now = time.monotonic()
+            if self._first_queued_at is None:
+                self._first_queued_at = now
+            self._last_queued_at = now
+            self._stats["edits_queued"] += len(batch)
+            self._stats["edits_coalesced"] += coalesced
+            self._ensure_worker()
+            self._cond.notify_all()
+
+    def pending(self):
+        """Everything not yet confirmed written (in flight first, then queued)"""
+        with self._cond:
+            batch = self._in_flight.copy() if self._in_flight is not None else WriteBatch()
+            batch.merge(self._pending)
+            return batch
+
+    def wait_idle(self, timeout=None):
+        """Block until every queued edit was flushed (or given up on). Returns True if idle."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._pending or self._in_flight is not None:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            return True
+
+    def status(self):
+        """
+        Queue state for the UI
+
+        Returns:
+            dict with pending_cells, pending_rows, flushing, attempts, last_error,
+            last_flush_at and the edits_queued/edits_coalesced/flushes/failed_flushes counters
+        """
+        with self._cond:
+            in_flight = self._in_flight or WriteBatch()
+            return {
+                "pending_cells": len(set(self._pending.cells) | set(in_flight.cells)),
+                "pending_rows": len(self._pending.rows) + len(in_flight.rows),
+                "flushing": self._in_flight is not None,
+                "attempts": max(self._pending.attempts(), in_flight.attempts()),
+                "last_error": self._last_error,
+                "last_flush_at": self._last_flush_at,
+                **self._stats,
+            }
+
+    def _ensure_worker(self):
+        """Start the flush thread on first use (caller holds the lock)"""
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name="sbs-task-writes", daemon=True)
+            self._worker.start()
+
+    def _next_flush_due(self):
+        """Monotonic time the queued edits should be flushed at (caller holds the lock)"""
+        due = min(
+            self._last_queued_at + self._coalesce_seconds,
+            self._first_queued_at + self._max_coalesce_seconds,
+        )
+        return max(due, self._retry_at) if self._retry_at is not None else due
+
+    def _take_batch(self):
+        """Wait for queued edits to settle, then move them in flight"""
+        with self._cond:
+            while True:
+                if not self._pending:
+                    self._cond.wait()
+                    continue
+                delay = self._next_flush_due() - time.monotonic()
+                if delay <= 0:
+                    break
+                self._cond.wait(delay)
+
+            batch, self._pending = self._pending, WriteBatch()
+            self._in_flight = batch
+            self._first_queued_at = self._last_queued_at = None
+            return batch
+
+    def _run(self):
+        """Thread target: flush batches forever"""
+        while True:
+            batch = self._take_batch()
+            try:
+                self._flush_fn(batch)
+                error = None
+            except Exception as e:
+                error = e
+
+            dropped = None
+            with self._cond:
+                self._in_flight = None
+                if error is None:
+                    self._retry_at = None
+                    self._last_error = None
+                    self._last_flush_at = time.time()
+                    self._stats["flushes"] += 1
+                else:
+                    self._last_error = str(error)
+                    self._stats["failed_flushes"] += 1
+                    # Give up only on edits that failed max_attempts times themselves
+                    batch.record_failure()
+                    dropped = batch.take_exhausted(self._max_attempts) or None
+                    if batch:
+                        # Retry what's left, with anything queued meanwhile taking precedence
+                        attempts = batch.attempts()
+                        batch.merge(self._pending)
+                        self._pending = batch
+                        now = time.monotonic()
+                        self._first_queued_at = self._first_queued_at or now
+                        self._last_queued_at = self._last_queued_at or now
+                        delay = RETRY_BASE_SECONDS * (2 ** (attempts - 1))
+                        self._retry_at = now + min(delay, RETRY_MAX_SECONDS)
+                    else:
+                        self._retry_at = None
+                self._cond.notify_all()
+
+            if dropped is not None and self._on_failure is not None:
+                try:
+                    self._on_failure(dropped, error)
+                except Exception as e:
+                    print(f"⚠️ Could not discard failed task edits: {e}")
@@ -0,0 +1,42 @@
+import os
+import sys
+import time
+
+import pytest
+
+# Tests import the app modules (task_data, pages.dashboard_page, ...) from the repo root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import task_data  # noqa: E402
+import task_events  # noqa: E402
+import task_scope  # noqa: E402
+from task_writes import WriteBehindQueue  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def task_store(tmp_path, monkeypatch):
+    """
+    Fresh process-wide task store per test: no snapshot left on disk, no
+    background refresh, and a write queue that holds edits instead of flushing
+    """
+    monkeypatch.setattr(task_data, "SNAPSHOT_DIR", str(tmp_path / "snapshot_cache"))
+    monkeypatch.setattr(task_data, "start_refresh_worker", lambda: None)
+    monkeypatch.setattr(task_events, "DEFAULT_EVENTS_PATH", str(tmp_path / "events"))
+    monkeypatch.setattr(task_scope, "_compiled_scopes", {})
+    task_data._get_task_store.clear()
+    store = task_data._get_task_store()
+    store["writes"] = WriteBehindQueue(lambda batch: None, coalesce_seconds=3600, max_coalesce_seconds=3600)
+    yield store
+    task_data._get_task_store.clear()
+
+
+@pytest.fixture
+def publish(task_store):
+    """Publish a task frame as the store's next snapshot (as a refresh would)"""
+    def publish(frame, sheet_columns=None):
+        current = task_store["snapshot"]
+        sheet_columns = sheet_columns or {col: i for i, col in enumerate(frame.columns)}
+        version = current.version + 1 if current is not None else 1
+        task_store["snapshot"] = task_data._derive_snapshot(current, frame, version, time.time(), sheet_columns)
+        return task_store["snapshot"]
+    return publish
@@ -0,0 +1,37 @@
+import pandas as pd
+import pytest
+
+from charts import create_project_breakdown_chart
+
+
+def test_project_breakdown_counts_trimmed_lowercase_projects_with_blanks():
+    projects = ["Alpha", "alpha ", " ALPHA", "", "  ", None, "Beta", "beta"]
+    df = pd.DataFrame({"Task___0": ["t"] * len(projects), "Project___1": projects},
+                      index=pd.RangeIndex(2, 2 + len(projects), name="sheet_row"))
+
+    fig = create_project_breakdown_chart(df)
+
+    expected = df["Project___1"].str.lower().str.strip().value_counts()
+    assert dict(zip(fig.data[0].y, fig.data[0].x)) == {p.title(): n for p, n in expected.items()}
+    assert list(fig.data[0].x) == [3, 2, 2]
+
+
+def test_event_log_charts():
+    from charts import create_cycle_time_chart, create_throughput_chart
+    from task_events import get_event_log, status_change
+
+    assert create_throughput_chart() is None
+    assert create_cycle_time_chart() is None
+
+    now = pd.Timestamp.now().timestamp()
+    get_event_log().append([
+        status_change(2, "Open", "Working", project="alpha", task="T-1", ts=now - 2 * 86400),
+        status_change(2, "Working", "Done", project="alpha", task="T-1", ts=now - 60),
+        status_change(3, "Open", "Done", project="", ts=now - 60),
+    ])
+
+    throughput = create_throughput_chart()
+    assert dict(zip(throughput.data[0].y, throughput.data[0].x)) == {"Alpha": 1, "Unassigned": 1}
+    cycle = create_cycle_time_chart()
+    assert list(cycle.data[0].y) == ["Alpha"]
+    assert cycle.data[0].x[0] == pytest.approx(2.0, abs=0.01)
@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+
+from edit_merge import changed_cell_mask, dirty_rows, merge_edits, row_fingerprints
+
+INDEX = pd.RangeIndex(2, 5, name="sheet_row")
+
+
+def _source():
+    return pd.DataFrame({
+        "Task___0": ["Write brief", "Call client", "Send invoice"],
+        "Status___1": ["Open", "Working", None],
+        "Notes___2": ["", "call Tue", "n/a"],
+    }, index=INDEX)
+
+
+def _shown(source):
+    """Editor frame: display column names, a decorated status and a display-only column"""
+    return pd.DataFrame({
+        "Task": source["Task___0"],
+        "Status": source["Status___1"].map(lambda s: f"● {s}" if s else s),
+        "Age": ["1d", "2d", "3d"],
+    }, index=source.index)
+
+
+MAPPING = {"Task": "Task___0", "Status": "Status___1"}
+TRANSFORMS = {"Status": lambda value: value.removeprefix("● ")}
+
+
+def test_changed_cell_mask_compares_cells_as_text():
+    before = pd.DataFrame({"a": ["x", None, ""], "b": ["1", "2", np.nan]}, index=INDEX)
+    edited = pd.DataFrame({"a": ["x", "", np.nan], "b": ["1", 3, None]}, index=INDEX)
+
+    mask = changed_cell_mask(before, edited)
+
+    assert mask.to_dict("list") == {"a": [False, False, False], "b": [False, True, False]}
+
+
+def test_changed_cell_mask_treats_missing_rows_and_columns_as_unchanged():
+    before = pd.DataFrame({"a": ["x", "y", "z"], "b": ["1", "2", "3"]}, index=INDEX)
+    edited = pd.DataFrame({"a": ["y", "X"], "extra": ["?", "?"]}, index=[3, 2])
+
+    mask = changed_cell_mask(before, edited)
+
+    assert mask.index.equals(before.index) and list(mask.columns) == ["a", "b"]
+    assert mask["a"].tolist() == [True, False, False]
+    assert not mask["b"].any()
+
+
+def test_merge_edits_applies_only_changed_cells():
+    source = _source()
+    before = _shown(source)
+    edited = before.copy()
+    edited.at[3, "Status"] = "● Done"
+    edited.at[3, "Age"] = "9d"            # not a source column
+
+    delta = merge_edits(source, before, edited, MAPPING, TRANSFORMS)
+
+    assert delta.index.tolist() == [3]
+    assert delta.loc[3].to_dict() == {"Task___0": "Call client", "Status___1": "Done", "Notes___2": "call Tue"}
+    # The source frame itself is untouched
+    assert source.at[3, "Status___1"] == "Working"
+
+
+def test_merge_edits_keeps_unchanged_cells_of_edited_rows():
+    source = _source()
+    before = _shown(source)
+    edited = before.copy()
+    edited.at[4, "Task"] = "Send final invoice"
+    edited.at[2, "Status"] = "● Open"     # same value re-entered
+
+    delta = merge_edits(source, before, edited, MAPPING, TRANSFORMS)
+
+    assert delta.index.tolist() == [4]
+    assert delta.at[4, "Task___0"] == "Send final invoice"
+    assert delta.at[4, "Status___1"] is None
+
+
+def test_merge_edits_with_nothing_changed_is_empty():
+    source = _source()
+    before = _shown(source)
+
+    delta = merge_edits(source, before, before.fillna(""), MAPPING, TRANSFORMS)
+
+    assert delta.empty
+    assert list(delta.columns) == list(source.columns)
+
+
+def test_merge_edits_matches_rows_by_key_not_position():
+    source = _source()
+    before = _shown(source).loc[[4, 2]]
+    edited = before.iloc[::-1].copy()     # editor returned the rows re-sorted
+    edited.at[2, "Task"] = "Write the brief"
+
+    delta = merge_edits(source, before, edited, MAPPING)
+
+    assert delta["Task___0"].to_dict() == {2: "Write the brief"}
+
+
+def test_dirty_rows_against_fingerprints_of_the_built_grid():
+    shown = pd.DataFrame({"Task": ["a", "b", "c"], "Status": ["Open", None, "Done"]}, index=[2, 3, 4])
+    hashes = row_fingerprints(shown)
+
+    assert dirty_rows(hashes, shown.fillna("")).empty
+
+    edited = shown.drop(index=4)
+    edited.at[3, "Status"] = "Working"
+    edited.loc[9] = ["new", "Open"]
+
+    assert dirty_rows(hashes, edited).tolist() == [3, 4, 9]
@@ -0,0 +1,27 @@
+import pandas as pd
+
+from pages.dashboard_page import compute_executive_metrics
+
+
+def test_overdue_counts_only_assigned_tasks():
+    df = pd.DataFrame({
+        "Task": ["a", "b", "c", "d", "e"],
+        "Status": ["Open", "Working", "Done", "Open", "Open"],
+        "Assigned To": ["Ann", "", "Bob", "Bob", None],
+        "Due Date": ["2020-01-01", "2020-01-01", "2020-01-01", "2099-01-01", "2020-02-01"],
+    }, index=range(2, 7))
+
+    metrics = compute_executive_metrics(df)
+
+    # Only "a": "b" and "e" are unassigned, "c" is done, "d" isn't due yet
+    assert metrics["overdue_tasks"] == 1
+
+
+def test_overdue_counts_every_task_without_assignee_column():
+    df = pd.DataFrame({
+        "Task": ["a", "b"],
+        "Status": ["Open", "Done"],
+        "Due Date": ["2020-01-01", "2020-01-01"],
+    }, index=range(2, 4))
+
+    assert compute_executive_metrics(df)["overdue_tasks"] == 1
@@ -0,0 +1,81 @@
+import random
+
+import numpy as np
+import pandas as pd
+
+from sheet_sync import cell_ranges, column_letter, frame_cell_changes
+from task_storage import SQLiteWorksheet
+
+
+def _frame():
+    return pd.DataFrame({
+        "Task___0": ["Write brief", "Call client", "Send invoice"],
+        "Status___1": ["Open", "Open", None],
+        "Progress___2": ["10", "", "50"],
+    }, index=pd.RangeIndex(2, 5, name="sheet_row"))
+
+
+SHEET_COLUMNS = {"Task___0": 0, "Status___1": 3, "Progress___2": 4}
+
+
+def test_column_letter():
+    assert [column_letter(i) for i in (1, 26, 27, 52, 703)] == ["A", "Z", "AA", "AZ", "AAA"]
+
+
+def test_frame_cell_changes_in_sheet_coordinates():
+    base = _frame()
+    edited = base.copy()
+    edited.at[3, "Status___1"] = "Done"
+    edited.at[4, "Progress___2"] = "75"
+
+    assert frame_cell_changes(base, edited, SHEET_COLUMNS) == {(3, 4): "Done", (4, 5): "75"}
+
+
+def test_frame_cell_changes_ignores_blank_equivalents_and_unknown_columns():
+    base = _frame()
+    edited = base.copy()
+    edited.at[4, "Status___1"] = ""          # None -> "" is not a change
+    edited["Progress___2"] = edited["Progress___2"].replace("", np.nan)
+    edited["Notes"] = "new"                  # not a sheet column
+
+    assert frame_cell_changes(base, edited, SHEET_COLUMNS) == {}
+
+
+def test_frame_cell_changes_matches_rows_by_sheet_row():
+    base = _frame()
+    subset = base.loc[[4, 2]].copy()
+    subset.at[4, "Task___0"] = "Send final invoice"
+    # A row the base doesn't have is ignored
+    extra = pd.DataFrame({"Task___0": ["New"]}, index=[9])
+
+    changes = frame_cell_changes(base, pd.concat([subset, extra]), SHEET_COLUMNS)
+    assert changes == {(4, 1): "Send final invoice"}
+
+
+def test_cell_ranges_stack_runs_into_rectangles():
+    changes = {
+        (2, 2): "a", (2, 3): "b", (3, 2): "c", (3, 3): "d",   # B2:C3
+        (3, 5): "e",                                          # E3
+        (5, 2): "f", (5, 3): "g",                             # B5:C5 (not adjacent to B3)
+    }
+    assert cell_ranges(changes) == [
+        {"range": "B2:C3", "values": [["a", "b"], ["c", "d"]]},
+        {"range": "E3", "values": [["e"]]},
+        {"range": "B5:C5", "values": [["f", "g"]]},
+    ]
+
+
+def test_cell_ranges_write_exactly_the_changed_cells(tmp_path):
+    rng = random.Random(7)
+    ws = SQLiteWorksheet(str(tmp_path / "tasks.sqlite3"), "Otter_Tasks")
+    for _ in range(50):
+        grid = [[f"{r}-{c}" for c in range(1, 13)] for r in range(1, 41)]
+        ws.clear()
+        ws.update(grid, "A1")
+
+        changes = {(rng.randint(1, 40), rng.randint(1, 12)): f"x{i}" for i in range(rng.randint(1, 60))}
+        ws.batch_update(cell_ranges(changes))
+
+        for (row, col), value in changes.items():
+            grid[row - 1][col - 1] = value
+        assert ws.get_all_values() == grid
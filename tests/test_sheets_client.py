@@ -0,0 +1,180 @@
+import threading
+import time
+
+import gspread
+import pytest
+import requests
+
+import sheets_client
+from sheets_client import MAX_RETRIES, SheetsClientPool, SingleFlight, TokenBucket
+
+
+class _Clock:
+    """Fake monotonic clock whose sleep() just advances time"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class _Credentials:
+    valid = True
+    expiry = None
+
+    @classmethod
+    def from_service_account_info(cls, info, scopes=None):
+        return cls()
+
+    def refresh(self, request):
+        pass
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    # Stands in for the time module inside sheets_client only
+    monkeypatch.setattr(sheets_client, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def pool(monkeypatch, clock):
+    monkeypatch.setattr(sheets_client, "Credentials", _Credentials)
+    monkeypatch.setattr(SheetsClientPool, "_ensure_token", lambda self: None)
+    monkeypatch.setattr(sheets_client.random, "uniform", lambda low, high: 0.0)
+    return SheetsClientPool({"client_email": "test@example.com"})
+
+
+def _api_error(status):
+    response = requests.Response()
+    response.status_code = status
+    response._content = b'{"error": {"code": %d, "message": "quota", "status": "x"}}' % status
+    return gspread.exceptions.APIError(response)
+
+
+def _failing(errors, result="ok"):
+    """Callable raising each error in turn, then returning result; counts its calls"""
+    errors = list(errors)
+    calls = []
+
+    def fn():
+        calls.append(1)
+        if errors:
+            raise errors.pop(0)
+        return result
+    return fn, calls
+
+
+def test_token_bucket_allows_a_burst_then_paces_calls(clock):
+    bucket = TokenBucket(rate_per_minute=60, burst=3)
+
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.acquire() == pytest.approx(1.0)
+    clock.now += 2.5
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == pytest.approx(0.5)
+
+
+def test_token_bucket_drain_makes_the_next_caller_wait(clock):
+    bucket = TokenBucket(rate_per_minute=120, burst=10)
+    bucket.drain()
+    assert bucket.acquire() == pytest.approx(0.5)
+
+
+def test_single_flight_shares_one_call():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "values"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("k", fetch)))
+    leader.start()
+    assert started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(flight.do("k", fetch))) for _ in range(3)]
+    for thread in followers:
+        thread.start()
+    # Give the followers time to find the call in flight before it finishes
+    time.sleep(0.2)
+    release.set()
+    for thread in [leader] + followers:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert sorted(results) == [("values", False)] + [("values", True)] * 3
+    # The key is released, so a later call runs again
+    assert flight.do("k", lambda: "fresh") == ("fresh", False)
+
+
+def test_single_flight_error_reaches_the_caller_and_frees_the_key():
+    flight = SingleFlight()
+    with pytest.raises(ValueError):
+        flight.do("k", lambda: (_ for _ in ()).throw(ValueError("boom")))
+    assert flight.do("k", lambda: 1) == (1, False)
+
+
+def test_rate_limited_calls_retry_with_exponential_backoff(pool, clock):
+    fn, calls = _failing([_api_error(429), _api_error(429)])
+
+    assert pool.call(fn, is_write=True) == "ok"
+
+    assert len(calls) == 3
+    assert clock.sleeps == [sheets_client.BACKOFF_BASE_SECONDS, 2 * sheets_client.BACKOFF_BASE_SECONDS]
+    assert pool.metrics()["rate_limited_retries"] == 2
+    assert pool.metrics()["calls_made"] == 3
+
+
+def test_rate_limit_gives_up_after_max_retries(pool):
+    fn, calls = _failing([_api_error(429)] * (MAX_RETRIES + 1))
+
+    with pytest.raises(gspread.exceptions.APIError):
+        pool.call(fn)
+
+    assert len(calls) == MAX_RETRIES + 1
+
+
+def test_other_api_errors_are_not_retried(pool):
+    fn, calls = _failing([_api_error(500)])
+
+    with pytest.raises(gspread.exceptions.APIError):
+        pool.call(fn, is_write=True)
+
+    assert len(calls) == 1
+    assert pool.metrics()["rate_limited_retries"] == 0
+
+
+def test_proxy_routes_reads_and_writes_through_the_pool(pool):
+    class Worksheet:
+        title = "Otter_Tasks"
+
+        def __init__(self):
+            self.writes = []
+
+        def row_values(self, row):
+            return ["Task"]
+
+        def update(self, values, range_name):
+            self.writes.append((range_name, values))
+
+    raw = Worksheet()
+    ws = sheets_client._ThrottledProxy(raw, pool)
+
+    assert ws.row_values(1) == ["Task"]
+    ws.update([["x"]], "A2")
+
+    assert ws.title == "Otter_Tasks"
+    assert raw.writes == [("A2", [["x"]])]
+    assert pool.metrics()["calls_made"] == 2
@@ -0,0 +1,169 @@
+import pandas as pd
+import pytest
+
+import task_data
+from task_events import get_event_log, status_change
+from task_writes import WriteBehindQueue
+
+
+class _Worksheet:
+    """Stand-in task worksheet recording batch_update calls (or failing them)"""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.updates = []
+
+    def batch_update(self, ranges):
+        if self.fail:
+            raise ConnectionError("Sheets unavailable")
+        self.updates.append(ranges)
+
+
+@pytest.fixture
+def worksheet(monkeypatch):
+    ws = _Worksheet()
+    monkeypatch.setattr(task_data, "open_task_worksheet", lambda: ws)
+    return ws
+
+
+def _queue(**kwargs):
+    return WriteBehindQueue(task_data._flush_task_edits, coalesce_seconds=0, max_coalesce_seconds=0, **kwargs)
+
+
+def _done(row, old="Open", new="Done"):
+    return {(row, 2): status_change(row, old, new, project="P", person="Ann")}
+
+
+def test_status_changes_are_logged_once_written(worksheet):
+    queue = _queue()
+    queue.submit({(2, 2): "Done"}, events=_done(2))
+    assert queue.wait_idle(timeout=5)
+
+    events = get_event_log().scan()
+    assert [(e["row"], e["from"], e["to"]) for e in events] == [(2, "open", "done")]
+    assert len(worksheet.updates) == 1
+
+
+def test_dropped_edits_leave_no_status_changes(worksheet):
+    worksheet.fail = True
+    dropped = []
+    queue = _queue(on_failure=lambda batch, error: dropped.append(batch), max_attempts=1)
+    queue.submit({(2, 2): "Done"}, events=_done(2))
+    assert queue.wait_idle(timeout=5)
+
+    assert len(dropped) == 1
+    assert get_event_log().scan() == []
+
+
+def test_coalesced_changes_log_the_net_transition(worksheet):
+    queue = WriteBehindQueue(task_data._flush_task_edits, coalesce_seconds=0.2, max_coalesce_seconds=5)
+    queue.submit({(2, 2): "Done", (3, 2): "Done"}, events={**_done(2), **_done(3)})
+    queue.submit({(2, 2): "Working", (3, 2): "Open"}, events={
+        **_done(2, "Done", "Working"), **_done(3, "Done", "Open"),
+    })
+    assert queue.wait_idle(timeout=5)
+
+    # Row 2 went open -> working in the sheet; row 3 ended where it began
+    events = get_event_log().scan()
+    assert [(e["row"], e["from"], e["to"]) for e in events] == [(2, "open", "working")]
+
+
+def test_update_google_sheet_queues_status_events(task_store, publish):
+    from pages import dashboard_page
+
+    publish(pd.DataFrame({"Task": ["a", "b"], "Status": ["Open", "Open"]}, index=[2, 3]))
+    dashboard_page.load_google_sheet()
+    edited = task_store["snapshot"].frame.copy()
+    edited["Status"] = ["Done", "open"]
+    assert dashboard_page.update_google_sheet(edited)
+
+    # Queued with the cells, not logged yet; "open" vs "Open" is not a status change
+    batch = task_store["writes"].pending()
+    assert list(batch.events) == [(2, 2)]
+    assert get_event_log().scan() == []
+
+
+def test_event_days_follow_daylight_saving(monkeypatch):
+    import task_events
+    from dateutil.tz import gettz
+
+    monkeypatch.setattr(task_events, "LOCAL_TZ", gettz("America/New_York"))
+    log = get_event_log()
+    # 00:30 local time on both sides of the 2026-03-08 DST change (UTC-5 before, UTC-4 after)
+    winter = pd.Timestamp("2026-03-01 00:30", tz="America/New_York").timestamp()
+    summer = pd.Timestamp("2026-03-12 00:30", tz="America/New_York").timestamp()
+    log.append([
+        status_change(2, "Open", "Done", ts=winter),
+        status_change(3, "Open", "Done", ts=summer),
+    ])
+
+    assert log.frame()["time"].tolist() == [pd.Timestamp("2026-03-01 00:30"), pd.Timestamp("2026-03-12 00:30")]
+    assert [e["row"] for e in log.scan(pd.Timestamp("2026-03-01"), pd.Timestamp("2026-03-02"))] == [2]
+    assert [e["row"] for e in log.scan(pd.Timestamp("2026-03-12"), pd.Timestamp("2026-03-13"))] == [3]
+
+    counts = task_events.daily_completions(log, days=12, today=pd.Timestamp("2026-03-12"))
+    assert counts[pd.Timestamp("2026-03-01")] == 1
+    assert counts[pd.Timestamp("2026-03-12")] == 1
+    assert counts.sum() == 2
+
+
+def _at(day, hour=9):
+    return pd.Timestamp(f"2026-06-{day:02d} {hour:02d}:00").timestamp()
+
+
+def test_cycle_times_start_from_the_latest_stint_of_work():
+    import task_events
+
+    log = get_event_log()
+    log.append([
+        # T-1 worked and finished, was reopened, then worked again from the 20th
+        status_change(2, "Open", "Working", task="T-1", ts=_at(1)),
+        status_change(2, "Working", "Done", task="T-1", ts=_at(5)),
+        status_change(2, "Done", "Open", task="T-1", ts=_at(10)),
+        status_change(2, "Open", "Working", task="T-1", ts=_at(18)),
+        status_change(2, "Working", "Open", task="T-1", ts=_at(19)),
+        status_change(2, "Open", "Working", task="T-1", ts=_at(20)),
+        # A row inserted above moved T-1 to row 3 before it was done again
+        status_change(3, "Working", "Done", task="T-1", ts=_at(23)),
+        # Row 3 used to hold another task that was never marked working
+        status_change(3, "Open", "Done", task="T-2", ts=_at(24)),
+        # Events without a Transcript ID are followed by row
+        status_change(7, "Open", "Working", ts=_at(21)),
+        status_change(7, "Working", "Done", ts=_at(22)),
+    ])
+
+    cycles = task_events.cycle_times(log, days=10, today=pd.Timestamp("2026-06-25"))
+
+    assert cycles[["task", "row", "days"]].values.tolist() == [["row 7", 7, 1.0], ["T-1", 3, 3.0]]
+
+
+def test_throughput_counts_completions_per_project():
+    import task_events
+
+    log = get_event_log()
+    log.append([
+        status_change(2, "Open", "Done", project="Alpha", ts=_at(20)),
+        status_change(3, "Working", "Done", project="Alpha", ts=_at(21)),
+        status_change(4, "Done", "Complete", project="Alpha", ts=_at(21)),
+        status_change(5, "Open", "Done", project="", ts=_at(22)),
+        status_change(6, "Open", "Done", project="Beta", ts=_at(1)),
+    ])
+
+    counts = task_events.throughput(log, days=7, today=pd.Timestamp("2026-06-25"))
+
+    assert counts.to_dict() == {"Alpha": 2, "Unassigned": 1}
+
+
+def test_status_events_carry_the_transcript_id(task_store, publish):
+    from pages import dashboard_page
+
+    publish(pd.DataFrame({"Transcript ID": ["T-9", ""], "Status": ["Open", "Open"]}, index=[2, 3]))
+    dashboard_page.load_google_sheet()
+    edited = task_store["snapshot"].frame.copy()
+    edited["Status"] = ["Done", "Done"]
+    assert dashboard_page.update_google_sheet(edited)
+
+    events = task_store["writes"].pending().events
+    assert {cell: [e["task"] for e in records] for cell, records in events.items()} == {
+        (2, 2): ["T-9"], (3, 2): [""],
+    }
@@ -0,0 +1,45 @@
+import pandas as pd
+
+from task_metrics import AGE_BUCKET_EDGES, age_bucket_labels, compute_kpis, task_timing
+from task_schema import build_typed_frame
+
+
+def _typed(**columns):
+    return build_typed_frame(pd.DataFrame(columns, index=range(2, 2 + len(next(iter(columns.values()))))))
+
+
+def test_my_open_tasks_matches_user_name_literally():
+    typed = _typed(
+        Status=["Open", "Open", "Open"],
+        **{"Assigned To": ["Ann (Ops)", "J.R. Smith", "Jar. Smith"]},
+    )
+
+    assert compute_kpis(typed, "Ann (Ops)")["my_open_tasks"] == 1
+    assert compute_kpis(typed, "J.R. Smith")["my_open_tasks"] == 1
+    assert compute_kpis(typed, "Ann (")["my_open_tasks"] == 1
+
+
+def test_age_bucket_labels_name_the_bucket_each_edge_falls_in():
+    labels = age_bucket_labels(AGE_BUCKET_EDGES)
+    assert labels == ["0-7 days", "8-14 days", "15-30 days", "31+ days"]
+
+    today = pd.Timestamp("2026-06-30")
+    ages = [0, 7, 8, 14, 15, 30, 31]
+    typed = _typed(
+        Status=["Open"] * len(ages),
+        **{"Date Assigned": [(today - pd.Timedelta(days=age)).strftime("%Y-%m-%d") for age in ages]},
+    )
+    buckets = task_timing(typed, today=today)["age_bucket"]
+    assert [labels[bucket] for bucket in buckets] == [
+        "0-7 days", "0-7 days", "8-14 days", "8-14 days", "15-30 days", "15-30 days", "31+ days",
+    ]
+
+
+def test_active_projects_counts_distinct_project_values_as_entered():
+    projects = ["Alpha", "alpha", "Alpha ", "", "  ", None, "Beta"]
+    typed = _typed(Status=["Open"] * len(projects), Project=projects)
+
+    kpis = compute_kpis(typed, "Ann", pd.Series(projects, index=typed.index))
+
+    assert kpis["active_projects"] == pd.Series(projects).nunique() == 6
+    assert compute_kpis(typed, "Ann")["active_projects"] == 0
@@ -0,0 +1,47 @@
+import pandas as pd
+
+import task_data
+import task_scope
+from task_scope import SCOPE_OWN, SCOPE_TEAM, scope_rows
+
+
+def _tasks(assignees, status=None):
+    return pd.DataFrame({
+        "Task": [f"Task {i}" for i in range(len(assignees))],
+        "Status": status or ["Open"] * len(assignees),
+        "Assigned To": assignees,
+    }, index=range(2, 2 + len(assignees)))
+
+
+def test_scope_rows_follow_the_assignee_column(publish):
+    publish(_tasks(["Ann", "Megan", "ann lee", ""]))
+    own = scope_rows("Ann", SCOPE_OWN)
+    assert own.tolist() == [2, 4]
+
+    # Edits to other columns reuse the compiled rows
+    publish(_tasks(["Ann", "Megan", "ann lee", ""], status=["Done", "Open", "Open", "Open"]))
+    assert scope_rows("Ann", SCOPE_OWN) is own
+
+    publish(_tasks(["Megan", "Megan", "ann lee", "Ann"]))
+    assert scope_rows("Ann", SCOPE_OWN).tolist() == [4, 5]
+    assert scope_rows("Jess", SCOPE_TEAM).tolist() == [2, 3]
+
+
+def test_compiled_scopes_keep_one_row_set_per_rule(publish):
+    for version in range(5):
+        publish(_tasks(["Ann"] * (version + 1)))
+        scope_rows("Ann", SCOPE_OWN)
+        scope_rows("Jess", SCOPE_TEAM)
+
+    assert len(task_scope._compiled_scopes) == 2
+
+
+def test_scope_rows_come_from_the_snapshot_they_are_versioned_by(publish, task_store, monkeypatch):
+    loaded = publish(_tasks(["Ann", "Megan", "Ann"]))
+    # A refresh publishes a shorter sheet after scope_rows took its snapshot
+    publish(_tasks(["Megan"]))
+    monkeypatch.setattr(task_scope, "get_task_snapshot", lambda: loaded)
+    # The assignees are read from that snapshot's typed view, never re-parsed
+    monkeypatch.setattr(task_data, "build_typed_frame", None)
+
+    assert scope_rows("Ann", SCOPE_OWN).tolist() == [2, 4]
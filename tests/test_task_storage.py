@@ -0,0 +1,124 @@
+import threading
+
+import pytest
+
+from task_storage import (
+    MIN_COL_COUNT,
+    SQLiteWorksheet,
+    get_storage_backend,
+    import_csv,
+    open_worksheet,
+    parse_a1_range,
+)
+
+
+@pytest.fixture
+def worksheet(tmp_path):
+    return SQLiteWorksheet(str(tmp_path / "tasks.sqlite3"), "Otter_Tasks")
+
+
+def test_parse_a1_range():
+    assert parse_a1_range("B7:D9") == (7, 2, 9, 4)
+    assert parse_a1_range("A2:J") == (2, 1, None, 10)
+    assert parse_a1_range("1:1") == (1, None, 1, None)
+    assert parse_a1_range("'Otter_Tasks'!AA3") == (3, 27, 3, 27)
+    with pytest.raises(ValueError):
+        parse_a1_range("A-1")
+
+
+def test_reads_are_trimmed_like_the_sheets_api(worksheet):
+    worksheet.update([["Task", "Status", ""], ["Write brief", "", ""], ["", "", ""]], "A1")
+
+    assert worksheet.get("A1:C3") == [["Task", "Status"], ["Write brief"]]
+    assert worksheet.get_all_values() == [["Task", "Status"], ["Write brief", ""]]
+    assert worksheet.row_values(2) == ["Write brief"]
+    assert worksheet.batch_get(["B1:B2", "A2"]) == [[["Status"]], [["Write brief"]]]
+    assert worksheet.col_count == MIN_COL_COUNT
+
+
+def test_values_are_stored_as_text(worksheet):
+    worksheet.update([["Task", 3, None, float("nan"), 2.5]], "A1")
+    assert worksheet.row_values(1) == ["Task", "3", "", "", "2.5"]
+
+
+def test_update_accepts_the_legacy_argument_order(worksheet):
+    worksheet.update("B2", [["x"]])
+    assert worksheet.get_all_values() == [["", ""], ["", "x"]]
+
+
+def test_batch_update_writes_every_range(worksheet):
+    worksheet.update([["Task", "Status"], ["a", "Open"], ["b", "Open"]], "A1")
+    worksheet.batch_update([{"range": "B2:B3", "values": [["Done"], ["Working"]]},
+                            {"range": "A3", "values": [["c"]]}])
+
+    assert worksheet.get_all_values() == [["Task", "Status"], ["a", "Done"], ["c", "Working"]]
+
+
+def test_failed_batch_update_writes_nothing(worksheet):
+    worksheet.update([["Task"], ["a"]], "A1")
+    before = worksheet.spreadsheet.get_lastUpdateTime()
+
+    with pytest.raises(ValueError):
+        worksheet.batch_update([{"range": "A2", "values": [["b"]]}, {"range": "??", "values": [["c"]]}])
+
+    assert worksheet.get_all_values() == [["Task"], ["a"]]
+    assert worksheet.spreadsheet.get_lastUpdateTime() == before
+
+
+def test_append_rows_go_after_the_last_non_empty_row(worksheet):
+    worksheet.update([["Task"], ["a"], ["b"]], "A1")
+    worksheet.update([[""]], "A3")
+    worksheet.append_rows([["c"], ["d"]])
+    worksheet.append_row(["e"])
+
+    assert [row[0] for row in worksheet.get_all_values()] == ["Task", "a", "c", "d", "e"]
+
+
+def test_every_write_changes_the_update_time(worksheet):
+    times = []
+    for value in ["a", "b", "c"]:
+        worksheet.update_cell(2, 1, value)
+        times.append(worksheet.spreadsheet.get_lastUpdateTime())
+    worksheet.clear()
+    times.append(worksheet.spreadsheet.get_lastUpdateTime())
+
+    assert len(set(times)) == 4
+    assert worksheet.get_all_values() == []
+
+
+def test_concurrent_appends_keep_every_row(worksheet):
+    worksheet.update([["Task"]], "A1")
+
+    def append(n):
+        for i in range(20):
+            worksheet.append_rows([[f"{n}-{i}"]])
+
+    threads = [threading.Thread(target=append, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    rows = [row[0] for row in worksheet.get_all_values()[1:]]
+    assert sorted(rows) == sorted(f"{n}-{i}" for n in range(4) for i in range(20))
+
+
+def test_import_csv_replaces_the_worksheet(worksheet, tmp_path):
+    worksheet.update([["Old"], ["old row"]], "A1")
+    csv_path = tmp_path / "tasks.csv"
+    csv_path.write_text("Task,Status\nWrite brief,Open\n", encoding="utf-8")
+
+    assert import_csv(worksheet, str(csv_path)) == 2
+    assert worksheet.get_all_values() == [["Task", "Status"], ["Write brief", "Open"]]
+
+
+def test_backend_selection(tmp_path):
+    assert get_storage_backend({}) == "google_sheets"
+    assert get_storage_backend({"task_storage": " SQLite "}) == "sqlite"
+    with pytest.raises(ValueError):
+        get_storage_backend({"task_storage": "excel"})
+
+    secrets = {"task_storage": "sqlite", "task_storage_path": str(tmp_path / "local.sqlite3")}
+    ws = open_worksheet(secrets, "ignored", "Otter_Tasks")
+    assert ws is open_worksheet(secrets, "ignored", "Otter_Tasks")
+    assert ws.title == "Otter_Tasks"
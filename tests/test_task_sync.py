@@ -0,0 +1,117 @@
+import random
+
+import pandas as pd
+import pytest
+
+import task_data
+from sheet_sync import column_letter
+from task_storage import SQLiteWorksheet
+
+HEADER_POOL = ["Task", "Project", "", "", "Confidence", "0%", "Y", "Progress Bar", "Emails", "Status", "Notes", "Due Date"]
+
+
+@pytest.fixture
+def worksheet(tmp_path):
+    return SQLiteWorksheet(str(tmp_path / "tasks.sqlite3"), "Otter_Tasks")
+
+
+def _random_sheet(rng, rows=30):
+    """Random header mix (duplicates, blanks, hidden columns); every task row has a Task"""
+    width = rng.randint(8, 22)
+    headers = ["Task"] + [rng.choice(HEADER_POOL) for _ in range(width - 1)]
+    values = [[f"t{r}"] + [rng.choice(["", "", f"v{r}-{c}"]) for c in range(1, width)] for r in range(rows)]
+    return [headers] + values
+
+
+def _full_plan(values):
+    headers, rows = values[0], values[1:]
+    positions, _ = task_data._plan_task_columns(headers, task_data._blank_columns_with_data(headers, rows))
+    return positions
+
+
+def test_short_header_reads_blank_priority_column(worksheet):
+    header = ["Task", "Project", "", "Confidence", "0%", "Y", "", "Progress Bar",
+              "Confidence", "", "Confidence", "Emails", "Y", "Status", ""]
+    # Blank columns G, J and O hold data, so O is the 14th kept column (the Priority slot)
+    row = ["" if i == 2 else f"r{i}" for i in range(len(header))]
+    worksheet.update([header, row], "A1")
+
+    frame, _ = task_data._full_sync(worksheet)
+
+    assert list(frame.columns) == list(task_data.build_task_frame(worksheet.get_all_values()).columns)
+    assert frame["Priority___5"].tolist() == ["r14"]
+
+
+def test_projection_covers_every_planned_column():
+    rng = random.Random(9)
+    for _ in range(500):
+        values = _random_sheet(rng)
+        grid_width = max(len(row) for row in values)
+        # The header as the API returns it: trailing blank cells dropped
+        header = list(values[0])
+        while header and header[-1] == "":
+            header.pop()
+        projected = set(task_data._projected_columns(header, grid_width))
+        assert set(_full_plan(values)) <= projected, values[0]
+
+
+def test_full_sync_matches_get_all_values(worksheet):
+    rng = random.Random(3)
+    for _ in range(100):
+        values = _random_sheet(rng)
+        worksheet.clear()
+        worksheet.update(values, "A1")
+
+        frame, _ = task_data._full_sync(worksheet)
+        pd.testing.assert_frame_equal(frame, task_data.build_task_frame(worksheet.get_all_values()))
+
+
+def _mutate(rng, ws, values):
+    """Apply one random edit to the sheet (cells, appended rows, cleared tail rows or header)"""
+    width = len(values[0])
+    rows = len(values) - 1
+    kind = rng.choice(["cells", "cells", "cells", "append", "truncate", "header"])
+    if kind == "cells":
+        data = []
+        for _ in range(rng.randint(1, 6)):
+            row = rng.randint(2, rows + 1)
+            col = rng.randint(2, width)
+            data.append({"range": f"{column_letter(col)}{row}", "values": [[rng.choice(["", f"e{row}-{col}"])]]})
+        ws.batch_update(data)
+    elif kind == "append":
+        start = rows
+        ws.append_rows([[f"t{start + r}"] + [rng.choice(["", f"a{r}-{c}"]) for c in range(1, width)]
+                        for r in range(rng.randint(1, 9))])
+    elif kind == "truncate" and rows > 1:
+        count = rng.randint(1, min(rows - 1, 6))
+        ws.update([[""] * width for _ in range(count)], f"A{rows + 2 - count}")
+    elif kind == "header":
+        col = rng.randint(2, width)
+        ws.update([[rng.choice(HEADER_POOL)]], f"{column_letter(col)}1")
+
+
+def test_delta_sync_matches_full_sync(worksheet, monkeypatch):
+    # Small blocks so edits land in several blocks and appends cross block edges
+    monkeypatch.setattr(task_data, "BLOCK_SIZE", 4)
+    rng = random.Random(5)
+    for _ in range(20):
+        worksheet.clear()
+        worksheet.update(_random_sheet(rng, rows=rng.randint(1, 25)), "A1")
+        frame, sheet = task_data._full_sync(worksheet)
+        for _ in range(10):
+            _mutate(rng, worksheet, worksheet.get_all_values())
+            frame, sheet, _ = task_data._delta_sync(worksheet, frame, sheet)
+            expected, _ = task_data._full_sync(worksheet)
+            pd.testing.assert_frame_equal(frame, expected)
+            assert task_data._frame_sheet_columns(sheet) == dict(zip(
+                expected.columns, _full_plan(worksheet.get_all_values())))
+
+
+def test_delta_sync_skips_unmodified_sheet(worksheet):
+    worksheet.update(_random_sheet(random.Random(1)), "A1")
+    frame, sheet = task_data._full_sync(worksheet)
+
+    same, same_sheet, changed = task_data._delta_sync(worksheet, frame, sheet)
+
+    assert not changed
+    assert same is frame and same_sheet is sheet
@@ -0,0 +1,198 @@
+import threading
+
+import pandas as pd
+import pytest
+
+import task_data
+import task_writes
+from task_storage import SQLiteWorksheet
+from task_writes import WriteBatch, WriteBehindQueue
+
+
+class _FlakyWorksheet(SQLiteWorksheet):
+    """SQLite worksheet recording append_rows calls; calls listed in fail_on raise"""
+
+    def __init__(self, path, fail_on=()):
+        super().__init__(path, "Otter_Tasks")
+        self.fail_on = set(fail_on)
+        self.appends = []
+
+    def append_rows(self, values, **kwargs):
+        self.appends.append(len(values))
+        if len(self.appends) in self.fail_on:
+            raise ConnectionError("Sheets unavailable")
+        super().append_rows(values, **kwargs)
+
+
+@pytest.fixture
+def worksheet(tmp_path, monkeypatch):
+    ws = _FlakyWorksheet(str(tmp_path / "tasks.sqlite3"))
+    ws.update([["Task", "Status"]], "A1")
+    monkeypatch.setattr(task_data, "open_task_worksheet", lambda: ws)
+    return ws
+
+
+def _rows(n):
+    return [[f"Task {i}", "Open"] for i in range(n)]
+
+
+def test_append_task_rows_sends_one_request_per_chunk(worksheet):
+    assert task_data.append_task_rows(_rows(7), worksheet, chunk_size=3) == 7
+
+    assert worksheet.appends == [3, 3, 1]
+    assert worksheet.get_all_values()[1:] == _rows(7)
+
+
+def test_append_task_rows_uses_the_configured_chunk_size(worksheet, monkeypatch):
+    monkeypatch.setattr(task_data, "get_append_chunk_size", lambda: 4)
+
+    assert task_data.append_task_rows(iter(_rows(9))) == 9
+    assert task_data.append_task_rows([]) == 0
+    assert worksheet.appends == [4, 4, 1]
+
+
+def test_retried_flush_never_appends_a_row_twice(worksheet, monkeypatch):
+    monkeypatch.setattr(task_data, "get_append_chunk_size", lambda: 3)
+    worksheet.fail_on = {2}
+    batch = WriteBatch(rows=_rows(8))
+
+    with pytest.raises(ConnectionError):
+        task_data._flush_task_edits(batch)
+    # The first chunk landed; only the rest is left for the retry
+    assert batch.rows == _rows(8)[3:]
+
+    task_data._flush_task_edits(batch)
+
+    assert batch.rows == []
+    assert worksheet.get_all_values()[1:] == _rows(8)
+
+
+class _Flusher:
+    """flush_fn recording each batch; the next `failures` flushes raise"""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.batches = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, batch):
+        self.started.set()
+        self.release.wait(5)
+        self.batches.append((dict(batch.cells), list(batch.rows)))
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("Sheets unavailable")
+        batch.mark_cells_written()
+        batch.mark_rows_written(len(batch.rows))
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(task_writes, "RETRY_BASE_SECONDS", 0.01)
+
+
+def test_edits_queued_close_together_are_flushed_once():
+    flush = _Flusher()
+    queue = WriteBehindQueue(flush, coalesce_seconds=0.2, max_coalesce_seconds=5)
+    queue.submit({(2, 2): "Working"})
+    queue.submit({(2, 2): "Done", (3, 2): "Open"}, rows=[["New task"]])
+
+    assert queue.wait_idle(timeout=5)
+
+    assert flush.batches == [({(2, 2): "Done", (3, 2): "Open"}, [["New task"]])]
+    status = queue.status()
+    assert (status["flushes"], status["edits_queued"], status["edits_coalesced"]) == (1, 4, 1)
+    assert (status["pending_cells"], status["pending_rows"], status["attempts"]) == (0, 0, 0)
+
+
+def test_failed_flush_is_retried_until_it_succeeds():
+    flush = _Flusher(failures=2)
+    dropped = []
+    queue = WriteBehindQueue(flush, on_failure=lambda batch, error: dropped.append(batch),
+                             coalesce_seconds=0, max_coalesce_seconds=0, max_attempts=3)
+    queue.submit({(2, 2): "Done"})
+
+    assert queue.wait_idle(timeout=5)
+
+    assert [cells for cells, _ in flush.batches] == [{(2, 2): "Done"}] * 3
+    assert dropped == []
+    assert queue.status()["last_error"] is None
+
+
+def test_edits_are_dropped_after_max_attempts():
+    flush = _Flusher(failures=10)
+    dropped = []
+    queue = WriteBehindQueue(flush, on_failure=lambda batch, error: dropped.append((batch, error)),
+                             coalesce_seconds=0, max_coalesce_seconds=0, max_attempts=2)
+    queue.submit({(2, 2): "Done"}, rows=[["New task"]])
+
+    assert queue.wait_idle(timeout=5)
+
+    assert len(flush.batches) == 2
+    [(batch, error)] = dropped
+    assert (batch.cells, batch.rows) == ({(2, 2): "Done"}, [["New task"]])
+    assert isinstance(error, ConnectionError)
+    assert queue.status()["failed_flushes"] == 2
+
+
+def test_edits_queued_during_retries_get_their_own_attempts():
+    flush = _Flusher(failures=2)
+    dropped = []
+    queue = WriteBehindQueue(flush, on_failure=lambda batch, error: dropped.append(batch),
+                             coalesce_seconds=0, max_coalesce_seconds=0, max_attempts=2)
+    flush.release.clear()
+    queue.submit({(2, 2): "Done"})
+    assert flush.started.wait(5)
+    # Queued while the first (failing) flush is in flight
+    queue.submit({(3, 2): "Working"}, rows=[["New task"]])
+    flush.release.set()
+
+    assert queue.wait_idle(timeout=5)
+
+    # (2, 2) failed twice and is dropped; the later edits failed once, then went through
+    assert [batch.cells for batch in dropped] == [{(2, 2): "Done"}]
+    assert flush.batches[-1] == ({(3, 2): "Working"}, [["New task"]])
+
+
+def test_a_newer_edit_of_a_failing_cell_starts_its_count_over():
+    batch = WriteBatch({(2, 2): "Working", (3, 2): "Open"})
+    batch.record_failure()
+    batch.merge(WriteBatch({(2, 2): "Done"}))
+    batch.record_failure()
+
+    exhausted = batch.take_exhausted(2)
+
+    assert exhausted.cells == {(3, 2): "Open"}
+    assert batch.cells == {(2, 2): "Done"}
+    assert batch.attempts() == 1
+
+
+def test_discarded_edits_are_not_published_by_a_refresh_in_progress(task_store, publish, monkeypatch):
+    sheet = pd.DataFrame({"Task___0": ["Write brief"], "Status___1": ["Open"]},
+                         index=pd.RangeIndex(2, 3, name="sheet_row"))
+    publish(sheet.assign(Status___1="Done"))           # optimistic value of a failing edit
+    task_store["sheet"] = {"values": []}
+    reads = []
+
+    def delta_sync(ws, frame, index):
+        # Nothing changed since the last read: the refresh keeps the optimistic frame
+        task_data._discard_task_edits(task_store, WriteBatch({(2, 2): "Done"}), ConnectionError())
+        return frame, index, False
+
+    def full_sync(ws):
+        reads.append("full")
+        return sheet, {"values": []}
+
+    monkeypatch.setattr(task_data, "open_task_worksheet", lambda: None)
+    monkeypatch.setattr(task_data, "_delta_sync", delta_sync)
+    monkeypatch.setattr(task_data, "_full_sync", full_sync)
+    monkeypatch.setattr(task_data, "_frame_sheet_columns", lambda index: {"Task___0": 0, "Status___1": 1})
+    monkeypatch.setattr(task_data, "_save_snapshot_to_disk", lambda *args: None)
+    monkeypatch.setattr(task_data, "_reread_task_sheet", lambda store: None)
+
+    task_data._refresh_snapshot(task_store, force_refresh=True)
+
+    assert reads == ["full"]
+    assert task_store["snapshot"].frame["Status___1"].tolist() == ["Open"]
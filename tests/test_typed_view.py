@@ -0,0 +1,40 @@
+import pandas as pd
+
+from task_data import get_typed_view
+
+
+def _tasks(statuses, start=2):
+    return pd.DataFrame({
+        "Task___0": [f"Task {i}" for i in range(len(statuses))],
+        "Status___1": statuses,
+        "Assigned To___2": ["Ann"] * len(statuses),
+    }, index=pd.RangeIndex(start, start + len(statuses), name="sheet_row"))
+
+
+def test_typed_view_reuses_the_snapshot_rows(publish):
+    snapshot = publish(_tasks(["Open", "Working", "Done"]))
+    subset = snapshot.frame.loc[[4, 2]]
+
+    typed = get_typed_view(subset)
+
+    assert typed["status_text"].tolist() == ["done", "open"]
+    assert typed.index.tolist() == [4, 2]
+
+
+def test_typed_view_of_a_frame_loaded_before_a_refresh(publish):
+    old = publish(_tasks(["Open", "Working", "Done"]))
+    # A background refresh publishes a shorter sheet with different statuses
+    publish(_tasks(["Done"]))
+
+    loaded = old.frame[old.frame["Status___1"] != "Open"]
+
+    assert get_typed_view(loaded)["status_text"].tolist() == ["working", "done"]
+    assert get_typed_view(loaded, old)["status_text"].tolist() == ["working", "done"]
+
+
+def test_typed_view_parses_edited_copies(publish):
+    snapshot = publish(_tasks(["Open", "Open"]))
+    edited = snapshot.frame.copy()
+    edited.at[3, "Status___1"] = "Done"
+
+    assert get_typed_view(edited)["status_text"].tolist() == ["open", "done"]
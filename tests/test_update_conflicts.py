@@ -0,0 +1,54 @@
+import pandas as pd
+import streamlit as st
+
+from pages import dashboard_page
+
+
+def _tasks(changes=None):
+    df = pd.DataFrame({
+        "Task": ["Write brief", "Call client", "Send invoice"],
+        "Status": ["Open", "Open", "Open"],
+        "Assigned To": ["Ann", "Bob", "Ann"],
+    }, index=range(2, 5))
+    for (row, col), value in (changes or {}).items():
+        df.at[row, col] = value
+    return df
+
+
+def _render(editor_key, has_edits):
+    """One script run of a page with an editor: load the snapshot, pin the editor base"""
+    dashboard_page.load_google_sheet()
+    return dashboard_page.editor_base_snapshot(editor_key, has_edits)
+
+
+def test_refresh_between_render_and_save_skips_changed_rows(task_store, publish):
+    publish(_tasks())
+    shown = _render("grid", has_edits=False)
+
+    # Someone else renames row 3 in the sheet; the refresh lands before Save is clicked
+    publish(_tasks({(3, "Task"): "Call client back"}))
+
+    # Save run: the user marked rows 3 and 4 done in the grid they were shown
+    base = _render("grid", has_edits=True)
+    assert base is shown
+    edited = st.session_state.task_snapshot.frame.loc[[3, 4]].copy()
+    edited["Status"] = "Done"
+    assert dashboard_page.update_google_sheet(edited, base=base)
+
+    # Row 3 changed since the user saw it and is not written; row 4 is
+    assert task_store["writes"].pending().cells == {(4, 2): "Done"}
+
+
+def test_editor_base_follows_rendered_snapshot_until_edited(publish):
+    publish(_tasks())
+    _render("table", has_edits=False)
+    newer = publish(_tasks({(2, "Task"): "Write the brief"}))
+
+    # No edits yet: the editor shows (and saves against) the latest snapshot
+    assert _render("table", has_edits=False) is newer
+
+    publish(_tasks({(2, "Task"): "Write the final brief"}))
+    assert _render("table", has_edits=True) is newer
+
+    dashboard_page.forget_editor_snapshot("table")
+    assert _render("table", has_edits=True) is st.session_state.task_snapshot
@@ -457,3 +457,75 @@ def get_priority_badge(priority):
     """
 
     return badge_html
+
+
+def create_freshness_indicator(status):
+    """
+    Generate HTML for a small "data as of" indicator above the page content
+
+    Args:
+        status (dict): Snapshot status from task_data.get_snapshot_status()
+
+    Returns:
+        str: HTML for the indicator (empty if no data has been loaded yet)
+    """
+    from datetime import datetime
+
+    if not status or not status.get("loaded_at"):
+        return ""
+
+    age_seconds = status.get("age_seconds", 0)
+    if age_seconds < 60:
+        age_text = "just now"
+    elif age_seconds < 3600:
+        age_text = f"{int(age_seconds // 60)} min ago"
+    else:
+        age_text = datetime.fromtimestamp(status["loaded_at"]).strftime("%b %d, %H:%M")
+
+    pending_writes = status.get("pending_writes", 0)
+    if pending_writes and status.get("write_error"):
+        dot_color = '#E57373'  # Soft red - last save attempt failed
+        detail = f"{pending_writes} change(s) not saved yet, retrying"
+    elif pending_writes:
+        dot_color = '#918C86'  # Tan grey - write in flight
+        detail = f"saving {pending_writes} change(s)"
+    elif status.get("write_error"):
+        dot_color = '#E57373'
+        detail = "some changes could not be saved to Google Sheets"
+    elif status.get("last_error"):
+        dot_color = '#E57373'  # Soft red - last refresh failed
+        detail = "showing last saved snapshot, refresh failed"
+    elif status.get("refreshing"):
+        dot_color = '#918C86'  # Tan grey - refresh in flight
+        detail = "refreshing in background"
+    elif status.get("is_stale"):
+        dot_color = '#918C86'
+        detail = "update pending"
+    else:
+        dot_color = '#81C784'  # Soft green - fresh
+        detail = "up to date"
+
+    indicator_html = f"""
+    <div style='
+        display: flex;
+        justify-content: flex-end;
+        align-items: center;
+        gap: 8px;
+        margin: 0 0 12px 0;
+        font-family: "Questrial", sans-serif;
+        font-size: 0.75rem;
+        color: #918C86;
+        letter-spacing: 0.03em;
+    '>
+        <span style='
+            display: inline-block;
+            width: 8px;
+            height: 8px;
+            border-radius: 50%;
+            background-color: {dot_color};
+        '></span>
+        <span>Data updated {age_text} &middot; {detail}</span>
+    </div>
+    """
+
+    return indicator_html